@@ -1,13 +1,29 @@
-from fastapi import FastAPI
+import hmac
+import os
+import time
+from typing import Optional
+
+from fastapi import FastAPI, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
+from fastapi.responses import JSONResponse, PlainTextResponse
 
-from app.services.database import Base, engine
+from app.services.database import LAST_WRITE_HEADER, Base, engine, open_read_session, read_engine
+from app.services.metrics import begin_request, finish_request, instrument_engine, render_metrics
+from app.services.profiler import ProfilingMiddleware
 from app.routers import auth, investments, documents, profiles, admin
-from app.routers import deals
+from app.routers import dashboard, deals, diagnostics, events, exports
+from app.routers.auth import authenticate_token
+from app.services import event_handlers  # noqa: F401  (registers outbox handlers)
+from app.services.outbox import outbox_dispatcher
+from app.utils.signing_keys import JWKS_MAX_AGE_SECONDS, key_ring
 
 
 Base.metadata.create_all(bind=engine)
+instrument_engine(engine)
+instrument_engine(read_engine)
+key_ring.load()  # parse (or create) the JWT signing keys once, before the first request
+outbox_dispatcher.start()  # side effects (emails, ...) run off the request path
 
 app = FastAPI(
     title="GP Portal API",
@@ -65,8 +81,94 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # ETag: read by the dashboard client to revalidate with If-None-Match
+    # X-Last-Write: echoed back by the client so its next reads skip the replica
+    expose_headers=["ETag", LAST_WRITE_HEADER],
 )
 
+
+# ---------------------------------------------------------
+# READ-YOUR-WRITES
+#  - a request that committed a write answers with X-Last-Write
+#    (set in services/database.py); get_read_db keeps the client
+#    on the primary while that is recent, on whichever worker
+# ---------------------------------------------------------
+@app.middleware("http")
+async def send_last_write(request: Request, call_next):
+    response = await call_next(request)
+    last_write = getattr(request.state, "last_write", None)
+    if last_write is not None:
+        response.headers[LAST_WRITE_HEADER] = f"{last_write:.3f}"
+    return response
+
+# ---------------------------------------------------------
+# PERFORMANCE INSTRUMENTATION
+#  - latency per route template, SQL statements/time per request
+#  - exposed in Prometheus format on /metrics (scraper token or admin)
+# ---------------------------------------------------------
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    stats = begin_request(request.method, request.url.path)
+    start = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        # use the route template (/api/deals/{deal_id}) so label cardinality stays bounded
+        route = request.scope.get("route")
+        route_path = getattr(route, "path", None) or "unmatched"
+        finish_request(stats, route_path, status_code, time.perf_counter() - start)
+
+
+# Admin-only on-demand profiling (X-Profile: 1); pass-through when the switch is off
+app.add_middleware(ProfilingMiddleware)
+
+
+# ---------------------------------------------------------
+# JWKS → public keys for verifying access tokens locally
+#  - sidecars cache it and match tokens by kid; no call back into the API
+#  - new keys are published JWT_KEY_PUBLISH_SECONDS before they sign anything
+# ---------------------------------------------------------
+@app.get("/.well-known/jwks.json", include_in_schema=False)
+def jwks():
+    return JSONResponse(
+        key_ring.jwks(),
+        headers={"Cache-Control": f"public, max-age={JWKS_MAX_AGE_SECONDS}"},
+    )
+
+
+# ---------------------------------------------------------
+# /metrics (Prometheus)
+#  - the scraper sends Authorization: Bearer $METRICS_TOKEN
+#  - admins can read it with their access token
+# ---------------------------------------------------------
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+
+def _authorize_metrics(authorization: Optional[str]) -> None:
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise HTTPException(status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+    if METRICS_TOKEN and hmac.compare_digest(token.encode(), METRICS_TOKEN.encode()):
+        return
+
+    db = open_read_session()
+    try:
+        user = authenticate_token(token, db)
+    finally:
+        db.close()
+    if user.role != "Admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics(authorization: Optional[str] = Header(None)):
+    _authorize_metrics(authorization)
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 # ---------------------------------------------------------
 # Routers
 # ---------------------------------------------------------
@@ -77,6 +179,10 @@ app.include_router(profiles.router)
 app.include_router(admin.router)
 app.include_router(deals.router)
 app.include_router(deals.admin_router)
+app.include_router(diagnostics.router)
+app.include_router(dashboard.router)
+app.include_router(exports.router)
+app.include_router(events.router)
 
 
 @app.get("/")
@@ -0,0 +1,80 @@
+# backend/app/models/cash_flow_model.py
+
+from datetime import datetime
+
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Integer, Numeric, String
+from sqlalchemy.orm import relationship
+
+from app.services.database import Base
+
+# exact money: 18 digits, 2 decimals (DECIMAL(18,2) on SQL Server)
+Money = Numeric(18, 2, asdecimal=True)
+
+
+class CashFlow(Base):
+    """
+    Append-only ledger of dated cash flows per investment.
+      - CAPITAL_CALL: money the investor paid in
+      - DISTRIBUTION: money paid out to the investor
+    Rows are never updated or deleted; a correction is a new row with a
+    negative amount. user_id is copied from the investment so per-investor
+    as-of queries are one index range on (user_id, flow_date).
+    """
+    __tablename__ = "cash_flows"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    investment_id = Column(Integer, ForeignKey("investments.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+
+    flow_type = Column(String(20), nullable=False)  # CAPITAL_CALL | DISTRIBUTION
+    amount = Column(Money, nullable=False)
+    flow_date = Column(Date, nullable=False)
+    memo = Column(String(255), nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    created_by_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+
+    # see migrations/003_cash_flow_ledger.sql for existing databases
+    __table_args__ = (
+        Index(
+            "ix_cash_flows_investment_date",
+            "investment_id",
+            "flow_date",
+            mssql_include=["flow_type", "amount"],
+        ),
+        Index(
+            "ix_cash_flows_user_date",
+            "user_id",
+            "flow_date",
+            mssql_include=["flow_type", "amount"],
+        ),
+    )
+
+    investment = relationship("Investment")
+
+
+class InvestmentBalance(Base):
+    """Running totals per investment, updated in the same transaction as each ledger insert."""
+    __tablename__ = "investment_balances"
+
+    investment_id = Column(Integer, ForeignKey("investments.id"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+
+    called_total = Column(Money, nullable=False, default=0)
+    distributed_total = Column(Money, nullable=False, default=0)
+    entry_count = Column(Integer, nullable=False, default=0)
+    last_flow_date = Column(Date, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
+class InvestorBalance(Base):
+    """Running totals per investor (sum of their investment balances)."""
+    __tablename__ = "investor_balances"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+
+    called_total = Column(Money, nullable=False, default=0)
+    distributed_total = Column(Money, nullable=False, default=0)
+    entry_count = Column(Integer, nullable=False, default=0)
+    last_flow_date = Column(Date, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow)
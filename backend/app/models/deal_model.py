@@ -1,13 +1,72 @@
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Float, Integer, String, Text
+from sqlalchemy import Column, Computed, DateTime, Float, Index, Integer, String, Text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
 
 from app.services.database import Base
 
 
+# ---------------------------------------------------------
+# details_json → computed columns
+#  - kept in sync by the database on every write (PERSISTED /
+#    STORED), so they can be indexed and filtered like any column
+#  - invalid JSON or a missing key gives NULL
+# ---------------------------------------------------------
+class details_value(FunctionElement):
+    """Scalar at a JSON path of deals.details_json (optionally cast to a SQL type)."""
+    inherit_cache = True
+
+    def __init__(self, path: str, cast: str = None):
+        self.path = path
+        self.cast = cast
+        super().__init__()
+
+
+@compiles(details_value, "mssql")
+def _details_value_mssql(element, compiler, **kw):
+    value = f"CASE WHEN ISJSON(details_json) = 1 THEN JSON_VALUE(details_json, '{element.path}') END"
+    # TRY_CAST: a non-numeric value becomes NULL instead of failing the write
+    return f"TRY_CAST({value} AS {element.cast})" if element.cast else f"CAST({value} AS NVARCHAR(100))"
+
+
+@compiles(details_value)
+def _details_value_default(element, compiler, **kw):
+    # SQLite
+    value = f"json_extract(details_json, '{element.path}')"
+    if not element.cast:
+        return f"CASE WHEN json_valid(details_json) THEN {value} END"
+    # like TRY_CAST: numbers and numeric strings only (a bare CAST turns 'n/a' into 0)
+    kind = f"json_type(details_json, '{element.path}')"
+    return (
+        f"CASE WHEN json_valid(details_json) THEN CASE"
+        f" WHEN {kind} IN ('integer', 'real') THEN CAST({value} AS {element.cast})"
+        f" WHEN {kind} = 'text' AND trim({value}) <> '' AND trim({value}) NOT GLOB '*[^0-9.eE+-]*'"
+        f" THEN CAST(trim({value}) AS {element.cast}) END END"
+    )
+
+
 class Deal(Base):
     __tablename__ = "deals"
 
+    # list_deals: WHERE status = 'PUBLISHED' ORDER BY created_at DESC, covering DealOut;
+    # see migrations/001_hot_query_indexes.sql for existing databases
+    __table_args__ = (
+        Index(
+            "ix_deals_status_created_at",
+            "status",
+            "created_at",
+            mssql_include=[
+                "name", "deal_type", "deal_subtype", "deal_stage", "sponsors",
+                "close_date", "offering_size", "unit_price",
+            ],
+        ),
+        # /api/deals/search: facet counts are index-only GROUP BYs; range filters seek
+        Index("ix_deals_status_facets", "status", "deal_type", "deal_subtype", "deal_stage", "location"),
+        Index("ix_deals_status_close_date", "status", "close_date"),
+        Index("ix_deals_status_min_investment", "status", "min_investment"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
 
     name = Column(String(255), nullable=False)
@@ -25,6 +84,11 @@ class Deal(Base):
 
     # safe to store for later phases
     funding_instructions = Column(Text, nullable=True)
-    details_json = Column(Text, nullable=True)
+    details_json = Column(Text, nullable=True)    # JSON object, e.g. {"location": "Texas", "min_investment": 50000, "target_irr": 0.18}
+
+    # derived from details_json (see details_value); read-only for the ORM
+    location = Column(String(100), Computed(details_value("$.location"), persisted=True))
+    min_investment = Column(Float, Computed(details_value("$.min_investment", "FLOAT"), persisted=True))
+    target_irr = Column(Float, Computed(details_value("$.target_irr", "FLOAT"), persisted=True))
 
     created_at = Column(DateTime, default=datetime.utcnow)
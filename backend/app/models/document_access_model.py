@@ -0,0 +1,33 @@
+# backend/app/models/document_access_model.py
+
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, PrimaryKeyConstraint, String
+from sqlalchemy.orm import relationship
+
+from app.services.database import Base
+
+
+class DocumentAccess(Base):
+    """
+    Who can see a document. One row per (user, document):
+      - OWNER: the uploader
+      - RECIPIENT: an investor the document was assigned / shared to
+
+    Clustered on user_id first, so "my documents" and "may I open this document"
+    are each a single index seek, and one blob/row can be shared with many users.
+    """
+    __tablename__ = "document_access"
+
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    document_id = Column(Integer, ForeignKey("documents.id"), nullable=False, index=True)
+
+    role = Column(String(20), nullable=False, default="RECIPIENT")  # OWNER | RECIPIENT
+    granted_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        PrimaryKeyConstraint("user_id", "document_id", name="pk_document_access", mssql_clustered=True),
+    )
+
+    document = relationship("Document")
+    user = relationship("User")
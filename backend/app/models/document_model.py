@@ -1,15 +1,30 @@
 # backend/app/models/document_model.py
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
 from app.services.database import Base
 
 
+# columns returned by /api/documents, carried in the index leaf (SQL Server INCLUDE)
+_LIST_COLUMNS = [
+    "name", "label", "deal_name", "profile_name", "file_path",
+    "document_type", "requirement_key", "uploaded_by_role",
+]
+
+
 class Document(Base):
     __tablename__ = "documents"
 
+    # one seek per branch of the uploaded_by / recipient OR, already in uploaded_at order;
+    # see migrations/001_hot_query_indexes.sql for existing databases
+    __table_args__ = (
+        Index("ix_documents_uploaded_by_uploaded_at", "uploaded_by_id", "uploaded_at", mssql_include=_LIST_COLUMNS),
+        Index("ix_documents_recipient_uploaded_at", "recipient_user_id", "uploaded_at", mssql_include=_LIST_COLUMNS),
+        Index("ix_documents_uploaded_at", "uploaded_at"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
 
     name = Column(String, nullable=False)
@@ -1,14 +1,38 @@
 # backend/app/models/investment_model.py
-from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, Index, text
 from app.services.database import Base
 
 class Investment(Base):
     __tablename__ = "investments"
 
+    # covering indexes for /api/investments (+ summary) and the admin summary;
+    # see migrations/001_hot_query_indexes.sql for existing databases
+    __table_args__ = (
+        Index(
+            "ix_investments_uploaded_by_status",
+            "uploaded_by_id",
+            "status",
+            mssql_include=["deal_name", "investment_total", "distribution_total", "close_date"],
+        ),
+        Index(
+            "ix_investments_status",
+            "status",
+            mssql_include=["investment_total", "distribution_total"],
+        ),
+        # CSV imports find the rows they inserted by tag (see services/investment_import.py)
+        Index(
+            "ix_investments_import_batch",
+            "import_batch",
+            mssql_where=text("import_batch IS NOT NULL"),
+            sqlite_where=text("import_batch IS NOT NULL"),
+        ),
+    )
+
     id = Column(Integer, primary_key=True, autoincrement=True)
     deal_name = Column(String, nullable=False)
     investment_total = Column(Float, nullable=False)
     distribution_total = Column(Float, nullable=False)
-    status = Column(String, default="Active", nullable=False)
+    status = Column(String(50), default="Active", nullable=False)  # Active | Closed (sized so it can be an index key)
     close_date = Column(Date, nullable=True)
-    uploaded_by_id = Column(Integer, ForeignKey("users.id"), nullable=False)
\ No newline at end of file
+    uploaded_by_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    import_batch = Column(String(32), nullable=True)  # set by bulk CSV imports only
\ No newline at end of file
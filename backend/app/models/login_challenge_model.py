@@ -0,0 +1,22 @@
+# backend/app/models/login_challenge_model.py
+
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, String
+
+from app.services.database import Base
+
+
+class LoginChallenge(Base):
+    """
+    Pending email OTP for a login (one per email; a new login-init replaces it).
+    Only an HMAC of the code is stored. Kept out of `users` so logins don't
+    write to (and lock) the most-read table.
+    """
+    __tablename__ = "login_challenges"
+
+    email = Column(String(255), primary_key=True)
+    code_hash = Column(String(64), nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
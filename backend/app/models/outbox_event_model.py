@@ -0,0 +1,40 @@
+# backend/app/models/outbox_event_model.py
+
+from datetime import datetime
+
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, String, Text
+
+from app.services.database import Base
+
+
+class OutboxEvent(Base):
+    """
+    Domain event written in the same transaction as the change it describes
+    (see services/outbox.py). The dispatcher claims PENDING rows with a lease
+    (locked_by / locked_until), runs the subscribed handlers and marks them
+    DONE, or schedules a retry via available_at, or gives up with FAILED.
+    """
+    __tablename__ = "outbox_events"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    event_type = Column(String(100), nullable=False)         # e.g. document.uploaded
+    aggregate_type = Column(String(50), nullable=True)       # e.g. document
+    aggregate_id = Column(Integer, nullable=True)
+    payload = Column(Text, nullable=True)                    # JSON; cleared after delivery if sensitive
+    sensitive = Column(Boolean, nullable=False, default=False)
+
+    status = Column(String(20), nullable=False, default="PENDING")  # PENDING | DONE | FAILED
+    attempts = Column(Integer, nullable=False, default=0)
+    available_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    locked_by = Column(String(64), nullable=True)
+    locked_until = Column(DateTime, nullable=True)
+    last_error = Column(String(500), nullable=True)
+
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    processed_at = Column(DateTime, nullable=True)
+
+    # see migrations/007_outbox_events.sql for existing databases
+    __table_args__ = (
+        # claim query: WHERE status = 'PENDING' AND available_at <= now ORDER BY id
+        Index("ix_outbox_events_status_available", "status", "available_at", "id"),
+    )
@@ -1,10 +1,22 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, text
 from app.services.database import Base
 
 
 class Profile(Base):
     __tablename__ = "profiles"
 
+    # at most one default profile per user (NULL for the rest);
+    # see migrations/004_default_profile.sql for existing databases
+    __table_args__ = (
+        Index(
+            "ux_profiles_default_user_id",
+            "default_user_id",
+            unique=True,
+            mssql_where=text("default_user_id IS NOT NULL"),
+            sqlite_where=text("default_user_id IS NOT NULL"),
+        ),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
 
     # e.g., "QD Wealth Management LLC"
@@ -17,4 +29,7 @@ class Profile(Base):
     contact_phone = Column(String, nullable=True)
 
     # 🔴 IMPORTANT: this exists in SQL Server and is NOT NULL
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
\ No newline at end of file
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+
+    # = user_id on the user's default profile (the one /api/profiles/me returns)
+    default_user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
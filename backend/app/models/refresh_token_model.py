@@ -0,0 +1,29 @@
+# backend/app/models/refresh_token_model.py
+
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+
+from app.services.database import Base
+
+
+class RefreshToken(Base):
+    """
+    One issued refresh token. Only the SHA-256 of the token is stored.
+
+    Tokens rotate: each refresh marks the presented token used and issues a
+    new one in the same family. Presenting a used token again (replay)
+    revokes the whole family.
+    """
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+
+    token_hash = Column(String(64), nullable=False, unique=True, index=True)
+    family_id = Column(String(32), nullable=False, index=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    used_at = Column(DateTime, nullable=True)      # rotated (replaced by a newer token)
+    revoked_at = Column(DateTime, nullable=True)   # logout / reuse detected
@@ -0,0 +1,23 @@
+# backend/app/models/user_data_version_model.py
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Integer
+
+from app.services.database import Base
+
+
+class UserDataVersion(Base):
+    """
+    Per-user change counter behind the ETags of the investor GET endpoints.
+
+    Every write that changes what a user sees (their documents, investments,
+    balances, profiles) bumps the row in the same transaction, so a client
+    holding the current ETag can be answered 304 from this one row.
+    A missing row means version 0.
+    """
+    __tablename__ = "user_data_versions"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True, autoincrement=False)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
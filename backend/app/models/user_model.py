@@ -17,6 +17,7 @@ class User(Base):
     email = Column(String, unique=True, nullable=False)
     password_hash = Column(String, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # legacy: login OTPs now live in login_challenges (services/challenge_store.py)
     email_otp_code = Column(String, nullable=True)
     email_otp_expiry = Column(DateTime, nullable=True)
     mfa_secret = Column(String, nullable=True)
@@ -1,16 +1,27 @@
 
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from datetime import datetime
-from app.utils.email_utils import send_document_notification
+from datetime import date, datetime
 from sqlalchemy.orm import Session
-from typing import List
-from sqlalchemy import func
-from app.services.database import get_db
+from typing import List, Optional
+from decimal import Decimal
+from pydantic import BaseModel
+from sqlalchemy import func, select
+from app.services.analytics import get_analytics
+from app.services.database import get_db, get_read_db
+from app.services.document_access import get_document_for_user, grant_access
+from app.services.investment_import import import_investments
+from app.services.ledger import balances_as_of, investor_totals, record_cash_flow
+from app.services.metrics import track_call
+from app.services.data_versions import bump_data_versions
+from app.services.outbox import record_event
+from app.services.notifications import queue_document_notifications
+from app.models.document_access_model import DocumentAccess
 from app.models.document_model import Document
 from app.models.investment_model import Investment
 from app.models.profile_model import Profile
 from app.models.user_model import User
 from app.routers.auth import get_current_admin, get_current_user
+from app.utils.fast_json import rows_response
 from fastapi.responses import StreamingResponse, HTMLResponse
 from io import BytesIO
 import os
@@ -24,17 +35,8 @@ router = APIRouter(prefix="/api/admin", tags=["Admin"])
 # GET /api/admin/users — returns all users (id, email, name fields)
 @router.get("/users")
 def get_all_users(db: Session = Depends(get_db), current_admin: User = Depends(get_current_admin)):
-    users = db.query(User).all()
-    return [
-        {
-            "id": user.id,
-            "email": user.email,
-            "first_name": user.first_name,
-            "last_name": user.last_name,
-            "username": user.username,
-        }
-        for user in users
-    ]
+    # column projection + orjson: no ORM objects, no response re-validation
+    return rows_response(db.execute(select(User.id, User.email, User.first_name, User.last_name, User.username)))
 
 # Azure Blob (same settings as documents router)
 AZURE_BLOB_CONNECTION_STRING = (
@@ -77,13 +79,15 @@ async def admin_upload_for_user(
     base_name, ext = os.path.splitext(blob_name)
     blob_client = container.get_blob_client(blob_name)
     counter = 1
-    while blob_client.exists():
-        blob_name = f"{base_name}_{counter}{ext}"
-        blob_client = container.get_blob_client(blob_name)
-        counter += 1
+    with track_call("blob", "exists"):
+        while blob_client.exists():
+            blob_name = f"{base_name}_{counter}{ext}"
+            blob_client = container.get_blob_client(blob_name)
+            counter += 1
 
     contents = await file.read()
-    blob_client.upload_blob(contents, overwrite=True)
+    with track_call("blob", "upload"):
+        blob_client.upload_blob(contents, overwrite=True)
     blob_url = f"{container.url}/{blob_name}"
 
     new_doc = Document(
@@ -97,15 +101,91 @@ async def admin_upload_for_user(
         recipient_user_id=recipient_user_id,
     )
     db.add(new_doc)
+    grant_access(db, new_doc, [recipient_user_id])
+    # same transaction as the document: the notification can't be lost or sent for a rolled-back upload
+    record_event(db, "document.uploaded", {
+        "document_id": new_doc.id,
+        "name": new_doc.name,
+        "deal_name": new_doc.deal_name,
+        "uploaded_by_id": current_admin.id,
+        "recipient_user_id": recipient_user_id,
+    }, aggregate_type="document", aggregate_id=new_doc.id)
+    queue_document_notifications(db, [recipient], new_doc.name)
     db.commit()
     db.refresh(new_doc)
 
-    # Send notification email
-    frontend_url = os.getenv("FRONTEND_URL", "http://localhost:5173")
-    send_document_notification(recipient.email, new_doc.name, frontend_url)
-
     return {"message": "Uploaded", "id": new_doc.id, "file_url": blob_url}
 
+# ---------------------------------------------------------
+# POST /api/admin/documents/{doc_id}/share
+#  - Share an existing document with more investors
+#    (adds access rows; the blob and document row are reused)
+# ---------------------------------------------------------
+class DocumentShareRequest(BaseModel):
+    user_ids: List[int]
+
+
+@router.post("/documents/{doc_id}/share")
+def share_document(
+    doc_id: int,
+    payload: DocumentShareRequest,
+    db: Session = Depends(get_db),
+    current_admin: User = Depends(get_current_admin),
+):
+    doc = db.query(Document).filter(Document.id == doc_id).first()
+    if not doc:
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    user_ids = set(payload.user_ids)
+    recipients = db.query(User).filter(User.id.in_(user_ids)).all() if user_ids else []
+    missing = user_ids - {u.id for u in recipients}
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Users not found: {sorted(missing)}")
+
+    granted = grant_access(db, doc, [u.id for u in recipients])
+    if granted:
+        record_event(db, "document.shared", {
+            "document_id": doc.id,
+            "name": doc.name,
+            "user_ids": granted,
+        }, aggregate_type="document", aggregate_id=doc.id)
+        queue_document_notifications(db, [u for u in recipients if u.id in granted], doc.name)
+    db.commit()
+
+    return {"message": "Shared", "id": doc.id, "granted_user_ids": granted}
+
+
+# ---------------------------------------------------------
+# DELETE /api/admin/documents/{doc_id}/share/{user_id}
+#  - Revoke a recipient's access (the uploader keeps OWNER access)
+# ---------------------------------------------------------
+@router.delete("/documents/{doc_id}/share/{user_id}")
+def unshare_document(
+    doc_id: int,
+    user_id: int,
+    db: Session = Depends(get_db),
+    current_admin: User = Depends(get_current_admin),
+):
+    deleted = (
+        db.query(DocumentAccess)
+        .filter(
+            DocumentAccess.document_id == doc_id,
+            DocumentAccess.user_id == user_id,
+            DocumentAccess.role == "RECIPIENT",
+        )
+        .delete(synchronize_session=False)
+    )
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Share not found")
+
+    # keep the legacy single-recipient column consistent
+    db.query(Document).filter(Document.id == doc_id, Document.recipient_user_id == user_id).update(
+        {Document.recipient_user_id: None}, synchronize_session=False
+    )
+    bump_data_versions(db, [user_id])
+    db.commit()
+    return {"message": "Access revoked"}
+
 # ---------------------------------------------------------
 # GET /api/admin/documents/{doc_id}/user-view
 # GET /api/admin/documents/{doc_id}/user-download
@@ -113,62 +193,47 @@ async def admin_upload_for_user(
 # ---------------------------------------------------------
 from app.routers.auth import get_current_user
 
+def _iter_blob(stream):
+    # the transfer is timed while the response streams; download_blob() only opened it
+    with track_call("blob", "download"):
+        for chunk in stream.chunks():
+            yield chunk
+
+
 @router.get("/documents/{doc_id}/user-view")
 def user_view_document(
     doc_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
-    rec = db.query(Document).filter(Document.id == doc_id).first()
-    if not rec or not rec.file_path:
-        raise HTTPException(status_code=404, detail="Document not found")
-
-    # permission check
-    if not (
-        current_user.role == "Admin"
-        or rec.uploaded_by_id == current_user.id
-        or rec.recipient_user_id == current_user.id
-    ):
-        raise HTTPException(status_code=403, detail="Not authorized")
+    # permission check (admin, uploader or anyone the document is shared with)
+    rec = get_document_for_user(db, doc_id, current_user)
 
     blob_name = os.path.basename(rec.file_path)
     blob_service = BlobServiceClient.from_connection_string(AZURE_BLOB_CONNECTION_STRING)
     container = blob_service.get_container_client(AZURE_CONTAINER_NAME)
     blob_client = container.get_blob_client(blob_name)
-    stream = blob_client.download_blob()
-    def iterfile():
-        for chunk in stream.chunks():
-            yield chunk
-    return StreamingResponse(iterfile(), media_type="application/pdf", headers={
+    with track_call("blob", "open"):
+        stream = blob_client.download_blob()
+    return StreamingResponse(_iter_blob(stream), media_type="application/pdf", headers={
         "Content-Disposition": f'inline; filename="{rec.name}"'
     })
 
 @router.get("/documents/{doc_id}/user-download")
 def user_download_document(
     doc_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
-    rec = db.query(Document).filter(Document.id == doc_id).first()
-    if not rec or not rec.file_path:
-        raise HTTPException(status_code=404, detail="Document not found")
-
-    if not (
-        current_user.role == "Admin"
-        or rec.uploaded_by_id == current_user.id
-        or rec.recipient_user_id == current_user.id
-    ):
-        raise HTTPException(status_code=403, detail="Not authorized")
+    rec = get_document_for_user(db, doc_id, current_user)
 
     blob_name = os.path.basename(rec.file_path)
     blob_service = BlobServiceClient.from_connection_string(AZURE_BLOB_CONNECTION_STRING)
     container = blob_service.get_container_client(AZURE_CONTAINER_NAME)
     blob_client = container.get_blob_client(blob_name)
-    stream = blob_client.download_blob()
-    def iterfile():
-        for chunk in stream.chunks():
-            yield chunk
-    return StreamingResponse(iterfile(), media_type="application/pdf", headers={
+    with track_call("blob", "open"):
+        stream = blob_client.download_blob()
+    return StreamingResponse(_iter_blob(stream), media_type="application/pdf", headers={
         "Content-Disposition": f'attachment; filename="{rec.name}"'
     })
 
@@ -180,7 +245,7 @@ def user_download_document(
 # ---------------------------------------------------------
 @router.get("/documents", response_model=List[dict])
 def get_all_documents(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_admin: User = Depends(get_current_admin),
 ):
     """
@@ -191,30 +256,23 @@ def get_all_documents(
       on uploaded_by_id.
     """
 
-    docs = (
-        db.query(Document)
+    # only the returned columns, uploader email joined in (was one lazy load per document)
+    result = db.execute(
+        select(
+            Document.id,
+            Document.name,
+            Document.label,
+            Document.deal_name,
+            Document.profile_name,
+            Document.file_path,
+            Document.uploaded_at,
+            Document.uploaded_by_id,
+            User.email.label("uploaded_by_email"),
+        )
+        .outerjoin(User, User.id == Document.uploaded_by_id)
         .order_by(Document.uploaded_at.desc())
-        .all()
     )
-
-    results = []
-    for d in docs:
-        results.append(
-            {
-                "id": d.id,
-                "name": d.name,
-                "label": d.label,
-                "deal_name": d.deal_name,
-                "profile_name": d.profile_name,
-                "file_path": d.file_path,
-                "uploaded_at": d.uploaded_at,
-                "uploaded_by_id": d.uploaded_by_id,
-                # if you have relationship set up: documents = relationship("Document", back_populates="uploaded_by")
-                "uploaded_by_email": d.uploaded_by.email if getattr(d, "uploaded_by", None) else None,
-            }
-        )
-
-    return results   
+    return rows_response(result)
 
 
 # ---------------------------------------------------------
@@ -224,7 +282,7 @@ def get_all_documents(
 # ---------------------------------------------------------
 @router.get("/investments", response_model=List[dict])
 def get_all_investments(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_admin: User = Depends(get_current_admin),
 ):
     """
@@ -233,23 +291,17 @@ def get_all_investments(
     This ignores `uploaded_by_id == current_user.id` and shows everything.
     """
 
-    rows = (
-        db.query(Investment)
-        .order_by(Investment.id.desc())
-        .all()
+    result = db.execute(
+        select(
+            Investment.id,
+            Investment.deal_name,
+            Investment.investment_total,
+            Investment.distribution_total,
+            Investment.status,
+            Investment.uploaded_by_id,
+        ).order_by(Investment.id.desc())
     )
-
-    return [
-        {
-            "id": r.id,
-            "deal_name": r.deal_name,
-            "investment_total": r.investment_total,
-            "distribution_total": r.distribution_total,
-            "status": r.status,
-            "uploaded_by_id": r.uploaded_by_id,
-        }
-        for r in rows
-    ]
+    return rows_response(result)
 
 # ---------------------------------------------------------
 # GET /api/admin/investments/summary
@@ -258,24 +310,15 @@ def get_all_investments(
 # ---------------------------------------------------------
 @router.get("/investments/summary")
 def get_all_investments_summary(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_admin: User = Depends(get_current_admin),
 ):
     """
     Admin view: aggregated totals for ALL investments.
     """
 
-    total_invested = (
-        db.query(func.sum(Investment.investment_total))
-        .scalar()
-        or 0
-    )
-
-    total_distributed = (
-        db.query(func.sum(Investment.distribution_total))
-        .scalar()
-        or 0
-    )
+    # ledger balances, plus the positions of investors not in the ledger yet
+    total_invested, total_distributed = investor_totals(db)
 
     active_count = (
         db.query(func.count(Investment.id))
@@ -299,6 +342,115 @@ def get_all_investments_summary(
     }
 
 
+# ---------------------------------------------------------
+# GET /api/admin/investments/analytics
+#  - IRR / MOIC / DPI / RVPI per investor or per deal, plus portfolio totals
+#  - Admin-only
+# ---------------------------------------------------------
+@router.get("/investments/analytics")
+def get_all_investments_analytics(
+    group_by: str = "investor",
+    as_of: Optional[date] = None,
+    db: Session = Depends(get_read_db),
+    current_admin: User = Depends(get_current_admin),
+):
+    """
+    Admin view: portfolio analytics for all positions, grouped by investor
+    (user_id) or by deal (deal_name).
+    """
+    if group_by not in ("investor", "deal"):
+        raise HTTPException(status_code=400, detail="group_by must be investor or deal")
+
+    result = get_analytics(db, as_of)
+    return {
+        "as_of": result["as_of"],
+        "portfolio": result["portfolio"],
+        "results": list(result[f"by_{group_by}"].values()),
+    }
+
+
+# ---------------------------------------------------------
+# POST /api/admin/investments/import
+#  - Bulk-create investments from a CSV upload
+#  - All-or-nothing: commits only when every row is valid
+#  - dry_run=true validates and reports without inserting
+#  - Admin-only
+# ---------------------------------------------------------
+@router.post("/investments/import")
+def import_investments_csv(
+    file: UploadFile = File(...),
+    dry_run: bool = Form(False),
+    db: Session = Depends(get_db),
+    current_admin: User = Depends(get_current_admin),
+):
+    if not file.filename.lower().endswith(".csv"):
+        raise HTTPException(status_code=400, detail="Only CSV files allowed")
+
+    report = import_investments(db, file.file, dry_run=dry_run, created_by_id=current_admin.id)
+
+    committed = not dry_run and report.error_count == 0 and report.rows_inserted > 0
+    if committed:
+        db.commit()
+    else:
+        db.rollback()
+
+    result = report.as_dict(dry_run=dry_run, committed=committed)
+    print(
+        f"[IMPORT] {current_admin.email}: {report.rows_read} rows, {result['rows_inserted']} inserted, "
+        f"{report.error_count} errors (dry_run={dry_run}, committed={committed})"
+    )
+    if report.error_count and not dry_run:
+        raise HTTPException(status_code=422, detail=result)
+    return result
+
+
+# ---------------------------------------------------------
+# POST /api/admin/investments/{investment_id}/cash-flows
+#  - Append a capital call / distribution to the ledger
+#  - Balances are updated in the same transaction
+#  - Admin-only
+# ---------------------------------------------------------
+class CashFlowCreateRequest(BaseModel):
+    flow_type: str  # CAPITAL_CALL | DISTRIBUTION
+    amount: Decimal  # negative = correction of an earlier entry
+    flow_date: date
+    memo: Optional[str] = None
+
+
+@router.post("/investments/{investment_id}/cash-flows")
+def add_cash_flow(
+    investment_id: int,
+    payload: CashFlowCreateRequest,
+    db: Session = Depends(get_db),
+    current_admin: User = Depends(get_current_admin),
+):
+    investment = db.get(Investment, investment_id)
+    if not investment:
+        raise HTTPException(status_code=404, detail="Investment not found")
+
+    flow = record_cash_flow(
+        db,
+        investment,
+        payload.flow_type,
+        payload.amount,
+        payload.flow_date,
+        memo=payload.memo,
+        created_by_id=current_admin.id,
+    )
+    db.commit()
+
+    return {
+        "id": flow.id,
+        "investment_id": investment_id,
+        "flow_type": flow.flow_type,
+        "amount": flow.amount,
+        "flow_date": flow.flow_date,
+        "memo": flow.memo,
+        "investment_balance": balances_as_of(db, investment_id=investment_id),
+        "investor_balance": balances_as_of(db, user_id=investment.uploaded_by_id),
+    }
+
+
 # ---------------------------------------------------------
 # GET /api/admin/profiles
 #  - Returns ALL profiles (across all users)
@@ -306,28 +458,26 @@ def get_all_investments_summary(
 # ---------------------------------------------------------
 @router.get("/profiles", response_model=List[dict])
 def get_all_profiles(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_admin: User = Depends(get_current_admin),
 ):
     """
     Admin view: list all profiles across all users.
     """
 
-    rows = db.query(Profile).order_by(Profile.id.desc()).all()
-
-    return [
-        {
-            "id": p.id,
-            "entity_name": p.entity_name,
-            "jurisdiction": p.jurisdiction,
-            "tax_classification": p.tax_classification,
-            "profile_type": p.profile_type,
-            "contact_email": p.contact_email,
-            "contact_phone": p.contact_phone,
-            "user_id": p.user_id,
-        }
-        for p in rows
-    ]
+    result = db.execute(
+        select(
+            Profile.id,
+            Profile.entity_name,
+            Profile.jurisdiction,
+            Profile.tax_classification,
+            Profile.profile_type,
+            Profile.contact_email,
+            Profile.contact_phone,
+            Profile.user_id,
+        ).order_by(Profile.id.desc())
+    )
+    return rows_response(result)
 
 # ---------------------------------------------------------
 # GET /api/admin/profiles/{profile_id}
@@ -337,7 +487,7 @@ def get_all_profiles(
 @router.get("/profiles/{profile_id}", response_model=dict)
 def get_profile_by_id_admin(
     profile_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_admin: User = Depends(get_current_admin),
 ):
     """
@@ -371,7 +521,7 @@ def get_profile_by_id_admin(
 @router.get("/documents/{doc_id}/view")
 def admin_view_document(
     doc_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_admin: User = Depends(get_current_admin),
 ):
     rec = db.query(Document).filter(Document.id == doc_id).first()
@@ -385,8 +535,10 @@ def admin_view_document(
         blob_service = BlobServiceClient.from_connection_string(AZURE_BLOB_CONNECTION_STRING)
         container = blob_service.get_container_client(AZURE_CONTAINER_NAME)
         blob_client = container.get_blob_client(blob_name)
-        stream = blob_client.download_blob()
-        data = stream.readall()
+        with track_call("blob", "open"):
+            stream = blob_client.download_blob()
+        with track_call("blob", "download"):
+            data = stream.readall()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch blob: {str(e)}")
 
@@ -398,7 +550,7 @@ def admin_view_document(
 @router.get("/documents/{doc_id}/download")
 def admin_download_document(
     doc_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_admin: User = Depends(get_current_admin),
 ):
     rec = db.query(Document).filter(Document.id == doc_id).first()
@@ -411,8 +563,10 @@ def admin_download_document(
         blob_service = BlobServiceClient.from_connection_string(AZURE_BLOB_CONNECTION_STRING)
         container = blob_service.get_container_client(AZURE_CONTAINER_NAME)
         blob_client = container.get_blob_client(blob_name)
-        stream = blob_client.download_blob()
-        data = stream.readall()
+        with track_call("blob", "open"):
+            stream = blob_client.download_blob()
+        with track_call("blob", "download"):
+            data = stream.readall()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch blob: {str(e)}")
 
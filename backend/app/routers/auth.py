@@ -1,24 +1,31 @@
 # backend/app/routers/auth.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, EmailStr
-from datetime import datetime, timedelta
-from jose import jwt, JWTError
-import random
+from jose import JWTError
 
 from app.utils.auth_utils import (
     verify_password,
     create_access_token,
+    decode_access_token,
     get_password_hash,
-    SECRET_KEY,
-    ALGORITHM,
 )
 
-from app.utils.email_utils import send_email_otp
 from app.models.user_model import User
-from app.services.database import get_db
+from app.services.challenge_store import EXPIRED, LOCKED, MISSING, VERIFIED, challenge_store
+from app.services.data_versions import data_etag, etag_matches, get_data_version
+from app.services.database import SessionLocal, get_db, get_read_db
+from app.services.outbox import record_event
+from app.services.rate_limit import check_rate_limit, limit_login_init_ip, limit_login_verify_ip
+from app.services.refresh_tokens import (
+    REFRESH_TOKEN_EXPIRE_DAYS,
+    issue_refresh_token,
+    revoke_refresh_token,
+    revoke_user_tokens,
+    rotate_refresh_token,
+)
 
 
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
@@ -45,18 +52,18 @@ class LoginVerifyOTP(BaseModel):
     otp: str
 
 
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+
 # =========================================================
 # get_current_user — returns FULL USER object
 # =========================================================
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-) -> User:
-
-    token = credentials.credentials
+def authenticate_token(token: str, db: Session) -> User:
+    """Decode a bearer token and load its user (raises 401 on failure)."""
 
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_access_token(token)
         email: str = payload.get("sub")
 
         if email is None:
@@ -83,6 +90,46 @@ def get_current_user(
     return user
 
 
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(oauth2_scheme),
+    db: Session = Depends(get_read_db),
+) -> User:
+    return authenticate_token(credentials.credentials, db)
+
+
+# =========================================================
+# CONDITIONAL GET → ETag from the user's data version
+#  - list it before get_current_user: a matching If-None-Match is
+#    answered 304 after one primary-key read, before the user or
+#    any data is loaded
+#  - shares the endpoint's (read) session, so the version is read
+#    before the data it labels
+# =========================================================
+def check_user_data_etag(
+    request: Request,
+    response: Response,
+    credentials: HTTPAuthorizationCredentials = Depends(oauth2_scheme),
+    db: Session = Depends(get_read_db),
+) -> None:
+    try:
+        claims = decode_access_token(credentials.credentials)
+    except JWTError:
+        return  # get_current_user rejects it
+
+    user_id = claims.get("uid")
+    if user_id is None:
+        # tokens issued before the uid claim: one extra lookup
+        user_id = db.query(User.id).filter(User.email == claims.get("sub")).scalar()
+        if user_id is None:
+            return
+
+    etag = data_etag(user_id, get_data_version(db, user_id))
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Authorization"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+
+
 # =========================================================
 # ADMIN-ONLY DEPENDENCY
 # =========================================================
@@ -124,12 +171,29 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
     return {"message": "User registered successfully", "email": new_user.email}
 
 
+# ---------------------------------------------------------
+# Per-email limits as dependencies: declared before the DB session,
+# they run before it is opened (the body is parsed once and shared)
+# ---------------------------------------------------------
+def limit_login_init_email(request: LoginInitRequest) -> None:
+    check_rate_limit("login_init:email", request.email)
+
+
+def limit_login_verify_email(request: LoginVerifyOTP) -> None:
+    check_rate_limit("login_verify:email", request.email)
+
+
 # =========================================================
 # STEP 1 → LOGIN INIT (PASSWORD VALIDATION + SEND OTP)
 # =========================================================
 @router.post("/login-init")
-def login_init(request: LoginInitRequest, db: Session = Depends(get_db)):
-
+def login_init(
+    request: LoginInitRequest,
+    # limits before the DB session on purpose: a burst costs no connection, bcrypt or SMTP
+    _ip_limit: None = Depends(limit_login_init_ip),
+    _email_limit: None = Depends(limit_login_init_email),
+    db: Session = Depends(get_read_db),
+):
     user = db.query(User).filter(User.email == request.email).first()
     if not user:
         raise HTTPException(status_code=404, detail="Email not found")
@@ -137,12 +201,12 @@ def login_init(request: LoginInitRequest, db: Session = Depends(get_db)):
     if not verify_password(request.password, user.password_hash):
         raise HTTPException(status_code=401, detail="Incorrect password")
 
-    otp = str(random.randint(100000, 999999))
-    user.email_otp_code = otp
-    user.email_otp_expiry = datetime.utcnow() + timedelta(minutes=5)
-    db.commit()
-
-    send_email_otp(user.email, otp)
+    # the outbox dispatcher (woken by this commit) makes the code, stores its HMAC in the
+    # challenge store and emails it: the event names the user only, the code is never at rest
+    with SessionLocal() as outbox_db:
+        record_event(outbox_db, "auth.otp_requested", {"email": user.email},
+                     aggregate_type="user", aggregate_id=user.id)
+        outbox_db.commit()
 
     return {"otp_sent": True, "email": user.email}
 
@@ -151,35 +215,46 @@ def login_init(request: LoginInitRequest, db: Session = Depends(get_db)):
 # STEP 2 → VERIFY OTP → ISSUE JWT TOKEN
 # =========================================================
 @router.post("/login-verify-otp")
-def login_verify_otp(request: LoginVerifyOTP, db: Session = Depends(get_db)):
-
+def login_verify_otp(
+    request: LoginVerifyOTP,
+    _ip_limit: None = Depends(limit_login_verify_ip),
+    _email_limit: None = Depends(limit_login_verify_email),
+    db: Session = Depends(get_db),
+):
     user = db.query(User).filter(User.email == request.email).first()
 
     if not user:
         raise HTTPException(status_code=404, detail="Email not found")
 
-    if not user.email_otp_code:
+    result = challenge_store.verify(user.email, request.otp)
+
+    if result == MISSING:
         raise HTTPException(status_code=400, detail="OTP not generated")
 
-    if datetime.utcnow() > user.email_otp_expiry:
+    if result == EXPIRED:
         raise HTTPException(status_code=400, detail="OTP expired")
 
-    if request.otp != user.email_otp_code:
-        raise HTTPException(status_code=400, detail="Invalid OTP")
+    if result == LOCKED:
+        raise HTTPException(status_code=400, detail="Too many attempts, request a new OTP")
 
-    # Clear OTP
-    user.email_otp_code = None
-    user.email_otp_expiry = None
-    db.commit()
+    if result != VERIFIED:
+        raise HTTPException(status_code=400, detail="Invalid OTP")
 
     access_token = create_access_token(
     {
         "sub": user.email,
         "role": user.role,
+        "uid": user.id,
     }
 )
+    # long-lived, rotating: lets the client renew the access token without bcrypt + OTP
+    refresh_token = issue_refresh_token(db, user.id)
+    db.commit()
+
     return {
         "access_token": access_token,
+        "refresh_token": refresh_token,
+        "refresh_expires_in": REFRESH_TOKEN_EXPIRE_DAYS * 24 * 3600,
         "user": {
             "id": user.id,
             "email": user.email,
@@ -189,6 +264,51 @@ def login_verify_otp(request: LoginVerifyOTP, db: Session = Depends(get_db)):
     }
 
 
+# =========================================================
+# REFRESH → NEW ACCESS TOKEN (+ rotated refresh token)
+# =========================================================
+@router.post("/refresh")
+def refresh(request: RefreshRequest, db: Session = Depends(get_db)):
+
+    user, refresh_token = rotate_refresh_token(db, request.refresh_token)
+    db.commit()
+
+    access_token = create_access_token(
+        {
+            "sub": user.email,
+            "role": user.role,
+            "uid": user.id,
+        }
+    )
+    return {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "refresh_expires_in": REFRESH_TOKEN_EXPIRE_DAYS * 24 * 3600,
+    }
+
+
+# =========================================================
+# LOGOUT → REVOKE REFRESH TOKENS
+# =========================================================
+@router.post("/logout")
+def logout(request: RefreshRequest, db: Session = Depends(get_db)):
+    """Revoke this refresh token (and its rotation chain). Always succeeds."""
+    revoke_refresh_token(db, request.refresh_token)
+    db.commit()
+    return {"logged_out": True}
+
+
+@router.post("/logout-all")
+def logout_all(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Revoke every refresh token of the current user (all devices)."""
+    revoked = revoke_user_tokens(db, current_user.id)
+    db.commit()
+    return {"logged_out": True, "revoked": revoked}
+
+
 # =========================================================
 # ADMIN CHECK – simple test endpoint
 # =========================================================
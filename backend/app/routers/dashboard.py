@@ -0,0 +1,137 @@
+# backend/app/routers/dashboard.py
+
+import asyncio
+import hashlib
+import json
+
+from fastapi import APIRouter, Depends, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import func, select
+
+from app.models.deal_model import Deal
+from app.models.user_model import User
+from app.routers import deals, documents, investments, profiles
+from app.routers.auth import get_current_user
+from app.services.data_versions import ETAG_SCHEMA, etag_matches, get_data_version
+from app.services.database import SessionLocal, last_write_from_request, open_read_session
+
+router = APIRouter(prefix="/api/dashboard", tags=["Dashboard"])
+
+
+# ---------------------------------------------------------
+# Sections — each runs in its own thread with its own session,
+# reusing the same query code as the standalone endpoints
+# ---------------------------------------------------------
+def _investments_section(db, user):
+    rows = investments.get_investments(db=db, current_user=user)
+    return [investments.InvestmentSchema.model_validate(r) for r in rows]
+
+
+def _summary_section(db, user):
+    return investments.get_investment_summary(db=db, current_user=user)
+
+
+def _documents_section(db, user):
+    return documents.get_documents(db=db, current_user=user)
+
+
+def _deals_section(db, user):
+    return [deals.DealOut.model_validate(d) for d in deals.list_deals(db=db, current_user=user)]
+
+
+def _profile_section(db, user):
+    return profiles.ProfileSchema.model_validate(profiles.get_my_profile(db=db, current_user=user))
+
+
+# name -> (loader, needs primary)
+#  (profile: /me creates a missing default profile on the primary itself)
+SECTIONS = {
+    "investments": (_investments_section, False),
+    "investments_summary": (_summary_section, False),
+    "documents": (_documents_section, False),
+    "profile": (_profile_section, False),
+    "deals": (_deals_section, False),
+}
+
+
+def _etag(payload) -> str:
+    body = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return 'W/"' + hashlib.sha1(body.encode("utf-8")).hexdigest()[:20] + '"'
+
+
+def _dashboard_etag(user: User, last_write=None) -> str:
+    """
+    Overall ETag from what the sections depend on, without loading them:
+    the user's data version (investments, summary, documents, profile) and
+    the published deals (only ever added: count + newest id).
+    """
+    db = open_read_session(last_write)
+    try:
+        version = get_data_version(db, user.id)
+        deal_count, last_deal = db.execute(
+            select(func.count(Deal.id), func.max(Deal.id)).where(Deal.status == "PUBLISHED")
+        ).one()
+    finally:
+        db.close()
+    account = _etag([user.email, user.username, user.role])[3:-1]
+    return f'W/"dash-{user.id}-{version}-{deal_count}-{last_deal or 0}-{account}-{ETAG_SCHEMA}"'
+
+
+def _load_section(name: str, user: User, last_write=None):
+    loader, needs_primary = SECTIONS[name]
+    db = SessionLocal() if needs_primary else open_read_session(last_write)
+    try:
+        data = jsonable_encoder(loader(db, user))
+        return {"etag": _etag([name, data]), "data": data}
+    except Exception as e:
+        print(f"[DASHBOARD] section {name} failed for {user.email}: {e}")
+        return {"etag": None, "data": None, "error": "Failed to load section"}
+    finally:
+        db.close()
+
+
+# ---------------------------------------------------------
+# GET /api/dashboard
+#  - One round trip for the investor dashboard: the principal is resolved
+#    once and every section is queried concurrently.
+#  - The response ETag comes from the user's data version: when it
+#    still matches If-None-Match the answer is 304 before any section
+#    is loaded.
+#  - Each section carries its own ETag. Send the ones you hold in
+#    If-None-Match and unchanged sections come back without data.
+# ---------------------------------------------------------
+@router.get("")
+async def get_dashboard(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+):
+    last_write = last_write_from_request(request)
+    if_none_match = request.headers.get("if-none-match", "")
+    overall = await run_in_threadpool(_dashboard_etag, current_user, last_write)
+    if etag_matches(if_none_match, overall):
+        return Response(status_code=304, headers={"ETag": overall})
+
+    results = await asyncio.gather(
+        *(run_in_threadpool(_load_section, name, current_user, last_write) for name in SECTIONS)
+    )
+    sections = dict(zip(SECTIONS, results))
+
+    known = {tag.strip() for tag in if_none_match.split(",") if tag.strip()}
+
+    for section in sections.values():
+        if section["etag"] and section["etag"] in known:
+            section["data"] = None
+            section["not_modified"] = True
+
+    response.headers["ETag"] = overall
+    return {
+        "user": {
+            "id": current_user.id,
+            "email": current_user.email,
+            "name": current_user.username,
+            "role": current_user.role,
+        },
+        "sections": sections,
+    }
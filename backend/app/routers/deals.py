@@ -1,8 +1,11 @@
+import json
+import os
 from datetime import datetime
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel, Field
+from sqlalchemy import func, literal, null, select, union_all
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
@@ -11,7 +14,10 @@ from app.models.user_model import User
 from app.models.deal_interest_model import DealInterest
 
 from app.routers.auth import get_current_admin, get_current_user
-from app.services.database import get_db
+from app.services.cache import TTLCache
+from app.services.database import get_db, get_read_db
+from app.services.outbox import record_event
+from app.utils.fast_json import json_bytes, rows_response
 
 
 # -----------------------------
@@ -81,13 +87,39 @@ class DealInterestAdminOut(BaseModel):
 router = APIRouter(prefix="/api/deals", tags=["Deals"])
 admin_router = APIRouter(prefix="/api/admin/deals", tags=["Admin - Deals"])
 
+DEAL_SEARCH_CACHE_SECONDS = float(os.getenv("DEAL_SEARCH_CACHE_SECONDS", "60"))
+DEAL_SEARCH_MAX_LIMIT = 200
+
+# facet name -> column; each facet is a multi-value filter (?location=Texas&location=Ohio)
+DEAL_FACETS = {
+    "deal_type": Deal.deal_type,
+    "deal_subtype": Deal.deal_subtype,
+    "deal_stage": Deal.deal_stage,
+    "location": Deal.location,
+}
+DEAL_SORTS = {
+    "newest": (Deal.created_at.desc(), Deal.id.desc()),
+    "close_date": (Deal.close_date.asc(), Deal.id.asc()),
+    "offering_size": (Deal.offering_size.desc(), Deal.id.desc()),
+    "min_investment": (Deal.min_investment.asc(), Deal.id.asc()),
+    "target_irr": (Deal.target_irr.desc(), Deal.id.desc()),
+}
+DEAL_SEARCH_COLUMNS = (
+    Deal.id, Deal.name, Deal.deal_type, Deal.deal_subtype, Deal.deal_stage, Deal.sponsors,
+    Deal.close_date, Deal.offering_size, Deal.unit_price, Deal.status,
+    Deal.location, Deal.min_investment, Deal.target_irr, Deal.created_at,
+)
+
+# encoded responses, one per filter/sort/page combination; create_deal clears it
+deal_search_cache = TTLCache(ttl=DEAL_SEARCH_CACHE_SECONDS, maxsize=2000)
+
 
 # -----------------------------
 # USER: list deals (all published)
 # -----------------------------
 @router.get("/", response_model=List[DealOut])
 def list_deals(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     return (
@@ -98,13 +130,140 @@ def list_deals(
     )
 
 
+# -----------------------------
+# USER: search deals (filters + facet counts)
+#  - facets: deal_type, deal_subtype, deal_stage, location (repeat a
+#    parameter to select several values: OR within a facet, AND across)
+#  - ranges: close_from/close_to, size_min/size_max (offering size),
+#    min_investment_max (entry ticket I can afford), target_irr_min
+#  - facet counts are disjunctive: each facet is counted with every
+#    filter except its own, so the other values stay selectable
+#  - declared before /{deal_id} so "search" isn't taken for an id
+# -----------------------------
+def _deal_search_conditions(facets: dict, ranges: list, exclude: Optional[str] = None) -> list:
+    conditions = [Deal.status == "PUBLISHED", *ranges]
+    for name, values in facets.items():
+        if name != exclude:
+            conditions.append(DEAL_FACETS[name].in_(values))
+    return conditions
+
+
+def deal_facet_statement(facets: dict, ranges: list):
+    """The match count plus one GROUP BY per facet, as a single UNION ALL (one round trip)."""
+    parts = [
+        select(literal("_total").label("facet"), null().label("value"), func.count().label("count"))
+        .where(*_deal_search_conditions(facets, ranges))
+    ]
+    for name, column in DEAL_FACETS.items():
+        parts.append(
+            select(literal(name).label("facet"), column.label("value"), func.count().label("count"))
+            .where(*_deal_search_conditions(facets, ranges, exclude=name), column.is_not(None))
+            .group_by(column)
+        )
+    return union_all(*parts)
+
+
+def _deal_facet_counts(db: Session, facets: dict, ranges: list):
+    """(total, {facet: [{"value", "count"}]})"""
+    total = 0
+    counts = {name: {} for name in DEAL_FACETS}
+    for facet, value, count in db.execute(deal_facet_statement(facets, ranges)):
+        if facet == "_total":
+            total = count
+        else:
+            counts[facet][value] = count
+
+    result = {}
+    for name, values in counts.items():
+        # a selected value with no matches still comes back, so it can be unticked
+        for value in facets.get(name, ()):
+            values.setdefault(value, 0)
+        result[name] = [
+            {"value": value, "count": count}
+            for value, count in sorted(values.items(), key=lambda item: (-item[1], item[0]))
+        ]
+    return total, result
+
+
+@router.get("/search")
+def search_deals(
+    deal_type: Optional[List[str]] = Query(None),
+    deal_subtype: Optional[List[str]] = Query(None),
+    deal_stage: Optional[List[str]] = Query(None),
+    location: Optional[List[str]] = Query(None),
+    close_from: Optional[datetime] = None,
+    close_to: Optional[datetime] = None,
+    size_min: Optional[float] = None,
+    size_max: Optional[float] = None,
+    min_investment_max: Optional[float] = None,
+    target_irr_min: Optional[float] = None,
+    sort: str = "newest",
+    limit: int = Query(50, ge=1, le=DEAL_SEARCH_MAX_LIMIT),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+):
+    if sort not in DEAL_SORTS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of: {', '.join(DEAL_SORTS)}")
+
+    selected = {"deal_type": deal_type, "deal_subtype": deal_subtype, "deal_stage": deal_stage, "location": location}
+    facets = {}
+    for name, values in selected.items():
+        values = tuple(sorted({v.strip() for v in values or () if v and v.strip()}))
+        if values:
+            facets[name] = values
+
+    # the same filters in any order or spelling share one cache entry
+    key = (
+        tuple(facets.items()),
+        close_from, close_to, size_min, size_max, min_investment_max, target_irr_min,
+        sort, limit, offset,
+    )
+    headers = {"Cache-Control": f"private, max-age={int(DEAL_SEARCH_CACHE_SECONDS)}"}
+    body = deal_search_cache.get(key)
+    if body is not None:
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    ranges = []
+    if close_from is not None:
+        ranges.append(Deal.close_date >= close_from)
+    if close_to is not None:
+        ranges.append(Deal.close_date <= close_to)
+    if size_min is not None:
+        ranges.append(Deal.offering_size >= size_min)
+    if size_max is not None:
+        ranges.append(Deal.offering_size <= size_max)
+    if min_investment_max is not None:
+        ranges.append(Deal.min_investment <= min_investment_max)
+    if target_irr_min is not None:
+        ranges.append(Deal.target_irr >= target_irr_min)
+
+    total, facet_counts = _deal_facet_counts(db, facets, ranges)
+
+    items = []
+    if offset < total:
+        result = db.execute(
+            select(*DEAL_SEARCH_COLUMNS)
+            .where(*_deal_search_conditions(facets, ranges))
+            .order_by(*DEAL_SORTS[sort])
+            .limit(limit)
+            .offset(offset)
+        )
+        keys = list(result.keys())
+        items = [dict(zip(keys, row)) for row in result]
+
+    body = json_bytes({"items": items, "total": total, "facets": facet_counts})
+    deal_search_cache.set(key, body)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 # -----------------------------
 # USER: get one deal
 # -----------------------------
 @router.get("/{deal_id}", response_model=DealOut)
 def get_deal(
     deal_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     deal = db.query(Deal).filter(Deal.id == deal_id, Deal.status == "PUBLISHED").first()
@@ -144,6 +303,15 @@ def show_interest(
 
     # In case two requests hit at once and unique constraint triggers
     try:
+        db.flush()
+        record_event(db, "interest.created", {
+            "interest_id": interest.id,
+            "deal_id": deal_id,
+            "deal_name": deal.name,
+            "user_id": current_user.id,
+            "user_email": current_user.email,
+            "status": interest.status,
+        }, aggregate_type="deal", aggregate_id=deal_id)
         db.commit()
     except IntegrityError:
         db.rollback()
@@ -175,6 +343,15 @@ def create_deal(
     if payload.deal_type == "PRE_IPO" and payload.deal_subtype:
         raise HTTPException(status_code=400, detail="deal_subtype is only allowed for REAL_ESTATE")
 
+    # location / min_investment / target_irr are read out of it by the database
+    if payload.details_json:
+        try:
+            details = json.loads(payload.details_json)
+        except ValueError:
+            details = None
+        if not isinstance(details, dict):
+            raise HTTPException(status_code=400, detail="details_json must be a JSON object")
+
     deal = Deal(
         name=payload.name,
         deal_type=payload.deal_type,
@@ -190,7 +367,15 @@ def create_deal(
     )
 
     db.add(deal)
+    db.flush()
+    record_event(db, "deal.created", {
+        "deal_id": deal.id,
+        "name": deal.name,
+        "deal_type": deal.deal_type,
+        "status": deal.status,
+    }, aggregate_type="deal", aggregate_id=deal.id)
     db.commit()
+    deal_search_cache.clear()
     db.refresh(deal)
     return deal
 
@@ -201,33 +386,26 @@ def create_deal(
 @admin_router.get("/{deal_id}/interests", response_model=List[DealInterestAdminOut])
 def list_deal_interests_admin(
     deal_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_admin: User = Depends(get_current_admin),
 ):
     deal = db.query(Deal).filter(Deal.id == deal_id).first()
     if not deal:
         raise HTTPException(status_code=404, detail="Deal not found")
 
-    rows = (
-        db.query(DealInterest, User)
+    # DealInterestAdminOut's fields as plain columns, encoded without re-validation
+    result = db.execute(
+        select(
+            DealInterest.id,
+            DealInterest.deal_id,
+            DealInterest.user_id,
+            DealInterest.status,
+            DealInterest.created_at,
+            User.email.label("user_email"),
+            User.username.label("user_name"),
+        )
         .join(User, User.id == DealInterest.user_id)
-        .filter(DealInterest.deal_id == deal_id)
+        .where(DealInterest.deal_id == deal_id)
         .order_by(DealInterest.created_at.desc())
-        .all()
     )
-
-    response: List[DealInterestAdminOut] = []
-    for interest, user in rows:
-        response.append(
-            DealInterestAdminOut(
-                id=interest.id,
-                deal_id=interest.deal_id,
-                user_id=interest.user_id,
-                status=interest.status,
-                created_at=interest.created_at,
-                user_email=user.email,
-                user_name=user.username,
-            )
-        )
-
-    return response
+    return rows_response(result)
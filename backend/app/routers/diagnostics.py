@@ -0,0 +1,43 @@
+# backend/app/routers/diagnostics.py
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+
+from app.models.user_model import User
+from app.routers.auth import get_current_admin
+from app.services.profiler import get_profile_path, list_profiles
+
+router = APIRouter(prefix="/api/admin/diagnostics", tags=["Admin - Diagnostics"])
+
+
+# ---------------------------------------------------------
+# GET /api/admin/diagnostics/profiles
+#  - Recent request profiles (send `X-Profile: 1` as an admin to record one)
+# ---------------------------------------------------------
+@router.get("/profiles")
+def get_recent_profiles(
+    limit: int = 50,
+    current_admin: User = Depends(get_current_admin),
+):
+    return list_profiles(limit=limit)
+
+
+# ---------------------------------------------------------
+# GET /api/admin/diagnostics/profiles/{profile_id}
+#  - Download one profile as a collapsed-stack file
+#    (feed it to flamegraph.pl / inferno / speedscope)
+# ---------------------------------------------------------
+@router.get("/profiles/{profile_id}")
+def download_profile(
+    profile_id: str,
+    current_admin: User = Depends(get_current_admin),
+):
+    path = get_profile_path(profile_id)
+    if not path:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    return FileResponse(
+        path,
+        media_type="text/plain",
+        filename=f"{profile_id}.collapsed",
+    )
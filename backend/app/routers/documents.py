@@ -8,10 +8,14 @@ import os
 
 from azure.storage.blob import BlobServiceClient
 
+from app.models.document_access_model import DocumentAccess
 from app.models.document_model import Document
 from app.models.user_model import User
-from app.services.database import get_db
-from app.routers.auth import get_current_user
+from app.services.database import get_db, get_read_db
+from app.services.document_access import grant_access
+from app.services.metrics import track_call
+from app.services.outbox import record_event
+from app.routers.auth import check_user_data_etag, get_current_user
 
 router = APIRouter(prefix="/api/documents", tags=["Documents"])
 
@@ -34,19 +38,15 @@ MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 # -----------------------------------------------------------
 @router.get("/", response_model=List[dict])
 def get_documents(
-    db: Session = Depends(get_db),
+    _etag: None = Depends(check_user_data_etag),  # 304 before any data query
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
-    from sqlalchemy import or_
-
+    # uploaded by me OR shared with me -> one seek on document_access
     docs = (
         db.query(Document)
-        .filter(
-            or_(
-                Document.uploaded_by_id == current_user.id,
-                Document.recipient_user_id == current_user.id,
-            )
-        )
+        .join(DocumentAccess, DocumentAccess.document_id == Document.id)
+        .filter(DocumentAccess.user_id == current_user.id)
         .order_by(Document.uploaded_at.desc())
         .all()
     )
@@ -111,12 +111,14 @@ async def upload_document(
     blob_client = container.get_blob_client(blob_name)
 
     i = 1
-    while blob_client.exists():
-        blob_name = f"{base}_{i}{ext}"
-        blob_client = container.get_blob_client(blob_name)
-        i += 1
-
-    blob_client.upload_blob(contents, overwrite=True)
+    with track_call("blob", "exists"):
+        while blob_client.exists():
+            blob_name = f"{base}_{i}{ext}"
+            blob_client = container.get_blob_client(blob_name)
+            i += 1
+
+    with track_call("blob", "upload"):
+        blob_client.upload_blob(contents, overwrite=True)
     blob_url = f"{container.url}/{blob_name}"
 
     new_doc = Document(
@@ -134,6 +136,15 @@ async def upload_document(
     )
 
     db.add(new_doc)
+    grant_access(db, new_doc, [recipient_user_id])
+    # no email for investors' own uploads: admins see them in the activity feed
+    record_event(db, "document.uploaded", {
+        "document_id": new_doc.id,
+        "name": new_doc.name,
+        "deal_name": new_doc.deal_name,
+        "uploaded_by_id": current_user.id,
+        "recipient_user_id": recipient_user_id,
+    }, aggregate_type="document", aggregate_id=new_doc.id)
     db.commit()
     db.refresh(new_doc)
 
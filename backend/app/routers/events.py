@@ -0,0 +1,152 @@
+# backend/app/routers/events.py
+
+import asyncio
+import os
+import time
+from datetime import timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import JWTError, jwt
+
+from app.models.user_model import User
+from app.routers.auth import authenticate_token, get_current_admin, oauth2_scheme
+from app.services.admin_events import ADMIN_EVENT_TYPES, admin_event_broker
+from app.services.database import open_read_session
+from app.utils.auth_utils import create_access_token, decode_access_token
+
+router = APIRouter(prefix="/api/admin/events", tags=["Admin - Events"])
+
+ADMIN_EVENTS_KEEPALIVE_SECONDS = float(os.getenv("ADMIN_EVENTS_KEEPALIVE_SECONDS", "15"))
+ADMIN_EVENTS_RETRY_MS = 3000
+# a stream ticket only has to survive the round trip to EventSource
+ADMIN_EVENTS_TICKET_SECONDS = int(os.getenv("ADMIN_EVENTS_TICKET_SECONDS", "30"))
+TICKET_AUDIENCE = "admin-events"
+
+
+def _ticket_subject(ticket: str) -> tuple:
+    """(email, session expiry) from a stream ticket (401 when invalid or expired)."""
+    try:
+        claims = decode_access_token(ticket, audience=TICKET_AUDIENCE)
+    except JWTError:
+        raise HTTPException(status_code=401, detail="Invalid or expired ticket")
+    return claims.get("sub"), float(claims.get("session_exp") or time.time())
+
+
+def _authenticate_admin(token: Optional[str], ticket: Optional[str]) -> float:
+    """Check the ticket / bearer token belongs to an admin; returns when its session ends (epoch seconds)."""
+    db = open_read_session(None)
+    try:
+        if ticket:
+            email, expires_at = _ticket_subject(ticket)
+            user = db.query(User).filter(User.email == email).first()
+            if user is None:
+                raise HTTPException(status_code=401, detail="User not found")
+        else:
+            user = authenticate_token(token, db)
+            expires_at = float(jwt.get_unverified_claims(token).get("exp") or time.time())
+    finally:
+        db.close()
+    if user.role != "Admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return expires_at
+
+
+async def _event_stream(sub, backlog, expires_at: float):
+    sent = set()
+    try:
+        yield f"retry: {ADMIN_EVENTS_RETRY_MS}\n\n".encode("ascii")
+        for event in backlog:
+            sent.add(event.id)
+            yield event.frame
+
+        while True:
+            remaining = expires_at - time.time()
+            if remaining <= 0:
+                # the client reconnects with a fresh ticket (and last_event_id)
+                yield b"event: token-expired\ndata: {}\n\n"
+                return
+            try:
+                event = await asyncio.wait_for(sub.queue.get(), min(ADMIN_EVENTS_KEEPALIVE_SECONDS, remaining))
+            except asyncio.TimeoutError:
+                # keeps proxies from closing an idle connection
+                yield b": keepalive\n\n"
+                continue
+            if event is None:
+                return  # fell too far behind; the client resumes from its Last-Event-ID
+            if event.id in sent:
+                continue
+            yield event.frame
+    finally:
+        admin_event_broker.unsubscribe(sub)
+
+
+# ---------------------------------------------------------
+# POST /api/admin/events/ticket
+#  - EventSource cannot set headers, and a query string ends up in
+#    access logs: trade the access token for a ticket that is only
+#    good for opening the stream, for ADMIN_EVENTS_TICKET_SECONDS
+#  - the stream still ends when the access token would have expired
+#  - Admin-only
+# ---------------------------------------------------------
+@router.post("/ticket")
+def create_stream_ticket(
+    credentials: HTTPAuthorizationCredentials = Depends(oauth2_scheme),
+    current_admin: User = Depends(get_current_admin),
+):
+    session_exp = jwt.get_unverified_claims(credentials.credentials).get("exp")
+    ticket = create_access_token(
+        {"sub": current_admin.email, "aud": TICKET_AUDIENCE, "session_exp": session_exp},
+        expires_delta=timedelta(seconds=ADMIN_EVENTS_TICKET_SECONDS),
+    )
+    return {"ticket": ticket, "expires_in": ADMIN_EVENTS_TICKET_SECONDS}
+
+
+# ---------------------------------------------------------
+# GET /api/admin/events/stream
+#  - Server-Sent Events: document.uploaded, document.shared,
+#    interest.created, deal.created, as they are committed
+#  - ?ticket=... from POST /ticket (EventSource), or
+#    Authorization: Bearer; access tokens are never taken from the URL
+#  - resume: Last-Event-ID header (sent by EventSource on reconnect)
+#    or ?last_event_id=
+#  - ?types=interest.created,document.uploaded to filter
+# ---------------------------------------------------------
+@router.get("/stream")
+async def stream_admin_events(
+    ticket: Optional[str] = Query(None),
+    types: Optional[str] = Query(None),
+    last_event_id: Optional[int] = Query(None),
+    authorization: Optional[str] = Header(None),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+):
+    token = None
+    if authorization and authorization.lower().startswith("bearer "):
+        token = authorization[7:]
+    if not ticket and not token:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+
+    # short DB lookup in a thread; nothing is held open for the life of the stream
+    expires_at = await asyncio.to_thread(_authenticate_admin, token, ticket)
+
+    wanted = None
+    if types:
+        wanted = {t.strip() for t in types.split(",") if t.strip()}
+        unknown = wanted - set(ADMIN_EVENT_TYPES)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown event types: {', '.join(sorted(unknown))}")
+
+    if last_event_id_header and last_event_id_header.isdigit():
+        last_event_id = int(last_event_id_header)
+
+    sub, backlog = await admin_event_broker.subscribe(wanted, last_event_id)
+    return StreamingResponse(
+        _event_stream(sub, backlog, expires_at),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # nginx: flush each event
+        },
+    )
@@ -0,0 +1,204 @@
+# backend/app/routers/exports.py
+
+from datetime import date, datetime, time
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import aliased
+
+from app.models.document_model import Document
+from app.models.investment_model import Investment
+from app.models.profile_model import Profile
+from app.models.user_model import User
+from app.routers.auth import get_current_admin
+from app.services.database import last_write_from_request, open_read_session
+from app.utils.export_utils import stream_csv, stream_xlsx
+
+router = APIRouter(prefix="/api/admin/exports", tags=["Admin Exports"])
+
+# rows pulled from the cursor per round trip
+EXPORT_BATCH_SIZE = 1000
+
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+_owner = aliased(User, name="owner")
+
+
+# ---------------------------------------------------------
+# Data sets
+#  - columns: name -> column expression (also the whitelist for ?columns=)
+#  - filters: query param -> (column, op); "from"/"to" are inclusive dates
+#  - joins: outer joins needed by the columns
+# ---------------------------------------------------------
+DATASETS = {
+    "investments": {
+        "model": Investment,
+        "columns": {
+            "id": Investment.id,
+            "deal_name": Investment.deal_name,
+            "investment_total": Investment.investment_total,
+            "distribution_total": Investment.distribution_total,
+            "status": Investment.status,
+            "close_date": Investment.close_date,
+            "user_id": Investment.uploaded_by_id,
+            "investor_email": _owner.email,
+        },
+        "filters": {
+            "status": (Investment.status, "eq"),
+            "deal_name": (Investment.deal_name, "eq"),
+            "user_id": (Investment.uploaded_by_id, "eq"),
+            "closed_from": (Investment.close_date, "from"),
+            "closed_to": (Investment.close_date, "to"),
+        },
+        "joins": [(_owner, _owner.id == Investment.uploaded_by_id)],
+    },
+    "profiles": {
+        "model": Profile,
+        "columns": {
+            "id": Profile.id,
+            "entity_name": Profile.entity_name,
+            "jurisdiction": Profile.jurisdiction,
+            "tax_classification": Profile.tax_classification,
+            "profile_type": Profile.profile_type,
+            "contact_email": Profile.contact_email,
+            "contact_phone": Profile.contact_phone,
+            "user_id": Profile.user_id,
+            "user_email": _owner.email,
+        },
+        "filters": {
+            "user_id": (Profile.user_id, "eq"),
+            "profile_type": (Profile.profile_type, "eq"),
+            "jurisdiction": (Profile.jurisdiction, "eq"),
+        },
+        "joins": [(_owner, _owner.id == Profile.user_id)],
+    },
+    "documents": {
+        "model": Document,
+        "columns": {
+            "id": Document.id,
+            "name": Document.name,
+            "label": Document.label,
+            "deal_name": Document.deal_name,
+            "profile_name": Document.profile_name,
+            "document_type": Document.document_type,
+            "uploaded_by_role": Document.uploaded_by_role,
+            "uploaded_at": Document.uploaded_at,
+            "uploaded_by_id": Document.uploaded_by_id,
+            "uploaded_by_email": _owner.email,
+            "recipient_user_id": Document.recipient_user_id,
+        },
+        "filters": {
+            "deal_name": (Document.deal_name, "eq"),
+            "document_type": (Document.document_type, "eq"),
+            "uploaded_by_id": (Document.uploaded_by_id, "eq"),
+            "recipient_user_id": (Document.recipient_user_id, "eq"),
+            "uploaded_from": (Document.uploaded_at, "from"),
+            "uploaded_to": (Document.uploaded_at, "to"),
+        },
+        "joins": [(_owner, _owner.id == Document.uploaded_by_id)],
+    },
+}
+
+# query params that are not filters
+RESERVED_PARAMS = {"format", "columns"}
+
+
+def _parse_value(column, op: str, raw: str):
+    try:
+        if op in ("from", "to"):
+            day = date.fromisoformat(raw)
+            if column.type.python_type is datetime:
+                # inclusive whole days on DateTime columns
+                return datetime.combine(day, time.min if op == "from" else time.max)
+            return day
+        if column.type.python_type is int:
+            return int(raw)
+        return raw
+    except (ValueError, NotImplementedError):
+        raise HTTPException(status_code=400, detail=f"Invalid value for filter: {raw}")
+
+
+def build_export_query(dataset: str, params: dict, columns: Optional[str] = None):
+    """Validate dataset / columns / filters and return (header, select statement)."""
+    spec = DATASETS.get(dataset)
+    if spec is None:
+        raise HTTPException(status_code=404, detail=f"Unknown dataset. Choose from: {', '.join(DATASETS)}")
+
+    if columns:
+        names = [c.strip() for c in columns.split(",") if c.strip()]
+        unknown = [c for c in names if c not in spec["columns"]]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown columns: {', '.join(unknown)}")
+    else:
+        names = list(spec["columns"])
+
+    stmt = select(*[spec["columns"][n].label(n) for n in names]).select_from(spec["model"])
+    if any(spec["columns"][n] is _owner.email for n in names):
+        for target, onclause in spec["joins"]:
+            stmt = stmt.outerjoin(target, onclause)
+
+    for key, raw in params.items():
+        if key in RESERVED_PARAMS:
+            continue
+        if key not in spec["filters"]:
+            raise HTTPException(status_code=400, detail=f"Unknown filter: {key}")
+        column, op = spec["filters"][key]
+        value = _parse_value(column, op, raw)
+        if op == "eq":
+            stmt = stmt.where(column == value)
+        elif op == "from":
+            stmt = stmt.where(column >= value)
+        else:
+            stmt = stmt.where(column <= value)
+
+    # stable order so repeated exports diff cleanly
+    stmt = stmt.order_by(spec["model"].id)
+    return names, stmt
+
+
+def _stream_rows(stmt, last_write):
+    """Yield row tuples from a server-side cursor in its own session (outlives the request scope)."""
+    db = open_read_session(last_write)
+    try:
+        result = db.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        for row in result:
+            yield tuple(row)
+    finally:
+        db.close()
+
+
+# ---------------------------------------------------------
+# GET /api/admin/exports/{dataset}?format=csv|xlsx&columns=a,b&<filters>
+#  - datasets: investments, profiles, documents
+#  - streamed row by row; nothing is materialized server-side
+#  - Admin-only
+# ---------------------------------------------------------
+@router.get("/{dataset}")
+def export_dataset(
+    dataset: str,
+    request: Request,
+    format: str = "csv",
+    columns: Optional[str] = None,
+    current_admin: User = Depends(get_current_admin),
+):
+    if format not in CONTENT_TYPES:
+        raise HTTPException(status_code=400, detail="format must be csv or xlsx")
+
+    # validation happens here so bad requests get a 4xx, not a broken download
+    header, stmt = build_export_query(dataset, dict(request.query_params), columns)
+    rows = _stream_rows(stmt, last_write_from_request(request))
+
+    body = stream_csv(header, rows) if format == "csv" else stream_xlsx(header, rows, sheet_name=dataset)
+    filename = f"{dataset}-{datetime.utcnow():%Y%m%d-%H%M%S}.{format}"
+
+    print(f"[EXPORT] {current_admin.email} exporting {dataset} as {format}")
+    return StreamingResponse(
+        body,
+        media_type=CONTENT_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -2,11 +2,16 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import date
+from decimal import Decimal
 from pydantic import BaseModel
 from sqlalchemy import func
-from app.services.database import get_db
+from app.services.analytics import get_analytics
+from app.services.data_versions import bump_data_versions
+from app.services.database import get_db, get_read_db
+from app.services.ledger import balances_as_of, investor_totals, open_position
+from app.models.cash_flow_model import CashFlow
 from app.models.investment_model import Investment
-from app.routers.auth import get_current_user  # ✅ Require JWT
+from app.routers.auth import check_user_data_etag, get_current_user  # ✅ Require JWT
 
 router = APIRouter(prefix="/api/investments", tags=["Investments"])
 
@@ -32,10 +37,23 @@ class InvestmentCreateSchema(BaseModel):
     status: str = "Active"
 
 
+class CashFlowSchema(BaseModel):
+    id: int
+    investment_id: int
+    flow_type: str
+    amount: Decimal
+    flow_date: date
+    memo: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
 # ---- GET all investments ----
 @router.get("/", response_model=List[InvestmentSchema])
 def get_investments(
-    db: Session = Depends(get_db),
+    _etag: None = Depends(check_user_data_etag),  # 304 before any data query
+    db: Session = Depends(get_read_db),
     current_user=Depends(get_current_user),
 ):
     # 🔹 Only this user's investments; remove filter if you want global view
@@ -62,6 +80,9 @@ def add_investment(
         uploaded_by_id=current_user.id,
     )
     db.add(db_investment)
+    # 🔹 opening ledger entries so balances match the totals we just stored
+    open_position(db, db_investment, created_by_id=current_user.id)
+    bump_data_versions(db, [current_user.id])
     db.commit()
     db.refresh(db_investment)
     return db_investment
@@ -70,22 +91,13 @@ def add_investment(
 # ---- GET summary totals ----
 @router.get("/summary")
 def get_investment_summary(
-    db: Session = Depends(get_db),
+    _etag: None = Depends(check_user_data_etag),
+    db: Session = Depends(get_read_db),
     current_user=Depends(get_current_user),
 ):
     # 🔹 Summary only for this user's investments
-    total_invested = (
-        db.query(func.sum(Investment.investment_total))
-        .filter(Investment.uploaded_by_id == current_user.id)
-        .scalar()
-        or 0
-    )
-    total_distributed = (
-        db.query(func.sum(Investment.distribution_total))
-        .filter(Investment.uploaded_by_id == current_user.id)
-        .scalar()
-        or 0
-    )
+    # 🔹 precomputed by the cash-flow ledger (one primary-key read); positions if not in it yet
+    total_invested, total_distributed = investor_totals(db, current_user.id)
     active_count = (
         db.query(func.count(Investment.id))
         .filter(
@@ -110,4 +122,58 @@ def get_investment_summary(
         "total_distributed": round(total_distributed, 2),
         "active_count": active_count,
         "closed_count": closed_count,
-    }
\ No newline at end of file
+    }
+
+
+# ---- GET portfolio analytics (IRR / MOIC / DPI) ----
+@router.get("/analytics")
+def get_my_analytics(
+    as_of: Optional[date] = None,
+    db: Session = Depends(get_read_db),
+    current_user=Depends(get_current_user),
+):
+    # 🔹 computed for every investor at once and cached; this just picks out my rows
+    result = get_analytics(db, as_of)
+    return {
+        "as_of": result["as_of"],
+        "totals": result["by_investor"].get(current_user.id),
+        "by_deal": result["deals_by_investor"].get(current_user.id, []),
+    }
+
+
+# ---- GET my ledger balances (optionally as of a date) ----
+@router.get("/balances")
+def get_my_balances(
+    as_of: Optional[date] = None,
+    db: Session = Depends(get_read_db),
+    current_user=Depends(get_current_user),
+):
+    # 🔹 current totals come from investor_balances; as_of sums the ledger by index range
+    return {"as_of": as_of, **balances_as_of(db, as_of, user_id=current_user.id)}
+
+
+# ---- GET cash flows for one investment ----
+@router.get("/{investment_id}/cash-flows")
+def get_cash_flows(
+    investment_id: int,
+    as_of: Optional[date] = None,
+    db: Session = Depends(get_read_db),
+    current_user=Depends(get_current_user),
+):
+    investment = db.get(Investment, investment_id)
+    if not investment:
+        raise HTTPException(status_code=404, detail="Investment not found")
+    if investment.uploaded_by_id != current_user.id and current_user.role != "Admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    query = db.query(CashFlow).filter(CashFlow.investment_id == investment_id)
+    if as_of is not None:
+        query = query.filter(CashFlow.flow_date <= as_of)
+    flows = query.order_by(CashFlow.flow_date, CashFlow.id).all()
+
+    return {
+        "investment_id": investment_id,
+        "as_of": as_of,
+        "balance": balances_as_of(db, as_of, investment_id=investment_id),
+        "cash_flows": [CashFlowSchema.model_validate(f) for f in flows],
+    }
@@ -1,14 +1,21 @@
 # backend/app/routers/profiles.py
 
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import List, Optional
 
 from app.models.profile_model import Profile
 from app.models.user_model import User
-from app.services.database import get_db
-from app.routers.auth import get_current_user  # ✅ returns User object now
+from app.services.data_versions import bump_data_versions, get_data_version
+from app.services.database import get_db, get_read_db
+from app.services.default_profile import (
+    find_default_profile,
+    get_or_create_default_profile,
+    profile_cache,
+)
+from app.routers.auth import check_user_data_etag, get_current_user  # ✅ returns User object now
 
 router = APIRouter(prefix="/api/profiles", tags=["Profiles"])
 
@@ -44,45 +51,34 @@ class ProfileCreate(BaseModel):
 # ---------------------------------------------------------
 @router.get("/me", response_model=ProfileSchema)
 def get_my_profile(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),  # ✅ this is a User object
 ):
     """
-    Return the profile for the currently authenticated user.
+    Return the default profile for the currently authenticated user.
 
-    - use current_user.id directly (already resolved from token / session)
-    - If a Profile row exists for this user_id, return it.
-    - If none exists, auto-create a default Profile for this user and return it.
+    - served from the per-worker cache when possible: one primary-key read
+      of the user's data version, which every profile write bumps
+    - otherwise read it (replica-safe); if the user has none yet, it is
+      created with a single upsert on the primary, so concurrent first
+      loads can't create two defaults
     """
+    key = (current_user.id, get_data_version(db, current_user.id))
+    cached = profile_cache.get(key)
+    if cached is not None:
+        return cached
 
-    profile = (
-        db.query(Profile)
-        .filter(Profile.user_id == current_user.id)
-        .first()
-    )
-
-    if profile is None:
-        # auto-create a default profile linked to this user_id
-        profile = Profile(
-            user_id=current_user.id,
-            entity_name="Default GP Entity",
-            jurisdiction=None,
-            tax_classification=None,
-            profile_type=None,
-            contact_email=current_user.email,
-            contact_phone=None,
-        )
-        db.add(profile)
-        db.commit()
-        db.refresh(profile)
-
-    return profile
+    profile = get_or_create_default_profile(db, current_user)
+    data = ProfileSchema.model_validate(profile).model_dump()
+    profile_cache.set(key, data)
+    return data
 
 
 # ---- GET all profiles for current user ----
 @router.get("/", response_model=List[ProfileSchema])
 def get_profiles(
-    db: Session = Depends(get_db),
+    _etag: None = Depends(check_user_data_etag),  # 304 before any data query
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     return (
@@ -96,7 +92,7 @@ def get_profiles(
 @router.get("/{profile_id}", response_model=ProfileSchema)
 def get_profile(
     profile_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     rec = (
@@ -124,8 +120,20 @@ def create_profile(
         user_id=current_user.id,
         **profile.dict(),
     )
+    # a user's first profile becomes their default (what /me returns)
+    if find_default_profile(db, current_user.id) is None:
+        rec.default_user_id = current_user.id
     db.add(rec)
-    db.commit()
+    bump_data_versions(db, [current_user.id])
+    try:
+        db.commit()
+    except IntegrityError:
+        # a concurrent /me or create won the default slot
+        db.rollback()
+        rec = Profile(user_id=current_user.id, **profile.dict())
+        db.add(rec)
+        bump_data_versions(db, [current_user.id])
+        db.commit()
     db.refresh(rec)
     return rec
 
@@ -148,6 +156,7 @@ def update_profile(
 
     for k, v in updated.dict().items():
         setattr(rec, k, v)
+    bump_data_versions(db, [current_user.id])
     db.commit()
     db.refresh(rec)
     return rec
@@ -168,6 +177,19 @@ def delete_profile(
     if not rec:
         raise HTTPException(status_code=404, detail="Profile not found")
 
+    was_default = rec.default_user_id is not None
     db.delete(rec)
+    if was_default:
+        # keep /me on an existing profile (as before) instead of creating a new default
+        db.flush()
+        successor = (
+            db.query(Profile)
+            .filter(Profile.user_id == current_user.id)
+            .order_by(Profile.id)
+            .first()
+        )
+        if successor:
+            successor.default_user_id = current_user.id
+    bump_data_versions(db, [current_user.id])
     db.commit()
     return {"message": "Profile deleted successfully"}
\ No newline at end of file
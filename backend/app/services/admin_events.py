@@ -0,0 +1,242 @@
+# backend/app/services/admin_events.py
+
+"""
+In-process pub/sub feeding the admin activity stream (/api/admin/events/stream).
+
+The source of truth is the outbox table: every upload, share, interest and
+deal creation is already recorded there in the same transaction as the
+change (see services/outbox.py). One tailer task per worker, running on the
+web server's event loop, reads new outbox rows (id > last seen) and fans
+them out to the connected admins' queues. So:
+  - events written by any worker reach admins connected to every worker
+  - the outbox id doubles as the SSE event id, so a reconnecting client
+    sends Last-Event-ID and gets what it missed straight from the table
+  - the tailer queries only while someone is connected: once per
+    ADMIN_EVENTS_POLL_SECONDS, and immediately after a local commit that
+    wrote events
+
+An idle connection costs one asyncio.Queue and a parked coroutine; no DB
+session or thread is held. Each event is serialized once and the same
+bytes are queued to every subscriber. A subscriber that falls
+ADMIN_EVENTS_QUEUE_SIZE events behind is disconnected (and resumes from
+its Last-Event-ID) instead of buffering without bound.
+
+Identity values are handed out before commit, so a row can become visible
+after a higher id was already read. Skipped ids are re-checked for
+ADMIN_EVENTS_GAP_SECONDS before they are given up as rolled back.
+"""
+
+import asyncio
+import json
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import case, func, or_, select
+
+from app.models.outbox_event_model import OutboxEvent
+from app.services.database import SessionLocal
+from app.services.metrics import ADMIN_EVENT_STREAMS
+from app.services.outbox import on_events_committed
+
+# outbox event types admins see; everything else (e.g. OTP requests) never leaves the table
+ADMIN_EVENT_TYPES = (
+    "document.uploaded",
+    "document.shared",
+    "interest.created",
+    "deal.created",
+)
+ADMIN_EVENTS_POLL_SECONDS = float(os.getenv("ADMIN_EVENTS_POLL_SECONDS", "1"))
+ADMIN_EVENTS_QUEUE_SIZE = int(os.getenv("ADMIN_EVENTS_QUEUE_SIZE", "256"))
+ADMIN_EVENTS_REPLAY_LIMIT = int(os.getenv("ADMIN_EVENTS_REPLAY_LIMIT", "500"))
+ADMIN_EVENTS_GAP_SECONDS = float(os.getenv("ADMIN_EVENTS_GAP_SECONDS", "10"))
+ADMIN_EVENTS_BATCH = 500
+_MAX_GAPS = 1000
+
+
+class AdminEvent:
+    __slots__ = ("id", "event_type", "frame")
+
+    def __init__(self, row_id: int, event_type: str, payload: Optional[str], created_at):
+        self.id = row_id
+        self.event_type = event_type
+        data = json.dumps({
+            "id": row_id,
+            "type": event_type,
+            "created_at": created_at.isoformat() if created_at else None,
+            "data": json.loads(payload) if payload else {},
+        }, default=str)
+        # SSE wire format, encoded once and shared by every subscriber
+        self.frame = f"id: {row_id}\nevent: {event_type}\ndata: {data}\n\n".encode("utf-8")
+
+
+class Subscription:
+    __slots__ = ("queue", "types")
+
+    def __init__(self, types: Optional[Set[str]]):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=ADMIN_EVENTS_QUEUE_SIZE)
+        self.types = types
+
+    def wants(self, event: AdminEvent) -> bool:
+        return self.types is None or event.event_type in self.types
+
+
+class AdminEventBroker:
+    def __init__(self):
+        self._subscribers: Set[Subscription] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._last_id: Optional[int] = None
+        self._gaps: Dict[int, float] = {}   # id -> monotonic time first missed
+
+    # -----------------------------------------------------
+    # Subscribers (called on the server loop)
+    # -----------------------------------------------------
+    async def subscribe(self, types: Optional[Iterable[str]] = None, last_event_id: Optional[int] = None):
+        """
+        Register a subscriber. Returns (subscription, backlog): the events
+        after last_event_id, oldest first. The queue may deliver some of the
+        backlog's events again; skip ids already sent.
+        """
+        sub = Subscription(set(types) if types else None)
+        self._subscribers.add(sub)
+        ADMIN_EVENT_STREAMS.inc()
+        self._ensure_tailer()
+
+        backlog: List[AdminEvent] = []
+        try:
+            if self._last_id is None:
+                # pin the live cursor before reading the backlog, so the two overlap instead of leaving a hole
+                current = await asyncio.to_thread(self._current_max)
+                if self._last_id is None:
+                    self._last_id = current
+            if last_event_id is not None:
+                backlog = await asyncio.to_thread(self._fetch_since, last_event_id)
+        except BaseException:
+            self.unsubscribe(sub)
+            raise
+        return sub, [e for e in backlog if sub.wants(e)]
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        if sub in self._subscribers:
+            self._subscribers.discard(sub)
+            ADMIN_EVENT_STREAMS.dec()
+
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def poke(self) -> None:
+        """Thread-safe: check the table now (a local commit just wrote events)."""
+        loop = self._loop
+        if loop is not None and self._subscribers and not loop.is_closed():
+            loop.call_soon_threadsafe(self._wake.set)
+
+    def _publish(self, events: List[AdminEvent]) -> None:
+        for sub in list(self._subscribers):
+            for event in events:
+                if not sub.wants(event):
+                    continue
+                try:
+                    sub.queue.put_nowait(event)
+                except asyncio.QueueFull:
+                    # too slow: drop what it has and close it; the client resumes via Last-Event-ID
+                    while not sub.queue.empty():
+                        sub.queue.get_nowait()
+                    sub.queue.put_nowait(None)
+                    self.unsubscribe(sub)
+                    break
+
+    # -----------------------------------------------------
+    # Tailer (one task on the server loop, only while someone listens)
+    # -----------------------------------------------------
+    def _ensure_tailer(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is not None and not self._task.done() and self._loop is loop:
+            return
+        self._loop = loop
+        self._wake = asyncio.Event()
+        self._last_id = None
+        self._gaps.clear()
+        self._task = loop.create_task(self._tail())
+
+    async def _tail(self) -> None:
+        while self._subscribers:
+            try:
+                events = await asyncio.to_thread(self._poll)
+                if events:
+                    self._publish(events)
+            except Exception as e:
+                print(f"[ADMIN EVENTS] poll failed: {e}")
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=ADMIN_EVENTS_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+        # last subscriber left; the next subscribe() starts a fresh tailer
+        self._task = None
+
+    def _poll(self) -> List[AdminEvent]:
+        with SessionLocal() as db:
+            if self._last_id is None:
+                self._last_id = self._current_max(db)
+                return []
+
+            now = time.monotonic()
+            for row_id, first_missed in list(self._gaps.items()):
+                if now - first_missed > ADMIN_EVENTS_GAP_SECONDS:
+                    del self._gaps[row_id]   # rolled back; the id will never appear
+
+            condition = OutboxEvent.id > self._last_id
+            if self._gaps:
+                condition = or_(condition, OutboxEvent.id.in_(list(self._gaps)))
+            rows = db.execute(
+                select(
+                    OutboxEvent.id,
+                    OutboxEvent.event_type,
+                    # non-feed rows are read only to advance the cursor; leave their payload behind
+                    case((OutboxEvent.event_type.in_(ADMIN_EVENT_TYPES), OutboxEvent.payload), else_=None),
+                    OutboxEvent.created_at,
+                )
+                .where(condition)
+                .order_by(OutboxEvent.id)
+                .limit(ADMIN_EVENTS_BATCH)
+            ).all()
+
+        events = []
+        seen = set()
+        for row_id, event_type, payload, created_at in rows:
+            seen.add(row_id)
+            self._gaps.pop(row_id, None)
+            if event_type in ADMIN_EVENT_TYPES:
+                events.append(AdminEvent(row_id, event_type, payload, created_at))
+
+        new_max = max(seen, default=self._last_id)
+        if new_max > self._last_id:
+            for missing in range(self._last_id + 1, new_max):
+                if missing not in seen and len(self._gaps) < _MAX_GAPS:
+                    self._gaps[missing] = now
+            self._last_id = new_max
+        return events
+
+    def _current_max(self, db=None) -> int:
+        """Highest outbox id now: the live feed starts after it."""
+        if db is None:
+            with SessionLocal() as db:
+                return self._current_max(db)
+        return db.execute(select(func.max(OutboxEvent.id))).scalar() or 0
+
+    def _fetch_since(self, last_event_id: int) -> List[AdminEvent]:
+        """Replay for a reconnecting client (newest ADMIN_EVENTS_REPLAY_LIMIT events)."""
+        with SessionLocal() as db:
+            rows = db.execute(
+                select(OutboxEvent.id, OutboxEvent.event_type, OutboxEvent.payload, OutboxEvent.created_at)
+                .where(OutboxEvent.id > last_event_id, OutboxEvent.event_type.in_(ADMIN_EVENT_TYPES))
+                .order_by(OutboxEvent.id.desc())
+                .limit(ADMIN_EVENTS_REPLAY_LIMIT)
+            ).all()
+        return [AdminEvent(*row) for row in reversed(rows)]
+
+
+admin_event_broker = AdminEventBroker()
+on_events_committed(admin_event_broker.poke)
@@ -0,0 +1,238 @@
+# backend/app/services/analytics.py
+
+"""
+Portfolio analytics (IRR, MOIC/TVPI, DPI, RVPI, holding period) per investor,
+per deal and per investor x deal, computed for ALL positions at once with
+vectorized NumPy.
+
+Positions are loaded column-wise (no ORM objects) and results are cached under
+a cheap data-version fingerprint of the investments table, so every investor /
+admin request between two writes is served from memory.
+
+Cash-flow model (Investment only stores totals):
+  - contribution = investment_total on close_date
+  - distributions + residual value are valued on the as-of date
+  - residual value = cost basis while status is Active, 0 once Closed
+IRR is the rate r solving  sum(value_i) = sum(invested_i * (1 + r) ** years_i)
+per group, found by vectorized bisection over every group simultaneously.
+"""
+
+import threading
+from datetime import date
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from app.models.investment_model import Investment
+
+DAYS_PER_YEAR = 365.25
+IRR_LOW, IRR_HIGH = -0.9999, 100.0   # -99.99% .. +10,000%
+IRR_ITERATIONS = 60   # bracket width / 2**60 is well below the 6 digits we return
+
+
+# =========================================================
+# LOADING
+# =========================================================
+def data_version(db: Session) -> Tuple:
+    """Fingerprint of the investments table: changes on inserts, deletes and amount/status/owner updates."""
+    row = db.execute(
+        select(
+            func.count(Investment.id),
+            func.max(Investment.id),
+            func.sum(Investment.investment_total),
+            func.sum(Investment.distribution_total),
+            func.sum(case((Investment.status == "Active", 1), else_=0)),
+            func.sum(Investment.uploaded_by_id),
+        )
+    ).one()
+    return tuple(row)
+
+
+def load_positions(db: Session) -> Dict[str, np.ndarray]:
+    rows = db.execute(
+        select(
+            Investment.uploaded_by_id,
+            Investment.deal_name,
+            Investment.investment_total,
+            Investment.distribution_total,
+            Investment.status,
+            Investment.close_date,
+        )
+    ).all()
+
+    if not rows:
+        return {
+            "investor": np.empty(0, dtype=np.int64),
+            "deal": np.empty(0, dtype=object),
+            "invested": np.empty(0),
+            "distributed": np.empty(0),
+            "active": np.empty(0, dtype=bool),
+            "close_ordinal": np.empty(0),
+        }
+
+    investor, deal, invested, distributed, status, close_date = zip(*rows)
+    return {
+        "investor": np.fromiter(investor, dtype=np.int64, count=len(rows)),
+        "deal": np.array(deal, dtype=object),
+        "invested": np.array(invested, dtype=np.float64),
+        "distributed": np.array(distributed, dtype=np.float64),
+        "active": np.array([s == "Active" for s in status], dtype=bool),
+        # NaN = unknown close date (excluded from IRR / holding period)
+        "close_ordinal": np.array(
+            [d.toordinal() if d is not None else np.nan for d in close_date], dtype=np.float64
+        ),
+    }
+
+
+# =========================================================
+# VECTORIZED METRICS
+# =========================================================
+def _irr(group: np.ndarray, n_groups: int, invested: np.ndarray, value: np.ndarray, years: np.ndarray) -> np.ndarray:
+    """Per-group IRR via bisection; f(r) = sum(value) - sum(invested * (1+r)^years) is decreasing in r."""
+    dated = ~np.isnan(years)
+    g = group[dated]
+    inv = invested[dated]
+    yrs = years[dated]
+    total_value = np.bincount(g, weights=value[dated], minlength=n_groups)
+    exposure = np.bincount(g, weights=inv * yrs, minlength=n_groups)
+
+    def npv(rates):
+        grown = inv * np.power(1.0 + rates[g], yrs)
+        return total_value - np.bincount(g, weights=grown, minlength=n_groups)
+
+    lo = np.full(n_groups, IRR_LOW)
+    hi = np.full(n_groups, IRR_HIGH)
+    f_lo = npv(lo)
+    f_hi = npv(hi)
+
+    for _ in range(IRR_ITERATIONS):
+        mid = (lo + hi) / 2.0
+        f_mid = npv(mid)
+        go_up = f_mid > 0
+        lo = np.where(go_up, mid, lo)
+        hi = np.where(go_up, hi, mid)
+
+    irr = (lo + hi) / 2.0
+    # no time exposure (same-day flows / no dates) or root outside the bracket
+    irr[(exposure <= 0) | (f_lo < 0) | (f_hi > 0)] = np.nan
+    return irr
+
+
+def _group_metrics(keys: np.ndarray, pos: Dict[str, np.ndarray], years: np.ndarray):
+    uniq, group = np.unique(keys, return_inverse=True)
+    n = len(uniq)
+
+    invested = pos["invested"]
+    residual = np.where(pos["active"], invested, 0.0)
+    value = pos["distributed"] + residual
+
+    sum_inv = np.bincount(group, weights=invested, minlength=n)
+    sum_dist = np.bincount(group, weights=pos["distributed"], minlength=n)
+    sum_res = np.bincount(group, weights=residual, minlength=n)
+    count = np.bincount(group, minlength=n)
+
+    dated = ~np.isnan(years)
+    dated_inv = np.bincount(group[dated], weights=invested[dated], minlength=n)
+    weighted_years = np.bincount(group[dated], weights=invested[dated] * years[dated], minlength=n)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dpi = sum_dist / sum_inv
+        rvpi = sum_res / sum_inv
+        holding = weighted_years / dated_inv
+
+    irr = _irr(group, n, invested, value, years)
+
+    return uniq, {
+        "positions": count,
+        "invested": sum_inv,
+        "distributed": sum_dist,
+        "residual_value": sum_res,
+        "dpi": dpi,
+        "rvpi": rvpi,
+        "moic": dpi + rvpi,
+        "irr": irr,
+        "weighted_holding_years": holding,
+    }
+
+
+def _to_records(uniq, metrics, key_names) -> Dict:
+    """Columnar arrays -> {key: {metric: value}} with NaN/inf turned into None."""
+    columns = {}
+    for name, arr in metrics.items():
+        if name == "positions":
+            columns[name] = arr.astype(int).tolist()
+            continue
+        digits = 2 if name in ("invested", "distributed", "residual_value") else 6
+        clean = np.where(np.isfinite(arr), np.round(arr, digits), np.nan)
+        columns[name] = [None if np.isnan(v) else float(v) for v in clean.tolist()]
+
+    records = {}
+    for i, key in enumerate(uniq.tolist()):
+        rec = {name: col[i] for name, col in columns.items()}
+        if isinstance(key, tuple):
+            rec.update(dict(zip(key_names, key)))
+        else:
+            rec[key_names[0]] = key
+        records[key] = rec
+    return records
+
+
+def compute_analytics(pos: Dict[str, np.ndarray], as_of: date) -> Dict:
+    years = np.clip((as_of.toordinal() - pos["close_ordinal"]) / DAYS_PER_YEAR, 0.0, None)
+
+    n = len(pos["invested"])
+    deal_keys = pos["deal"].astype(str) if n else np.empty(0, dtype=str)
+    # investor x deal: a structured key so np.unique can group on both columns
+    pair_keys = np.empty(n, dtype=[("investor", np.int64), ("deal", deal_keys.dtype if n else "U1")])
+    if n:
+        pair_keys["investor"] = pos["investor"]
+        pair_keys["deal"] = deal_keys
+
+    by_investor = _to_records(*_group_metrics(pos["investor"], pos, years), ["user_id"])
+    by_deal = _to_records(*_group_metrics(deal_keys, pos, years), ["deal_name"])
+    by_pair = _to_records(*_group_metrics(pair_keys, pos, years), ["user_id", "deal_name"])
+    total = _to_records(*_group_metrics(np.zeros(n, dtype=np.int64), pos, years), ["portfolio"])
+
+    portfolio = total.get(0)
+    if portfolio:
+        portfolio.pop("portfolio")
+
+    deals_by_investor: Dict[int, list] = {}
+    for (user_id, _deal), rec in by_pair.items():
+        deals_by_investor.setdefault(user_id, []).append(rec)
+
+    return {
+        "as_of": as_of.isoformat(),
+        "portfolio": portfolio,
+        "by_investor": by_investor,
+        "by_deal": by_deal,
+        "deals_by_investor": deals_by_investor,
+    }
+
+
+# =========================================================
+# CACHE (keyed by data version + as-of date)
+# =========================================================
+_cache_lock = threading.Lock()
+_cache: Dict[Tuple, Dict] = {}
+
+
+def get_analytics(db: Session, as_of: Optional[date] = None) -> Dict:
+    as_of = as_of or date.today()
+    key = (data_version(db), as_of)
+
+    cached = _cache.get(key)
+    if cached is not None:
+        return cached
+
+    result = compute_analytics(load_positions(db), as_of)
+    with _cache_lock:
+        # keep only the current version (plus a few as-of dates for it)
+        for old in [k for k in _cache if k[0] != key[0]]:
+            del _cache[old]
+        if len(_cache) >= 8:
+            _cache.clear()
+        _cache[key] = result
+    return result
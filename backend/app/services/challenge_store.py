@@ -0,0 +1,197 @@
+# backend/app/services/challenge_store.py
+
+"""
+Login challenge (email OTP) store with TTL expiry and hashed codes.
+
+Backends (CHALLENGE_STORE env var):
+  - "sql" (default): login_challenges table, shared by every worker/node.
+    Expired rows are purged opportunistically, at most once per
+    CHALLENGE_CLEANUP_SECONDS.
+  - "memory": per-process dict. Only for a single worker process; with
+    several workers login-init and verify may land on different processes.
+
+Codes are stored as HMAC-SHA256(SECRET_KEY, email:code); a challenge is
+consumed on first successful verify and dropped after
+CHALLENGE_MAX_ATTEMPTS wrong codes.
+"""
+
+import hashlib
+import hmac
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+
+from app.models.login_challenge_model import LoginChallenge
+from app.services.database import SessionLocal
+from app.utils.auth_utils import SECRET_KEY
+
+CHALLENGE_STORE = os.getenv("CHALLENGE_STORE", "sql").lower()
+CHALLENGE_TTL_SECONDS = int(os.getenv("CHALLENGE_TTL_SECONDS", "300"))
+CHALLENGE_MAX_ATTEMPTS = int(os.getenv("CHALLENGE_MAX_ATTEMPTS", "5"))
+CHALLENGE_CLEANUP_SECONDS = float(os.getenv("CHALLENGE_CLEANUP_SECONDS", "60"))
+
+# verify() results
+VERIFIED = "verified"
+MISSING = "missing"
+EXPIRED = "expired"
+INVALID = "invalid"
+LOCKED = "locked"
+
+
+def hash_code(email: str, code: str) -> str:
+    message = f"{email.lower()}:{code}".encode("utf-8")
+    return hmac.new(SECRET_KEY.encode("utf-8"), message, hashlib.sha256).hexdigest()
+
+
+# =========================================================
+# SQL BACKEND
+# =========================================================
+class SqlChallengeStore:
+    """login_challenges table; each call is its own short transaction."""
+
+    def __init__(self):
+        self._last_cleanup = 0.0
+
+    def put(self, email: str, code: str, ttl: int = CHALLENGE_TTL_SECONDS) -> None:
+        email = email.lower()
+        now = datetime.utcnow()
+        values = {"code_hash": hash_code(email, code), "expires_at": now + timedelta(seconds=ttl),
+                  "attempts": 0, "created_at": now}
+        db = SessionLocal()
+        try:
+            replaced = db.execute(
+                update(LoginChallenge).where(LoginChallenge.email == email).values(**values)
+            ).rowcount
+            if not replaced:
+                db.add(LoginChallenge(email=email, **values))
+            try:
+                db.commit()
+            except IntegrityError:
+                # concurrent login-init for the same email inserted first: overwrite it
+                db.rollback()
+                db.execute(update(LoginChallenge).where(LoginChallenge.email == email).values(**values))
+                db.commit()
+        finally:
+            db.close()
+        self._maybe_cleanup()
+
+    def verify(self, email: str, code: str) -> str:
+        email = email.lower()
+        db = SessionLocal()
+        try:
+            challenge = db.get(LoginChallenge, email)
+            if challenge is None:
+                return MISSING
+            if challenge.expires_at < datetime.utcnow():
+                db.delete(challenge)
+                db.commit()
+                return EXPIRED
+
+            code_hash = hash_code(email, code)
+            if hmac.compare_digest(code_hash, challenge.code_hash):
+                # conditional delete = atomic consume; a parallel verify gets 0 rows
+                consumed = db.execute(
+                    delete(LoginChallenge).where(
+                        LoginChallenge.email == email, LoginChallenge.code_hash == code_hash
+                    )
+                ).rowcount
+                db.commit()
+                return VERIFIED if consumed else MISSING
+
+            attempts = challenge.attempts + 1
+            if attempts >= CHALLENGE_MAX_ATTEMPTS:
+                db.delete(challenge)
+                db.commit()
+                return LOCKED
+            db.execute(
+                update(LoginChallenge)
+                .where(LoginChallenge.email == email)
+                .values(attempts=LoginChallenge.attempts + 1)
+            )
+            db.commit()
+            return INVALID
+        finally:
+            db.close()
+
+    def purge_expired(self) -> int:
+        db = SessionLocal()
+        try:
+            removed = db.execute(
+                delete(LoginChallenge).where(LoginChallenge.expires_at < datetime.utcnow())
+            ).rowcount
+            db.commit()
+            return removed or 0
+        finally:
+            db.close()
+
+    def _maybe_cleanup(self) -> None:
+        now = time.monotonic()
+        if now - self._last_cleanup < CHALLENGE_CLEANUP_SECONDS:
+            return
+        self._last_cleanup = now
+        try:
+            removed = self.purge_expired()
+            if removed:
+                print(f"[AUTH] purged {removed} expired login challenges")
+        except Exception as e:
+            print(f"[AUTH] login challenge cleanup failed: {e}")
+
+
+# =========================================================
+# MEMORY BACKEND (single process)
+# =========================================================
+class MemoryChallengeStore:
+    def __init__(self):
+        self._data = {}  # email -> [code_hash, expires_at (monotonic), attempts]
+        self._lock = threading.Lock()
+
+    def put(self, email: str, code: str, ttl: int = CHALLENGE_TTL_SECONDS) -> None:
+        email = email.lower()
+        now = time.monotonic()
+        with self._lock:
+            self._data[email] = [hash_code(email, code), now + ttl, 0]
+            # cheap sweep so abandoned challenges don't accumulate
+            if len(self._data) > 1000:
+                for key in [k for k, v in self._data.items() if v[1] < now]:
+                    del self._data[key]
+
+    def verify(self, email: str, code: str) -> str:
+        email = email.lower()
+        with self._lock:
+            entry = self._data.get(email)
+            if entry is None:
+                return MISSING
+            if entry[1] < time.monotonic():
+                del self._data[email]
+                return EXPIRED
+            if hmac.compare_digest(hash_code(email, code), entry[0]):
+                del self._data[email]
+                return VERIFIED
+            entry[2] += 1
+            if entry[2] >= CHALLENGE_MAX_ATTEMPTS:
+                del self._data[email]
+                return LOCKED
+            return INVALID
+
+    def purge_expired(self) -> int:
+        now = time.monotonic()
+        with self._lock:
+            expired = [k for k, v in self._data.items() if v[1] < now]
+            for key in expired:
+                del self._data[key]
+        return len(expired)
+
+
+def _create_store():
+    if CHALLENGE_STORE == "memory":
+        return MemoryChallengeStore()
+    if CHALLENGE_STORE != "sql":
+        print(f"[AUTH] unknown CHALLENGE_STORE={CHALLENGE_STORE!r}, using sql")
+    return SqlChallengeStore()
+
+
+challenge_store = _create_store()
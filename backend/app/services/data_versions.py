@@ -0,0 +1,78 @@
+# backend/app/services/data_versions.py
+
+"""
+Per-user data versions → ETags for the investor GET endpoints.
+
+Writers call bump_data_versions(db, user_ids) in the same transaction as the
+change (nothing here commits), so the version a reader sees never runs ahead
+of the data. Readers fetch the version first, with the same session as the
+data queries: the data they return is at least as new as the version in the
+ETag, so a client can at worst revalidate once more than needed, never keep
+a stale copy.
+
+A conditional GET whose If-None-Match still matches costs one primary-key
+read of user_data_versions (see check_user_data_etag in routers/auth.py).
+"""
+
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.user_data_version_model import UserDataVersion
+
+# part of every ETag: bump when these responses change shape, so clients refetch after a deploy
+ETAG_SCHEMA = "1"
+_IN_CHUNK = 1000   # SQL Server caps a statement at 2100 parameters
+
+
+def bump_data_versions(db: Session, user_ids: Iterable[Optional[int]]) -> None:
+    """Increment the data version of every given user in the caller's transaction."""
+    # sorted: concurrent writers lock version rows in the same order
+    ids = sorted({user_id for user_id in user_ids if user_id is not None})
+    now = datetime.utcnow()
+    for i in range(0, len(ids), _IN_CHUNK):
+        chunk = ids[i:i + _IN_CHUNK]
+        # relative UPDATE so concurrent bumps add up
+        db.execute(
+            update(UserDataVersion)
+            .where(UserDataVersion.user_id.in_(chunk))
+            .values(version=UserDataVersion.version + 1, updated_at=now)
+        )
+        present = set(db.execute(select(UserDataVersion.user_id).where(UserDataVersion.user_id.in_(chunk))).scalars())
+        for user_id in chunk:
+            if user_id in present:
+                continue
+            try:
+                with db.begin_nested():
+                    db.add(UserDataVersion(user_id=user_id, version=1, updated_at=now))
+            except IntegrityError:
+                # a concurrent writer created it first: bump theirs
+                db.execute(
+                    update(UserDataVersion)
+                    .where(UserDataVersion.user_id == user_id)
+                    .values(version=UserDataVersion.version + 1, updated_at=now)
+                )
+
+
+def get_data_version(db: Session, user_id: int) -> int:
+    return db.execute(
+        select(UserDataVersion.version).where(UserDataVersion.user_id == user_id)
+    ).scalar() or 0
+
+
+def data_etag(user_id: int, version: int) -> str:
+    # the user id keeps one browser's cached copies apart across accounts
+    return f'W/"{user_id}-{version}-{ETAG_SCHEMA}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # weak comparison (RFC 9110 13.1.2): W/ prefixes don't matter
+    target = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == target for tag in if_none_match.split(","))
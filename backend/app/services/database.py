@@ -1,4 +1,9 @@
-from sqlalchemy import create_engine
+import os
+import time
+
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import sessionmaker, declarative_base
 from urllib.parse import quote_plus
 
@@ -25,24 +30,128 @@ raw_odbc_string = (
 # URL-encode ODBC string for SQLAlchemy
 encoded_odbc = quote_plus(raw_odbc_string)
 
-DATABASE_URL = f"mssql+pyodbc:///?odbc_connect={encoded_odbc}"
+# DATABASE_URL overrides Azure SQL (e.g. sqlite:///./bench.db for local runs / benchmarks)
+DATABASE_URL = os.getenv("DATABASE_URL") or f"mssql+pyodbc:///?odbc_connect={encoded_odbc}"
+
+
+def _engine_options(url: str) -> dict:
+    if url.startswith("sqlite"):
+        # FastAPI runs sync endpoints in a threadpool
+        return {"connect_args": {"check_same_thread": False}}
+    return {"fast_executemany": True}
+
 
 # --------------------------------------
 # SQLAlchemy Setup
 # --------------------------------------
 engine = create_engine(
     DATABASE_URL,
-    fast_executemany=True,
+    **_engine_options(DATABASE_URL),
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
-# FastAPI dependency
-def get_db():
+# --------------------------------------
+# Read replica
+#  - READ_REPLICA_URL: explicit replica URL
+#  - otherwise on Azure SQL: same server with ApplicationIntent=ReadOnly
+#    (routes to the readable secondary when read scale-out is enabled)
+#  - DATABASE_URL override without READ_REPLICA_URL: no replica
+# --------------------------------------
+READ_REPLICA_URL = os.getenv("READ_REPLICA_URL")
+if not READ_REPLICA_URL and not os.getenv("DATABASE_URL"):
+    READ_REPLICA_URL = (
+        "mssql+pyodbc:///?odbc_connect="
+        + quote_plus(raw_odbc_string + "ApplicationIntent=ReadOnly;")
+    )
+
+# after a write, that client's reads stay on primary for this long (replica lag)
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "10"))
+# after a failed replica connection, skip the replica for this long
+REPLICA_RETRY_SECONDS = float(os.getenv("REPLICA_RETRY_SECONDS", "30"))
+
+if READ_REPLICA_URL:
+    read_engine = create_engine(
+        READ_REPLICA_URL,
+        pool_pre_ping=True,
+        **_engine_options(READ_REPLICA_URL),
+    )
+else:
+    read_engine = engine
+
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+_replica_down_until = 0.0
+
+# the last commit time travels with the client (this API runs on several
+# workers/instances, so no process can remember it): responses to requests
+# that wrote carry it, the frontend echoes it back, get_read_db honours it
+LAST_WRITE_HEADER = "X-Last-Write"
+
+
+def last_write_from_request(request: Request):
+    """Epoch seconds of the caller's last write, if the client sent one."""
+    try:
+        return float(request.headers.get(LAST_WRITE_HEADER, ""))
+    except ValueError:
+        return None
+
+
+def has_recent_write(last_write) -> bool:
+    # a value from the future (clock skew between instances) also counts as recent
+    return last_write is not None and time.time() - last_write < READ_YOUR_WRITES_SECONDS
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _flag_write(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _remember_write(session):
+    if session.info.pop("wrote", False):
+        state = session.info.get("request_state")
+        if state is not None:
+            state.last_write = time.time()  # sent back as X-Last-Write (see main.py)
+
+
+def open_read_session(last_write=None):
+    global _replica_down_until
+
+    if (
+        read_engine is engine
+        or time.monotonic() < _replica_down_until
+        or has_recent_write(last_write)
+    ):
+        return SessionLocal()
+
+    db = ReadSessionLocal()
+    try:
+        db.connection()
+    except DBAPIError as e:
+        print(f"[DB] Read replica unavailable, falling back to primary: {e}")
+        _replica_down_until = time.monotonic() + REPLICA_RETRY_SECONDS
+        db.close()
+        return SessionLocal()
+    return db
+
+
+# FastAPI dependency (primary, read/write)
+def get_db(request: Request):
     db = SessionLocal()
+    db.info["request_state"] = request.state
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# FastAPI dependency (read-only endpoints: replica when safe, else primary)
+def get_read_db(request: Request):
+    db = open_read_session(last_write_from_request(request))
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
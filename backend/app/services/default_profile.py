@@ -0,0 +1,100 @@
+# backend/app/services/default_profile.py
+
+"""
+Default profile per user (the one /api/profiles/me returns).
+
+A user's default profile is the row with default_user_id = user_id; a
+filtered unique index on default_user_id makes "at most one" a database
+guarantee. Creating it is a single upsert statement (MERGE on SQL Server,
+INSERT .. ON CONFLICT DO NOTHING on SQLite), so concurrent first loads
+can't create duplicates, and the steady state is read-only.
+"""
+
+import os
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.profile_model import Profile
+from app.models.user_model import User
+from app.services.cache import TTLCache
+from app.services.data_versions import bump_data_versions
+from app.services.database import SessionLocal
+
+DEFAULT_ENTITY_NAME = "Default GP Entity"
+
+# (user_id, data version) -> serialized default profile. Every profile write
+# bumps the user's data version (services/data_versions.py), so a write on any
+# worker makes the old entries unreachable everywhere; the TTL only frees memory
+PROFILE_CACHE_SECONDS = float(os.getenv("PROFILE_CACHE_SECONDS", "300"))
+profile_cache = TTLCache(ttl=PROFILE_CACHE_SECONDS)
+
+_MERGE_SQL = text(
+    """
+    MERGE profiles WITH (HOLDLOCK) AS target
+    USING (SELECT :user_id AS default_user_id) AS source
+        ON target.default_user_id = source.default_user_id
+    WHEN NOT MATCHED THEN
+        INSERT (user_id, default_user_id, entity_name, contact_email)
+        VALUES (:user_id, :user_id, :entity_name, :contact_email);
+    """
+)
+
+
+def find_default_profile(db: Session, user_id: int) -> Optional[Profile]:
+    return db.query(Profile).filter(Profile.default_user_id == user_id).first()
+
+
+def upsert_default_profile(db: Session, user: User) -> None:
+    """Create the user's default profile unless it exists. One statement, no read-then-write race."""
+    values = {
+        "user_id": user.id,
+        "default_user_id": user.id,
+        "entity_name": DEFAULT_ENTITY_NAME,
+        "contact_email": user.email,
+    }
+    dialect = db.get_bind().dialect.name
+
+    if dialect == "mssql":
+        db.execute(_MERGE_SQL, {k: values[k] for k in ("user_id", "entity_name", "contact_email")})
+    elif dialect == "sqlite":
+        db.execute(
+            sqlite_insert(Profile)
+            .values(**values)
+            .on_conflict_do_nothing(
+                index_elements=[Profile.default_user_id],
+                index_where=Profile.default_user_id.isnot(None),
+            )
+        )
+    else:
+        # other backends: the unique index still arbitrates
+        try:
+            with db.begin_nested():
+                db.add(Profile(**values))
+        except IntegrityError:
+            pass
+
+
+def get_or_create_default_profile(db: Session, user: User) -> Profile:
+    """
+    Read the default profile from `db` (may be the replica); on a miss, upsert
+    it on the primary in its own short transaction and read it back there.
+    """
+    profile = find_default_profile(db, user.id)
+    if profile is not None:
+        return profile
+
+    primary = SessionLocal()
+    try:
+        upsert_default_profile(primary, user)
+        bump_data_versions(primary, [user.id])  # /api/profiles now lists it
+        primary.commit()
+        profile = find_default_profile(primary, user.id)
+        primary.expunge(profile)
+        return profile
+    finally:
+        primary.close()
+
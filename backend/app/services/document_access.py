@@ -0,0 +1,72 @@
+# backend/app/services/document_access.py
+
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.models.document_access_model import DocumentAccess
+from app.models.document_model import Document
+from app.models.user_model import User
+from app.services.data_versions import bump_data_versions
+
+
+def grant_access(db: Session, document: Document, recipient_ids: Iterable[int] = ()) -> List[int]:
+    """
+    Add OWNER (uploader) + RECIPIENT rows for a document in the caller's transaction,
+    and bump the data version of everyone who gained access.
+    Returns the recipient ids that were newly granted.
+    """
+    if document.id is None:
+        # brand-new document: nothing to look up
+        db.flush()
+        existing = set()
+    else:
+        existing = {
+            user_id
+            for (user_id,) in db.query(DocumentAccess.user_id).filter(DocumentAccess.document_id == document.id)
+        }
+    now = datetime.utcnow()
+
+    changed = []
+    if document.uploaded_by_id not in existing:
+        db.add(DocumentAccess(user_id=document.uploaded_by_id, document_id=document.id, role="OWNER", granted_at=now))
+        existing.add(document.uploaded_by_id)
+        changed.append(document.uploaded_by_id)
+
+    granted = []
+    for user_id in recipient_ids:
+        if user_id is None or user_id in existing:
+            continue
+        db.add(DocumentAccess(user_id=user_id, document_id=document.id, role="RECIPIENT", granted_at=now))
+        existing.add(user_id)
+        granted.append(user_id)
+
+    bump_data_versions(db, changed + granted)
+    return granted
+
+
+def get_document_for_user(db: Session, doc_id: int, current_user: User) -> Document:
+    """
+    Load a document the user may open: admins see everything, others need an
+    access row. The allowed path is one seek on document_access (+ PK lookup).
+    """
+    if current_user.role == "Admin":
+        rec: Optional[Document] = db.query(Document).filter(Document.id == doc_id).first()
+    else:
+        rec = (
+            db.query(Document)
+            .join(DocumentAccess, DocumentAccess.document_id == Document.id)
+            .filter(DocumentAccess.user_id == current_user.id, DocumentAccess.document_id == doc_id)
+            .first()
+        )
+        if rec is None:
+            # slow path only on failure: keep 404 vs 403 the same as before
+            exists = db.query(Document.id).filter(Document.id == doc_id).first()
+            if exists:
+                raise HTTPException(status_code=403, detail="Not authorized")
+
+    if not rec or not rec.file_path:
+        raise HTTPException(status_code=404, detail="Document not found")
+    return rec
@@ -0,0 +1,41 @@
+# backend/app/services/event_handlers.py
+
+"""
+Outbox event handlers (side effects that used to run inline in requests).
+
+Delivery is at-least-once, so each handler must tolerate repeats: a digest
+lists a document once however many of its events were claimed, and a
+repeated OTP event sends a fresh code that replaces the previous one.
+"""
+
+import asyncio
+import os
+import secrets
+from typing import List
+
+from app.services.challenge_store import challenge_store
+from app.services.notifications import NOTIFY_EVENT
+from app.services.outbox import subscribe, subscribe_coalesced
+from app.utils.email_utils import send_document_digest, send_email_otp
+
+
+@subscribe("auth.otp_requested")
+async def send_login_otp(payload: dict, event_id: int) -> None:
+    # the code exists only here and in the email; the challenge store keeps its HMAC
+    otp = f"{secrets.randbelow(900000) + 100000}"
+    await asyncio.to_thread(challenge_store.put, payload["email"], otp)
+    sent = await asyncio.to_thread(send_email_otp, payload["email"], otp)
+    if not sent:
+        raise RuntimeError(f"OTP email to {payload['email']} not sent")
+
+
+@subscribe_coalesced(NOTIFY_EVENT)
+async def send_document_digest_email(payloads: List[dict], event_ids: List[int]) -> None:
+    """All of one recipient's pending document notifications, as one email."""
+    email = payloads[-1]["email"]   # oldest first: the latest address wins
+    names = list(dict.fromkeys(p["name"] for p in payloads))
+    frontend_url = os.getenv("FRONTEND_URL", "http://localhost:5173")
+    failed = await asyncio.to_thread(send_document_digest, [(email, names)], frontend_url)
+    if failed:
+        raise RuntimeError(f"document digest to {email} not sent")
+    print(f"[NOTIFY] sent digest to {email} covering {len(names)} documents")
@@ -0,0 +1,205 @@
+# backend/app/services/investment_import.py
+
+"""
+Bulk investment import from CSV.
+
+The upload is parsed as a stream (csv.DictReader over the spooled upload),
+validated with Pydantic one chunk at a time, and valid rows are inserted with
+a single executemany per chunk (fast_executemany on SQL Server) inside the
+caller's transaction. Every row carries this import's import_batch tag, so
+the new ids are read back with one indexed select (no RETURNING, which
+pyodbc can't batch). Opening ledger entries + balances are then written
+set-based for the whole batch.
+
+Columns: deal_name, investment_total, distribution_total, status,
+close_date (YYYY-MM-DD), and user_id or investor_email.
+"""
+
+import csv
+import io
+import uuid
+from datetime import date
+from typing import IO, Dict, List, Optional
+
+from pydantic import BaseModel, Field, ValidationError, field_validator, model_validator
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.investment_model import Investment
+from app.models.user_model import User
+from app.services.data_versions import bump_data_versions
+from app.services.ledger import open_positions_bulk
+
+IMPORT_CHUNK_SIZE = 1000      # rows validated + inserted per executemany
+MAX_REPORTED_ERRORS = 1000    # errors beyond this are counted, not listed
+
+REQUIRED_COLUMNS = {"deal_name", "investment_total"}
+KNOWN_COLUMNS = REQUIRED_COLUMNS | {"distribution_total", "status", "close_date", "user_id", "investor_email"}
+
+
+class InvestmentImportRow(BaseModel):
+    deal_name: str = Field(..., min_length=1, max_length=255)
+    investment_total: float = Field(..., ge=0)
+    distribution_total: float = Field(0, ge=0)
+    status: str = "Active"
+    close_date: Optional[date] = None
+    user_id: Optional[int] = None
+    investor_email: Optional[str] = None
+
+    @field_validator("status")
+    @classmethod
+    def _status(cls, value):
+        if value not in ("Active", "Closed"):
+            raise ValueError("status must be Active or Closed")
+        return value
+
+    @field_validator("investor_email")
+    @classmethod
+    def _email(cls, value):
+        return value.lower() if value else value
+
+    @model_validator(mode="after")
+    def _owner(self):
+        if self.user_id is None and not self.investor_email:
+            raise ValueError("user_id or investor_email is required")
+        return self
+
+
+class ImportReport:
+    def __init__(self):
+        self.rows_read = 0
+        self.rows_valid = 0
+        self.rows_inserted = 0        # staged in the caller's transaction
+        self.ledger_entries = 0
+        self.error_count = 0
+        self.errors: List[Dict] = []
+
+    def add_error(self, line: int, message: str, field: Optional[str] = None):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "field": field, "error": message})
+
+    def as_dict(self, dry_run: bool, committed: bool) -> Dict:
+        return {
+            "dry_run": dry_run,
+            "committed": committed,
+            "rows_read": self.rows_read,
+            "rows_valid": self.rows_valid,
+            # rolled back unless committed: nothing was written
+            "rows_inserted": self.rows_inserted if committed else 0,
+            "ledger_entries": self.ledger_entries if committed else 0,
+            "error_count": self.error_count,
+            "errors": self.errors,
+            "errors_truncated": self.error_count > len(self.errors),
+        }
+
+
+def _clean(raw: Dict) -> Dict:
+    # empty cells -> missing, so defaults apply
+    return {
+        k.strip(): v.strip()
+        for k, v in raw.items()
+        if k and k.strip() in KNOWN_COLUMNS and v is not None and v.strip() != ""
+    }
+
+
+def _resolve_owners(db: Session, chunk, report: ImportReport, cache: Dict) -> List[Dict]:
+    """Map user_id / investor_email to users with one IN query per chunk; drop rows with unknown owners."""
+    emails = {row.investor_email for _, row in chunk if row.user_id is None} - set(cache["emails"])
+    if emails:
+        for user_id, email in db.execute(select(User.id, User.email).where(func.lower(User.email).in_(emails))):
+            cache["emails"][email.lower()] = user_id
+
+    ids = {row.user_id for _, row in chunk if row.user_id is not None} - cache["ids"]
+    if ids:
+        cache["ids"].update(uid for (uid,) in db.execute(select(User.id).where(User.id.in_(ids))))
+
+    values = []
+    for line, row in chunk:
+        if row.user_id is not None:
+            owner = row.user_id if row.user_id in cache["ids"] else None
+            field, given = "user_id", row.user_id
+        else:
+            owner = cache["emails"].get(row.investor_email)
+            field, given = "investor_email", row.investor_email
+        if owner is None:
+            report.add_error(line, f"Unknown investor: {given}", field)
+            continue
+        values.append(
+            {
+                "deal_name": row.deal_name,
+                "investment_total": row.investment_total,
+                "distribution_total": row.distribution_total,
+                "status": row.status,
+                "close_date": row.close_date,
+                "uploaded_by_id": owner,
+            }
+        )
+    return values
+
+
+def import_investments(db: Session, stream: IO[bytes], dry_run: bool = False,
+                       created_by_id: Optional[int] = None) -> ImportReport:
+    """
+    Validate + insert every row of a CSV byte stream in the caller's
+    transaction. Nothing is inserted in dry-run mode. The caller commits
+    only if report.error_count == 0.
+    """
+    report = ImportReport()
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", errors="replace", newline="")
+    try:
+        _import_rows(db, csv.DictReader(text), report, dry_run, created_by_id)
+    finally:
+        text.detach()  # leave the upload's file open for its owner
+    return report
+
+
+def _import_rows(db: Session, reader: csv.DictReader, report: ImportReport, dry_run: bool,
+                 created_by_id: Optional[int]) -> None:
+    header = {h.strip() for h in (reader.fieldnames or []) if h}
+    missing = REQUIRED_COLUMNS - header
+    if missing:
+        report.add_error(1, f"Missing required columns: {', '.join(sorted(missing))}")
+        return
+    if not header & {"user_id", "investor_email"}:
+        report.add_error(1, "Missing owner column: user_id or investor_email")
+        return
+
+    owners = {"emails": {}, "ids": set()}
+    inserted_for = set()
+    batch = uuid.uuid4().hex
+    chunk = []
+
+    def flush():
+        values = _resolve_owners(db, chunk, report, owners)
+        report.rows_valid += len(values)
+        # keep going after the first error so the report is complete, but stop writing
+        if values and not dry_run and report.error_count == 0:
+            for v in values:
+                v["import_batch"] = batch
+            db.execute(insert(Investment), values)
+            report.rows_inserted += len(values)
+            inserted_for.update(v["uploaded_by_id"] for v in values)
+        chunk.clear()
+
+    for raw in reader:
+        report.rows_read += 1
+        line = reader.line_num
+        try:
+            chunk.append((line, InvestmentImportRow.model_validate(_clean(raw))))
+        except ValidationError as e:
+            for err in e.errors():
+                field = ".".join(str(p) for p in err["loc"]) or None
+                report.add_error(line, err["msg"], field)
+        if len(chunk) >= IMPORT_CHUNK_SIZE:
+            flush()
+    flush()
+
+    if report.rows_inserted and report.error_count == 0:
+        # this import's ids exactly, whatever else was inserted meanwhile
+        inserted_ids = list(
+            db.execute(select(Investment.id).where(Investment.import_batch == batch).order_by(Investment.id)).scalars()
+        )
+        batch_memo = f"Opening balance (import {batch[:12]})"
+        report.ledger_entries = open_positions_bulk(db, inserted_ids, batch_memo, created_by_id)
+        bump_data_versions(db, inserted_for)
@@ -0,0 +1,272 @@
+# backend/app/services/ledger.py
+
+"""
+Cash-flow ledger: append a dated capital call / distribution and keep the
+per-investment and per-investor running balances in step, in the caller's
+transaction (nothing here commits).
+
+Current totals are a primary-key read of investment_balances /
+investor_balances; as-of-date totals are one index range on
+cash_flows (investment_id | user_id, flow_date).
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+from typing import List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import Numeric, case, cast, exists, func, insert, literal, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.cash_flow_model import CashFlow, InvestmentBalance, InvestorBalance
+from app.models.investment_model import Investment
+from app.services.data_versions import bump_data_versions
+
+FLOW_TYPES = ("CAPITAL_CALL", "DISTRIBUTION")
+CENT = Decimal("0.01")
+_IN_CHUNK = 1000   # SQL Server caps a statement at 2100 parameters
+
+
+def to_money(value) -> Decimal:
+    # str() first so floats like 0.1 don't drag binary noise into the ledger
+    return Decimal(str(value)).quantize(CENT)
+
+
+def _ensure_row(db: Session, model, key, **values) -> None:
+    """Create the balance row if missing; a concurrent creator just wins the race."""
+    if db.get(model, key) is not None:
+        return
+    try:
+        with db.begin_nested():
+            db.add(model(**values))
+    except IntegrityError:
+        pass
+
+
+def _apply(db: Session, model, key_column, key, called: Decimal, distributed: Decimal, flow_date: date,
+           entries: int = 1) -> None:
+    # relative UPDATE so concurrent writers add up instead of overwriting each other
+    db.query(model).filter(key_column == key).update(
+        {
+            model.called_total: model.called_total + called,
+            model.distributed_total: model.distributed_total + distributed,
+            model.entry_count: model.entry_count + entries,
+            model.last_flow_date: case(
+                (model.last_flow_date.is_(None), flow_date),
+                (model.last_flow_date < flow_date, flow_date),
+                else_=model.last_flow_date,
+            ),
+            model.updated_at: datetime.utcnow(),
+        },
+        synchronize_session=False,
+    )
+
+
+def record_cash_flow(
+    db: Session,
+    investment: Investment,
+    flow_type: str,
+    amount,
+    flow_date: date,
+    memo: Optional[str] = None,
+    created_by_id: Optional[int] = None,
+) -> CashFlow:
+    """
+    Append one ledger row and roll it into both balances (and the investor's data version).
+    Negative amounts reverse (part of) an earlier entry of the same type.
+    """
+    if flow_type not in FLOW_TYPES:
+        raise HTTPException(status_code=400, detail=f"flow_type must be one of {', '.join(FLOW_TYPES)}")
+    amount = to_money(amount)
+    if amount == 0:
+        raise HTTPException(status_code=400, detail="amount must be non-zero")
+
+    user_id = investment.uploaded_by_id
+    flow = CashFlow(
+        investment_id=investment.id,
+        user_id=user_id,
+        flow_type=flow_type,
+        amount=amount,
+        flow_date=flow_date,
+        memo=memo,
+        created_by_id=created_by_id,
+    )
+    db.add(flow)
+
+    called = amount if flow_type == "CAPITAL_CALL" else Decimal("0")
+    distributed = amount if flow_type == "DISTRIBUTION" else Decimal("0")
+
+    _ensure_row(db, InvestmentBalance, investment.id, investment_id=investment.id, user_id=user_id)
+    _ensure_row(db, InvestorBalance, user_id, user_id=user_id)
+    _apply(db, InvestmentBalance, InvestmentBalance.investment_id, investment.id, called, distributed, flow_date)
+    _apply(db, InvestorBalance, InvestorBalance.user_id, user_id, called, distributed, flow_date)
+
+    # keep the legacy scalars (read by /api/investments, analytics, exports and the
+    # analytics data_version fingerprint) equal to the ledger
+    balance = db.get(InvestmentBalance, investment.id, populate_existing=True)
+    if called:
+        investment.investment_total = float(balance.called_total)
+    if distributed:
+        investment.distribution_total = float(balance.distributed_total)
+
+    bump_data_versions(db, [user_id])
+    db.flush()
+    return flow
+
+
+def open_position(db: Session, investment: Investment, created_by_id: Optional[int] = None) -> None:
+    """Opening ledger entries for a newly created investment (its initial totals)."""
+    db.flush()
+    flow_date = investment.close_date or date.today()
+    if investment.investment_total:
+        record_cash_flow(db, investment, "CAPITAL_CALL", investment.investment_total, flow_date,
+                         memo="Opening balance", created_by_id=created_by_id)
+    if investment.distribution_total:
+        record_cash_flow(db, investment, "DISTRIBUTION", investment.distribution_total, flow_date,
+                         memo="Opening balance", created_by_id=created_by_id)
+
+
+def open_positions_bulk(db: Session, investment_ids: List[int], batch_memo: str,
+                        created_by_id: Optional[int] = None) -> int:
+    """
+    Set-based open_position for a batch of bulk-inserted investments (their
+    ids exactly, so rows other writers inserted meanwhile are left alone):
+    INSERT ... SELECT the opening ledger rows, then build their investment
+    balances and add them to the investor balances. batch_memo tags this
+    batch's ledger rows. Returns the number of ledger rows written.
+    """
+    if not investment_ids:
+        return 0
+    today = date.today()
+    now = datetime.utcnow()
+    first_id, last_id = min(investment_ids), max(investment_ids)
+    columns = ["investment_id", "user_id", "flow_type", "amount", "flow_date", "memo", "created_at", "created_by_id"]
+
+    written = 0
+    for i in range(0, len(investment_ids), _IN_CHUNK):
+        in_batch = Investment.id.in_(investment_ids[i:i + _IN_CHUNK])
+        for flow_type, source in (("CAPITAL_CALL", Investment.investment_total), ("DISTRIBUTION", Investment.distribution_total)):
+            already = exists().where(CashFlow.investment_id == Investment.id, CashFlow.flow_type == flow_type)
+            rows = select(
+                Investment.id,
+                Investment.uploaded_by_id,
+                literal(flow_type),
+                cast(func.round(source, 2), Numeric(18, 2)),
+                func.coalesce(Investment.close_date, today),
+                literal(batch_memo),
+                literal(now),
+                literal(created_by_id),
+            ).where(in_batch, source != 0, ~already)
+            written += db.execute(insert(CashFlow).from_select(columns, rows)).rowcount or 0
+
+    batch_flows = select(
+        CashFlow.investment_id,
+        CashFlow.user_id,
+        func.sum(case((CashFlow.flow_type == "CAPITAL_CALL", CashFlow.amount), else_=0)).label("called"),
+        func.sum(case((CashFlow.flow_type == "DISTRIBUTION", CashFlow.amount), else_=0)).label("distributed"),
+        func.count().label("entries"),
+        func.max(CashFlow.flow_date).label("last_flow_date"),
+    ).where(
+        # the memo is unique to this batch; the id range only narrows the index seek
+        CashFlow.investment_id >= first_id, CashFlow.investment_id <= last_id, CashFlow.memo == batch_memo
+    ).group_by(CashFlow.investment_id, CashFlow.user_id).subquery()
+
+    db.execute(
+        insert(InvestmentBalance).from_select(
+            ["investment_id", "user_id", "called_total", "distributed_total", "entry_count", "last_flow_date", "updated_at"],
+            select(
+                batch_flows.c.investment_id, batch_flows.c.user_id, batch_flows.c.called,
+                batch_flows.c.distributed, batch_flows.c.entries, batch_flows.c.last_flow_date, literal(now),
+            ),
+        )
+    )
+
+    # one relative UPDATE per investor in the batch
+    per_investor = db.execute(
+        select(
+            batch_flows.c.user_id,
+            func.sum(batch_flows.c.called),
+            func.sum(batch_flows.c.distributed),
+            func.sum(batch_flows.c.entries),
+            func.max(batch_flows.c.last_flow_date),
+        ).group_by(batch_flows.c.user_id)
+    ).all()
+    for user_id, called, distributed, entries, last_flow_date in per_investor:
+        _ensure_row(db, InvestorBalance, user_id, user_id=user_id)
+        _apply(db, InvestorBalance, InvestorBalance.user_id, user_id,
+               to_money(called or 0), to_money(distributed or 0), last_flow_date, entries=entries)
+
+    return written
+
+
+# =========================================================
+# READS
+# =========================================================
+def _totals(row) -> dict:
+    called, distributed, count, last = row
+    called = called or Decimal("0")
+    distributed = distributed or Decimal("0")
+    return {
+        "called_total": to_money(called),
+        "distributed_total": to_money(distributed),
+        "net_cash_flow": to_money(distributed - called),
+        "entry_count": count or 0,
+        "last_flow_date": last,
+    }
+
+
+def _balance_dict(balance) -> dict:
+    if balance is None:
+        return _totals((None, None, 0, None))
+    return _totals((balance.called_total, balance.distributed_total, balance.entry_count, balance.last_flow_date))
+
+
+def balances_as_of(db: Session, as_of: Optional[date] = None, *, user_id: Optional[int] = None,
+                   investment_id: Optional[int] = None) -> dict:
+    """
+    Totals for one investor or one investment. Without as_of this is the
+    precomputed balance row; with as_of it's an indexed range over the ledger.
+    """
+    if as_of is None:
+        if investment_id is not None:
+            return _balance_dict(db.get(InvestmentBalance, investment_id))
+        return _balance_dict(db.get(InvestorBalance, user_id))
+
+    key_filter = CashFlow.investment_id == investment_id if investment_id is not None else CashFlow.user_id == user_id
+    row = db.execute(
+        select(
+            func.sum(case((CashFlow.flow_type == "CAPITAL_CALL", CashFlow.amount), else_=0)),
+            func.sum(case((CashFlow.flow_type == "DISTRIBUTION", CashFlow.amount), else_=0)),
+            func.count(),
+            func.max(CashFlow.flow_date),
+        ).where(key_filter, CashFlow.flow_date <= as_of)
+    ).one()
+    return _totals(row)
+
+
+def investor_totals(db: Session, user_id: Optional[int] = None) -> tuple:
+    """
+    (invested, distributed) for one investor, or all of them. Decided per
+    investor: a balance row means the ledger has them, otherwise (pre-ledger
+    data not backfilled yet) their positions are summed, so a partly
+    backfilled database never drops anyone from the totals.
+    """
+    if user_id is not None:
+        balance = db.get(InvestorBalance, user_id)
+        if balance is not None:
+            return float(balance.called_total), float(balance.distributed_total)
+        invested, distributed = db.execute(
+            select(func.sum(Investment.investment_total), func.sum(Investment.distribution_total))
+            .where(Investment.uploaded_by_id == user_id)
+        ).one()
+        return float(invested or 0), float(distributed or 0)
+
+    called, paid_out = db.execute(
+        select(func.sum(InvestorBalance.called_total), func.sum(InvestorBalance.distributed_total))
+    ).one()
+    invested, distributed = db.execute(
+        select(func.sum(Investment.investment_total), func.sum(Investment.distribution_total))
+        .where(~exists().where(InvestorBalance.user_id == Investment.uploaded_by_id))
+    ).one()
+    return float(called or 0) + float(invested or 0), float(paid_out or 0) + float(distributed or 0)
@@ -0,0 +1,294 @@
+# backend/app/services/metrics.py
+
+"""
+In-process performance metrics rendered in Prometheus text format.
+
+- per-route request latency histograms (recorded by the middleware in main.py)
+- SQL statement count + time per request (SQLAlchemy engine events)
+- blob / SMTP call durations (track_call context manager)
+- slow-query log with the SQL text
+
+Metrics are per process: when running several uvicorn workers, each worker
+exposes its own counters and the scraper aggregates them.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+
+SLOW_QUERY_SECONDS = float(os.getenv("SLOW_QUERY_MS", "200")) / 1000.0
+SLOW_QUERY_MAX_SQL_CHARS = 2000
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250)
+
+
+# =========================================================
+# METRIC TYPES
+# =========================================================
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: Tuple[str, ...] = (), amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Gauge:
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+    def render(self):
+        with self._lock:
+            value = self._value
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} gauge",
+            f"{self.name} {_format_value(value)}",
+        ]
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets) + (float("inf"),)
+        # labels -> [bucket counts..., sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Tuple[str, ...], value: float) -> None:
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = [0] * len(self.buckets) + [0.0, 0]
+                self._series[labels] = series
+            for i, upper in enumerate(self.buckets):
+                if value <= upper:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((labels, list(series)) for labels, series in self._series.items())
+        for labels, series in items:
+            cumulative = 0
+            for i, upper in enumerate(self.buckets):
+                cumulative += series[i]
+                le = 'le="' + _format_value(float(upper)) + '"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}"
+                )
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {series[-1]}")
+        return lines
+
+
+# =========================================================
+# REGISTRY
+# =========================================================
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time from request received to response headers ready, per route.",
+    ("method", "route", "status"),
+)
+DB_STATEMENTS_PER_REQUEST = Histogram(
+    "db_statements_per_request",
+    "Number of SQL statements executed while serving one request.",
+    ("method", "route"),
+    buckets=STATEMENT_COUNT_BUCKETS,
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "db_time_per_request_seconds",
+    "Total SQL execution time spent while serving one request.",
+    ("method", "route"),
+)
+DB_STATEMENT_LATENCY = Histogram(
+    "db_statement_duration_seconds",
+    "Duration of individual SQL statements.",
+)
+DB_SLOW_QUERIES = Counter(
+    "db_slow_queries_total",
+    "SQL statements slower than SLOW_QUERY_MS.",
+)
+EXTERNAL_CALL_LATENCY = Histogram(
+    "external_call_duration_seconds",
+    "Duration of calls to external services (blob storage, SMTP).",
+    ("service", "operation", "outcome"),
+)
+RATE_LIMITED = Counter(
+    "rate_limited_requests_total",
+    "Requests rejected by the rate limiter, per rule.",
+    ("rule",),
+)
+
+OUTBOX_EVENTS = Counter(
+    "outbox_events_total",
+    "Outbox events handled by the dispatcher, per type and outcome (done / retry / failed).",
+    ("event_type", "outcome"),
+)
+ADMIN_EVENT_STREAMS = Gauge(
+    "admin_event_streams",
+    "Open admin activity (SSE) connections in this worker.",
+)
+
+REGISTRY = [
+    REQUEST_LATENCY,
+    DB_STATEMENTS_PER_REQUEST,
+    DB_TIME_PER_REQUEST,
+    DB_STATEMENT_LATENCY,
+    DB_SLOW_QUERIES,
+    EXTERNAL_CALL_LATENCY,
+    RATE_LIMITED,
+    OUTBOX_EVENTS,
+    ADMIN_EVENT_STREAMS,
+]
+
+
+def render_metrics() -> str:
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# =========================================================
+# PER-REQUEST STATS
+# =========================================================
+class RequestStats:
+    __slots__ = ("method", "path", "db_statements", "db_seconds")
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.db_statements = 0
+        self.db_seconds = 0.0
+
+
+# The stats object is created by the middleware and shared (by reference) with
+# the threadpool workers that run sync endpoints, so engine events can add to it.
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def begin_request(method: str, path: str) -> RequestStats:
+    stats = RequestStats(method, path)
+    _request_stats.set(stats)
+    return stats
+
+
+def finish_request(stats: RequestStats, route: str, status_code: int, elapsed: float) -> None:
+    REQUEST_LATENCY.observe((stats.method, route, str(status_code)), elapsed)
+    DB_STATEMENTS_PER_REQUEST.observe((stats.method, route), stats.db_statements)
+    DB_TIME_PER_REQUEST.observe((stats.method, route), stats.db_seconds)
+
+
+# =========================================================
+# SQLALCHEMY ENGINE EVENTS
+# =========================================================
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+
+    DB_STATEMENT_LATENCY.observe((), elapsed)
+
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.db_statements += 1
+        stats.db_seconds += elapsed
+
+    if elapsed >= SLOW_QUERY_SECONDS:
+        DB_SLOW_QUERIES.inc()
+        where = f"{stats.method} {stats.path}" if stats is not None else "background"
+        sql = " ".join(statement.split())[:SLOW_QUERY_MAX_SQL_CHARS]
+        print(f"[SLOW SQL] {elapsed * 1000:.1f} ms ({where}): {sql}")
+
+
+def instrument_engine(engine) -> None:
+    """Attach statement timing listeners to a SQLAlchemy engine (idempotent)."""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# =========================================================
+# EXTERNAL CALLS (BLOB / SMTP)
+# =========================================================
+@contextmanager
+def track_call(service: str, operation: str):
+    """
+    Time a call to an external service:
+
+        with track_call("blob", "upload"):
+            blob_client.upload_blob(...)
+    """
+    start = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except Exception:
+        outcome = "error"
+        raise
+    finally:
+        EXTERNAL_CALL_LATENCY.observe((service, operation, outcome), time.perf_counter() - start)
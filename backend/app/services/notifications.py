@@ -0,0 +1,40 @@
+# backend/app/services/notifications.py
+
+"""
+Coalesces "new document" notifications into one digest email per recipient.
+
+Uploads and shares record one document.notify outbox event per recipient,
+in the same transaction as the document, held back for
+NOTIFY_DIGEST_WINDOW_SECONDS. When the dispatcher claims a recipient's
+first due event it leases all of that recipient's pending ones with it
+(subscribe_coalesced in services/outbox.py), so they go out as one email.
+The events are marked DONE only after SMTP accepted the digest; a failure
+retries the whole digest with the outbox's backoff, and a crash leaves them
+PENDING until the lease expires. Nothing waits in process memory, and one
+recipient gets one digest per window no matter how many workers served
+the uploads.
+"""
+
+import os
+from typing import Iterable
+
+from sqlalchemy.orm import Session
+
+from app.models.user_model import User
+from app.services.outbox import record_event
+
+NOTIFY_DIGEST_WINDOW_SECONDS = float(os.getenv("NOTIFY_DIGEST_WINDOW_SECONDS", "60"))
+NOTIFY_EVENT = "document.notify"
+
+
+def queue_document_notifications(db: Session, recipients: Iterable[User], doc_name: str) -> None:
+    """Add a digest entry per recipient to the caller's transaction (the caller commits)."""
+    for user in recipients:
+        record_event(
+            db,
+            NOTIFY_EVENT,
+            {"email": user.email, "name": doc_name},
+            aggregate_type="user",
+            aggregate_id=user.id,
+            delay_seconds=NOTIFY_DIGEST_WINDOW_SECONDS,
+        )
@@ -0,0 +1,356 @@
+# backend/app/services/outbox.py
+
+"""
+Transactional outbox + in-process dispatcher for side effects.
+
+Writers call record_event(db, ...) before their own db.commit(), so the event
+exists if and only if the business change does. Nothing is sent on the
+request path.
+
+The dispatcher runs an asyncio loop on its own thread (independent of the
+web server's loop and of sync endpoints):
+  - claims up to the number of free handler slots of due PENDING events with
+    a conditional UPDATE lease (safe with several workers / nodes)
+  - runs every handler subscribed to the event type, at most
+    OUTBOX_CONCURRENCY events at once
+  - marks the event DONE, or retries with exponential backoff, or marks it
+    FAILED after OUTBOX_MAX_ATTEMPTS
+Delivery is at-least-once: an event whose lease expires (crash, hang) is
+claimed again, so handlers must tolerate repeats.
+
+A commit that wrote events wakes the local dispatcher immediately; other
+workers pick events up within OUTBOX_POLL_SECONDS.
+
+Coalesced event types (subscribe_coalesced) are handled per aggregate:
+claiming one due event also leases every other pending event of that type
+for the same aggregate, due or not, and one handler call gets them all.
+Together with record_event(delay_seconds=...) this makes a durable digest:
+the events wait in the table, not in memory, and all of them are marked
+DONE (or retried) together.
+"""
+
+import asyncio
+import json
+import os
+import socket
+import threading
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import and_, delete, event, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.models.outbox_event_model import OutboxEvent
+from app.services.database import SessionLocal
+from app.services.metrics import OUTBOX_EVENTS
+
+OUTBOX_ENABLED = os.getenv("OUTBOX_DISPATCHER_ENABLED", "1") == "1"
+OUTBOX_CONCURRENCY = int(os.getenv("OUTBOX_CONCURRENCY", "16"))
+OUTBOX_POLL_SECONDS = float(os.getenv("OUTBOX_POLL_SECONDS", "2"))
+OUTBOX_LEASE_SECONDS = int(os.getenv("OUTBOX_LEASE_SECONDS", "120"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))
+OUTBOX_RETENTION_HOURS = int(os.getenv("OUTBOX_RETENTION_HOURS", "72"))
+OUTBOX_PURGE_SECONDS = 3600
+
+Handler = Callable[[dict, int], Awaitable[None]]   # (payload, event id)
+CoalescedHandler = Callable[[List[dict], List[int]], Awaitable[None]]   # (payloads, event ids), oldest first
+
+_handlers: Dict[str, List[Handler]] = defaultdict(list)
+_coalesced: Dict[str, CoalescedHandler] = {}
+_commit_listeners: List[Callable[[], None]] = []
+
+
+# =========================================================
+# WRITING EVENTS
+# =========================================================
+def record_event(
+    db: Session,
+    event_type: str,
+    payload: dict,
+    aggregate_type: Optional[str] = None,
+    aggregate_id: Optional[int] = None,
+    sensitive: bool = False,
+    delay_seconds: float = 0,
+) -> OutboxEvent:
+    """
+    Add an event to the caller's transaction (the caller commits).
+    sensitive=True clears the payload once the event is delivered or fails.
+    delay_seconds holds the event back (e.g. a digest window).
+    """
+    row = OutboxEvent(
+        event_type=event_type,
+        aggregate_type=aggregate_type,
+        aggregate_id=aggregate_id,
+        payload=json.dumps(payload, default=str),
+        sensitive=sensitive,
+        status="PENDING",
+        attempts=0,
+        available_at=datetime.utcnow() + timedelta(seconds=delay_seconds),
+        created_at=datetime.utcnow(),
+    )
+    db.add(row)
+    db.info["outbox_events"] = True
+    return row
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _wake_dispatcher(session):
+    if session.info.pop("outbox_events", False):
+        outbox_dispatcher.wake()
+        for listener in _commit_listeners:
+            listener()
+
+
+def on_events_committed(listener: Callable[[], None]) -> None:
+    """Call listener() (from the committing thread) whenever a commit wrote events."""
+    _commit_listeners.append(listener)
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _forget_events(session):
+    session.info.pop("outbox_events", None)
+
+
+# =========================================================
+# HANDLERS
+# =========================================================
+def subscribe(event_type: str):
+    """Decorator: register an async handler(payload, event_id) for an event type."""
+    def register(handler: Handler) -> Handler:
+        _handlers[event_type].append(handler)
+        return handler
+    return register
+
+
+def subscribe_coalesced(event_type: str):
+    """
+    Decorator: register the single async handler(payloads, event_ids) of a
+    coalesced event type. Events are grouped by (aggregate_type, aggregate_id).
+    """
+    def register(handler: CoalescedHandler) -> CoalescedHandler:
+        _coalesced[event_type] = handler
+        return handler
+    return register
+
+
+# =========================================================
+# DISPATCHER
+# =========================================================
+def _backoff(attempts: int) -> timedelta:
+    return timedelta(seconds=min(2 ** attempts, 600))
+
+
+class OutboxDispatcher:
+    def __init__(self, concurrency: int = OUTBOX_CONCURRENCY):
+        self.concurrency = concurrency
+        self.worker_id = f"{socket.gethostname()[:30]}:{os.getpid()}"
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake_event: Optional[asyncio.Event] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._in_flight = 0
+        self._last_purge = datetime.min
+
+    def start(self) -> None:
+        if not OUTBOX_ENABLED:
+            return
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            ready = threading.Event()
+            self._thread = threading.Thread(target=self._run, args=(ready,), name="outbox-dispatcher", daemon=True)
+            self._thread.start()
+            ready.wait(5)
+        print(f"[OUTBOX] dispatcher started ({self.worker_id}, concurrency {self.concurrency})")
+
+    def wake(self) -> None:
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._wake_event.set)
+
+    # -----------------------------------------------------
+    # Loop
+    # -----------------------------------------------------
+    def _run(self, ready: threading.Event) -> None:
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._wake_event = asyncio.Event()
+        ready.set()
+        self._loop.run_until_complete(self._main())
+
+    async def _main(self) -> None:
+        tasks = set()
+        while True:
+            free = self.concurrency - self._in_flight
+            claimed = []
+            if free > 0:
+                try:
+                    claimed = await asyncio.to_thread(self._claim, free)
+                except Exception as e:
+                    print(f"[OUTBOX] claim failed: {e}")
+
+            for row_ids, event_type, payloads in claimed:
+                self._in_flight += 1
+                task = asyncio.create_task(self._process(row_ids, event_type, payloads))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+            if claimed and len(claimed) == free:
+                # saturated: continue as soon as a slot frees up
+                await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                continue
+            if claimed:
+                continue
+
+            try:
+                await asyncio.wait_for(self._wake_event.wait(), timeout=OUTBOX_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                await asyncio.to_thread(self._maybe_purge)
+            self._wake_event.clear()
+
+    async def _process(self, row_ids: List[int], event_type: str, payloads: List[Optional[str]]) -> None:
+        try:
+            data = [json.loads(payload) if payload else {} for payload in payloads]
+            if event_type in _coalesced:
+                await _coalesced[event_type](data, row_ids)
+            else:
+                for handler in _handlers.get(event_type, []):
+                    await handler(data[0], row_ids[0])
+        except Exception as e:
+            await asyncio.to_thread(self._fail, row_ids, event_type, e)
+        else:
+            await asyncio.to_thread(self._complete, row_ids, event_type)
+        finally:
+            self._in_flight -= 1
+            self._wake_event.set()
+
+    # -----------------------------------------------------
+    # DB side (run in a thread; each call is one short transaction)
+    # -----------------------------------------------------
+    def _claim(self, limit: int):
+        """Lease up to `limit` due events: [(row ids, event type, payloads)], one entry per handler call."""
+        now = datetime.utcnow()
+        token = f"{self.worker_id}:{uuid.uuid4().hex[:8]}"
+        with SessionLocal() as db:
+            ids = db.execute(
+                select(OutboxEvent.id)
+                .where(
+                    OutboxEvent.status == "PENDING",
+                    OutboxEvent.available_at <= now,
+                    or_(OutboxEvent.locked_until.is_(None), OutboxEvent.locked_until < now),
+                )
+                .order_by(OutboxEvent.id)
+                .limit(limit)
+            ).scalars().all()
+            if not ids:
+                return []
+
+            # conditional: rows another worker leased in the meantime are left alone
+            db.execute(
+                update(OutboxEvent)
+                .where(
+                    OutboxEvent.id.in_(ids),
+                    OutboxEvent.status == "PENDING",
+                    or_(OutboxEvent.locked_until.is_(None), OutboxEvent.locked_until < now),
+                )
+                .values(locked_by=token, locked_until=now + timedelta(seconds=OUTBOX_LEASE_SECONDS))
+            )
+            if _coalesced:
+                # the rest of each claimed aggregate's pending events ride along, due or not
+                groups = db.execute(
+                    select(OutboxEvent.event_type, OutboxEvent.aggregate_type, OutboxEvent.aggregate_id)
+                    .where(OutboxEvent.locked_by == token, OutboxEvent.event_type.in_(list(_coalesced)))
+                    .distinct()
+                ).all()
+                for event_type, aggregate_type, aggregate_id in groups:
+                    db.execute(
+                        update(OutboxEvent)
+                        .where(
+                            OutboxEvent.event_type == event_type,
+                            OutboxEvent.aggregate_type == aggregate_type,
+                            OutboxEvent.aggregate_id == aggregate_id,
+                            OutboxEvent.status == "PENDING",
+                            or_(OutboxEvent.locked_until.is_(None), OutboxEvent.locked_until < now),
+                        )
+                        .values(locked_by=token, locked_until=now + timedelta(seconds=OUTBOX_LEASE_SECONDS))
+                    )
+            db.commit()
+            rows = db.execute(
+                select(
+                    OutboxEvent.id, OutboxEvent.event_type, OutboxEvent.payload,
+                    OutboxEvent.aggregate_type, OutboxEvent.aggregate_id,
+                )
+                # status: seek the few PENDING rows instead of scanning the retained DONE ones
+                .where(OutboxEvent.status == "PENDING", OutboxEvent.locked_by == token)
+                .order_by(OutboxEvent.id)
+            ).all()
+
+        claimed, by_aggregate = [], {}
+        for row_id, event_type, payload, aggregate_type, aggregate_id in rows:
+            if event_type not in _coalesced:
+                claimed.append(([row_id], event_type, [payload]))
+                continue
+            key = (event_type, aggregate_type, aggregate_id)
+            if key not in by_aggregate:
+                by_aggregate[key] = ([], event_type, [])
+                claimed.append(by_aggregate[key])
+            by_aggregate[key][0].append(row_id)
+            by_aggregate[key][2].append(payload)
+        return claimed
+
+    def _complete(self, row_ids: List[int], event_type: str) -> None:
+        with SessionLocal() as db:
+            db.execute(
+                update(OutboxEvent)
+                .where(OutboxEvent.id.in_(row_ids))
+                .values(status="DONE", processed_at=datetime.utcnow(), locked_by=None, locked_until=None)
+            )
+            db.execute(
+                update(OutboxEvent)
+                .where(OutboxEvent.id.in_(row_ids), OutboxEvent.sensitive.is_(True))
+                .values(payload=None)
+            )
+            db.commit()
+        OUTBOX_EVENTS.inc((event_type, "done"), len(row_ids))
+
+    def _fail(self, row_ids: List[int], event_type: str, error: Exception) -> None:
+        for row_id in row_ids:
+            self._fail_one(row_id, event_type, error)
+
+    def _fail_one(self, row_id: int, event_type: str, error: Exception) -> None:
+        with SessionLocal() as db:
+            row = db.get(OutboxEvent, row_id)
+            if row is None:
+                return
+            row.attempts += 1
+            row.last_error = f"{type(error).__name__}: {error}"[:500]
+            row.locked_by = None
+            row.locked_until = None
+            if row.attempts >= OUTBOX_MAX_ATTEMPTS:
+                row.status = "FAILED"
+                row.processed_at = datetime.utcnow()
+                if row.sensitive:
+                    row.payload = None
+                outcome = "failed"
+                print(f"[OUTBOX] {event_type} #{row_id} failed permanently: {row.last_error}")
+            else:
+                row.available_at = datetime.utcnow() + _backoff(row.attempts)
+                outcome = "retry"
+                print(f"[OUTBOX] {event_type} #{row_id} attempt {row.attempts} failed, retrying: {row.last_error}")
+            db.commit()
+        OUTBOX_EVENTS.inc((event_type, outcome))
+
+    def _maybe_purge(self) -> None:
+        now = datetime.utcnow()
+        if (now - self._last_purge).total_seconds() < OUTBOX_PURGE_SECONDS:
+            return
+        self._last_purge = now
+        cutoff = now - timedelta(hours=OUTBOX_RETENTION_HOURS)
+        with SessionLocal() as db:
+            db.execute(delete(OutboxEvent).where(and_(OutboxEvent.status == "DONE", OutboxEvent.processed_at < cutoff)))
+            db.commit()
+
+
+outbox_dispatcher = OutboxDispatcher()
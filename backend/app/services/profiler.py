@@ -0,0 +1,243 @@
+# backend/app/services/profiler.py
+
+"""
+On-demand sampling profiler for single requests.
+
+An admin adds `X-Profile: 1` (or `?__profile=1`) to any request. That request is
+run while a background thread samples the stacks of the threads executing its
+endpoint / dependencies, and the result is written as a collapsed-stack file
+(flamegraph.pl, inferno, speedscope all read it) under PROFILE_DIR.
+
+When the switch is absent the middleware is a plain pass-through: one header
+lookup, no thread, no DB work.
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(os.getcwd(), "profiles"))
+PROFILE_SAMPLE_INTERVAL = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5")) / 1000.0
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "50"))
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_QUERY_FLAG = b"__profile=1"
+PROFILE_ID_RE = re.compile(r"^[0-9]{8}T[0-9]{6}_[0-9a-f]{6}$")
+
+
+# =========================================================
+# SAMPLER
+# =========================================================
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _dependant_codes(dependant) -> set:
+    """Code objects of the endpoint and every dependency it resolves."""
+    codes = set()
+    stack = [dependant]
+    while stack:
+        d = stack.pop()
+        call = getattr(d, "call", None)
+        code = getattr(call, "__code__", None) or getattr(getattr(call, "__call__", None), "__code__", None)
+        if code is not None:
+            codes.add(code)
+        stack.extend(getattr(d, "dependencies", []) or [])
+    return codes
+
+
+class RequestSampler(threading.Thread):
+    """Samples every thread whose stack passes through the request's route code."""
+
+    def __init__(self, scope: dict, interval: float = PROFILE_SAMPLE_INTERVAL):
+        super().__init__(name="request-profiler", daemon=True)
+        self.scope = scope
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self._stop_event = threading.Event()
+        self._codes: Optional[set] = None
+
+    def _route_codes(self) -> Optional[set]:
+        # starlette writes the matched route into the (shared) scope once routing ran
+        if self._codes is None:
+            route = self.scope.get("route")
+            if route is None or not hasattr(route, "dependant"):
+                return None
+            self._codes = _dependant_codes(route.dependant)
+        return self._codes
+
+    def run(self):
+        own_id = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            codes = self._route_codes()
+            if not codes:
+                continue
+            self.sample_count += 1
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack: List[str] = []
+                matched = False
+                while frame is not None:
+                    stack.append(_frame_label(frame.f_code))
+                    if frame.f_code in codes:
+                        matched = True
+                        # keep walking: the outermost route frame becomes the root
+                        root_len = len(stack)
+                    frame = frame.f_back
+                if matched:
+                    self.samples[";".join(reversed(stack[:root_len]))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+# =========================================================
+# STORAGE
+# =========================================================
+def _new_profile_id() -> str:
+    return f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}_{os.urandom(3).hex()}"
+
+
+def _save_profile(profile_id: str, sampler: RequestSampler, meta: Dict) -> None:
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    root = f"{meta['method']} {meta['route']}"
+    with open(os.path.join(PROFILE_DIR, f"{profile_id}.collapsed"), "w", encoding="utf-8") as f:
+        for stack, count in sampler.samples.most_common():
+            f.write(f"{root};{stack} {count}\n")
+    with open(os.path.join(PROFILE_DIR, f"{profile_id}.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    _prune_profiles()
+
+
+def _prune_profiles() -> None:
+    ids = sorted(
+        name[: -len(".json")] for name in os.listdir(PROFILE_DIR) if name.endswith(".json")
+    )
+    for old_id in ids[: max(len(ids) - PROFILE_MAX_FILES, 0)]:
+        for ext in (".json", ".collapsed"):
+            try:
+                os.remove(os.path.join(PROFILE_DIR, old_id + ext))
+            except FileNotFoundError:
+                pass
+
+
+def list_profiles(limit: int = 50) -> List[Dict]:
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    names = sorted(
+        (name for name in os.listdir(PROFILE_DIR) if name.endswith(".json")),
+        reverse=True,
+    )[:limit]
+    results = []
+    for name in names:
+        try:
+            with open(os.path.join(PROFILE_DIR, name), encoding="utf-8") as f:
+                results.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return results
+
+
+def get_profile_path(profile_id: str) -> Optional[str]:
+    if not PROFILE_ID_RE.match(profile_id):
+        return None
+    path = os.path.join(PROFILE_DIR, f"{profile_id}.collapsed")
+    return path if os.path.isfile(path) else None
+
+
+# =========================================================
+# ASGI MIDDLEWARE
+# =========================================================
+def _profile_requested(scope: dict) -> bool:
+    if PROFILE_QUERY_FLAG in scope.get("query_string", b""):
+        return True
+    for name, value in scope.get("headers", ()):
+        if name == PROFILE_HEADER:
+            return value not in (b"", b"0", b"false")
+    return False
+
+
+def _bearer_token(scope: dict) -> Optional[str]:
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            return token if scheme.lower() == "bearer" and token else None
+    return None
+
+
+def _resolve_admin_email(token: str) -> Optional[str]:
+    """Same checks as get_current_admin; returns None instead of raising."""
+    from fastapi import HTTPException
+
+    from app.routers.auth import authenticate_token, get_current_admin
+    from app.services.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return get_current_admin(current_user=authenticate_token(token, db)).email
+    except HTTPException:
+        return None
+    finally:
+        db.close()
+
+
+class ProfilingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _profile_requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        token = _bearer_token(scope)
+        admin_email = await run_in_threadpool(_resolve_admin_email, token) if token else None
+        if admin_email is None:
+            # silently ignore the switch for non-admins
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = _new_profile_id()
+        status_holder = {"status": 500}
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                status_holder["status"] = message["status"]
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (b"x-profile-id", profile_id.encode("ascii"))
+                ]
+            await send(message)
+
+        sampler = RequestSampler(scope)
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            sampler.stop()
+            route = scope.get("route")
+            meta = {
+                "id": profile_id,
+                "method": scope.get("method"),
+                "path": scope.get("path"),
+                "route": getattr(route, "path", None) or scope.get("path"),
+                "status": status_holder["status"],
+                "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+                "samples": sampler.sample_count,
+                "sample_interval_ms": sampler.interval * 1000,
+                "requested_by": admin_email,
+                "created_at": datetime.utcnow().isoformat(),
+            }
+            await run_in_threadpool(_save_profile, profile_id, sampler, meta)
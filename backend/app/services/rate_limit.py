@@ -0,0 +1,202 @@
+# backend/app/services/rate_limit.py
+
+"""
+Sliding-window rate limiter for the login / OTP endpoints.
+
+Each rule allows `limit` hits per `window` seconds per key (client IP or
+email). The estimate is the classic sliding-window counter:
+
+    hits = current_window_count + previous_window_count * (1 - elapsed / window)
+
+Backends (RATE_LIMIT_BACKEND env var):
+  - "sqlite" (default): a small SQLite file (RATE_LIMIT_DB) in WAL mode, so
+    every uvicorn worker on the node shares the same counters
+  - "memory": per-process dict (single worker / tests)
+
+Checks are cheap (one tiny local transaction) and run before any password
+hashing, user lookup or email sending.
+"""
+
+import math
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from fastapi import HTTPException, Request
+
+from app.services.metrics import RATE_LIMITED
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "1") != "0"
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "sqlite").lower()
+RATE_LIMIT_DB = os.getenv("RATE_LIMIT_DB", os.path.join(tempfile.gettempdir(), "gp_portal_rate_limit.sqlite3"))
+# behind Azure App Service / a reverse proxy the client IP is in X-Forwarded-For
+RATE_LIMIT_TRUST_PROXY = os.getenv("RATE_LIMIT_TRUST_PROXY", "0") == "1"
+
+
+def _rule(env_name: str, default: str) -> Tuple[int, int]:
+    """'<limit>/<window seconds>' from the environment, e.g. LOGIN_INIT_IP_RATE=20/60."""
+    limit, _, window = os.getenv(env_name, default).partition("/")
+    return int(limit), int(window)
+
+
+# rule name -> (limit, window seconds)
+RULES: Dict[str, Tuple[int, int]] = {
+    "login_init:ip": _rule("LOGIN_INIT_IP_RATE", "20/60"),
+    "login_init:email": _rule("LOGIN_INIT_EMAIL_RATE", "5/300"),
+    "login_verify:ip": _rule("LOGIN_VERIFY_IP_RATE", "30/60"),
+    "login_verify:email": _rule("LOGIN_VERIFY_EMAIL_RATE", "10/300"),
+}
+
+
+# =========================================================
+# BACKENDS
+# =========================================================
+def _estimate(current: int, previous: int, elapsed: float, window: int) -> float:
+    return current + previous * (1.0 - elapsed / window)
+
+
+def _retry_after(current: int, previous: int, elapsed: float, window: int, limit: int) -> int:
+    """Seconds until the estimate drops below the limit (assuming no more hits)."""
+    if current >= limit:
+        # previous window must fully age out and the current one must become "previous" enough
+        needed = window - elapsed + window * (1.0 - (limit - 1) / current)
+    elif previous:
+        # previous * (1 - t / window) + current < limit  ->  t > window * (1 - (limit - 1 - current) / previous)
+        needed = window * (1.0 - (limit - 1 - current) / previous) - elapsed
+    else:
+        needed = 1
+    return max(1, math.ceil(needed))
+
+
+class MemoryBackend:
+    def __init__(self):
+        self._counts: Dict[Tuple[str, int], int] = {}
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, window: int, now: float) -> Tuple[int, int]:
+        slot = int(now // window)
+        with self._lock:
+            current = self._counts.get((key, slot), 0) + 1
+            self._counts[(key, slot)] = current
+            previous = self._counts.get((key, slot - 1), 0)
+            if len(self._counts) > 50000:
+                for k in [k for k in self._counts if k[1] < slot - 1]:
+                    del self._counts[k]
+        return current, previous
+
+
+class SqliteBackend:
+    """Counters in a local SQLite file shared by all worker processes."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._last_purge = 0.0
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit_hits ("
+            " key TEXT NOT NULL, slot INTEGER NOT NULL, window INTEGER NOT NULL, count INTEGER NOT NULL,"
+            " PRIMARY KEY (key, slot)) WITHOUT ROWID"
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def hit(self, key: str, window: int, now: float) -> Tuple[int, int]:
+        slot = int(now // window)
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT INTO rate_limit_hits (key, slot, window, count) VALUES (?, ?, ?, 1)"
+                " ON CONFLICT (key, slot) DO UPDATE SET count = count + 1",
+                (key, slot, window),
+            )
+            rows = dict(
+                conn.execute(
+                    "SELECT slot, count FROM rate_limit_hits WHERE key = ? AND slot IN (?, ?)",
+                    (key, slot, slot - 1),
+                ).fetchall()
+            )
+            if now - self._last_purge > 60:
+                self._last_purge = now
+                # rows older than their previous window can't affect any estimate
+                conn.execute("DELETE FROM rate_limit_hits WHERE (slot + 2) * window < ?", (now,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return rows.get(slot, 0), rows.get(slot - 1, 0)
+
+
+def _create_backend():
+    if RATE_LIMIT_BACKEND == "memory":
+        return MemoryBackend()
+    if RATE_LIMIT_BACKEND != "sqlite":
+        print(f"[RATE LIMIT] unknown RATE_LIMIT_BACKEND={RATE_LIMIT_BACKEND!r}, using sqlite")
+    try:
+        return SqliteBackend(RATE_LIMIT_DB)
+    except sqlite3.Error as e:
+        print(f"[RATE LIMIT] cannot open {RATE_LIMIT_DB} ({e}), falling back to per-process memory")
+        return MemoryBackend()
+
+
+_backend = _create_backend()
+
+
+# =========================================================
+# API
+# =========================================================
+def check_rate_limit(rule: str, key: Optional[str]) -> None:
+    """Count one hit for `key` under `rule`; raise 429 with Retry-After when over the limit."""
+    if not RATE_LIMIT_ENABLED or not key:
+        return
+    limit, window = RULES[rule]
+    now = time.time()
+    try:
+        current, previous = _backend.hit(f"{rule}:{key.lower()}", window, now)
+    except sqlite3.Error as e:
+        # fail open: a broken limiter must not lock everybody out
+        print(f"[RATE LIMIT] backend error, allowing request: {e}")
+        return
+
+    elapsed = now - (now // window) * window
+    if _estimate(current, previous, elapsed, window) <= limit:
+        return
+
+    RATE_LIMITED.inc((rule,))
+    retry_after = _retry_after(current, previous, elapsed, window, limit)
+    print(f"[RATE LIMIT] {rule} exceeded for {key} (retry in {retry_after}s)")
+    raise HTTPException(
+        status_code=429,
+        detail="Too many requests, try again later",
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
+def client_ip(request: Request) -> Optional[str]:
+    if RATE_LIMIT_TRUST_PROXY:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            # Azure App Service appends the port: "203.0.113.7:52344"
+            first = forwarded.split(",")[0].strip()
+            return first.rsplit(":", 1)[0] if first.count(":") == 1 else first
+    return request.client.host if request.client else None
+
+
+# FastAPI dependencies: declared before the DB session so rejections cost nothing else
+def limit_login_init_ip(request: Request) -> None:
+    check_rate_limit("login_init:ip", client_ip(request))
+
+
+def limit_login_verify_ip(request: Request) -> None:
+    check_rate_limit("login_verify:ip", client_ip(request))
@@ -0,0 +1,138 @@
+# backend/app/services/refresh_tokens.py
+
+"""
+Rotating refresh tokens.
+
+- opaque random tokens; the DB keeps sha256(token) under a unique index, so a
+  refresh is one indexed lookup (joined to the user) plus signing a new JWT
+- every refresh rotates: the old row is marked used with a conditional
+  UPDATE (only one concurrent refresh can win) and a new token is issued in
+  the same family
+- replaying an already-rotated token revokes the family (stolen token);
+  a replay within REFRESH_REUSE_GRACE_SECONDS (two tabs refreshing at once)
+  is only rejected
+- logout revokes the family; logout-all revokes every token of the user
+"""
+
+import hashlib
+import os
+import secrets
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, or_, update
+from sqlalchemy.orm import Session
+
+from app.models.refresh_token_model import RefreshToken
+from app.models.user_model import User
+
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "14"))
+REFRESH_REUSE_GRACE_SECONDS = int(os.getenv("REFRESH_REUSE_GRACE_SECONDS", "10"))
+REFRESH_PURGE_INTERVAL_SECONDS = 3600
+
+_last_purge: Optional[datetime] = None
+
+
+def hash_token(raw: str) -> str:
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=detail)
+
+
+def issue_refresh_token(db: Session, user_id: int, family_id: Optional[str] = None) -> str:
+    """Add a new refresh token row in the caller's transaction and return the raw token."""
+    raw = secrets.token_urlsafe(32)
+    now = datetime.utcnow()
+    db.add(
+        RefreshToken(
+            user_id=user_id,
+            token_hash=hash_token(raw),
+            family_id=family_id or secrets.token_hex(16),
+            created_at=now,
+            expires_at=now + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+        )
+    )
+    _maybe_purge(db, now)
+    return raw
+
+
+def rotate_refresh_token(db: Session, raw: str) -> Tuple[User, str]:
+    """Validate + consume a refresh token; returns (user, new raw token). Caller commits."""
+    row = (
+        db.query(RefreshToken, User)
+        .join(User, User.id == RefreshToken.user_id)
+        .filter(RefreshToken.token_hash == hash_token(raw))
+        .first()
+    )
+    if row is None:
+        raise _unauthorized("Invalid refresh token")
+    token, user = row
+    now = datetime.utcnow()
+
+    if token.revoked_at is not None:
+        raise _unauthorized("Refresh token revoked")
+    if token.expires_at < now:
+        raise _unauthorized("Refresh token expired")
+
+    if token.used_at is None:
+        consumed = db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.id == token.id, RefreshToken.used_at.is_(None), RefreshToken.revoked_at.is_(None))
+            .values(used_at=now)
+        ).rowcount
+    else:
+        consumed = 0
+
+    if not consumed:
+        used_at = token.used_at or now
+        if (now - used_at).total_seconds() > REFRESH_REUSE_GRACE_SECONDS:
+            # an old token came back: assume it was stolen and kill the whole chain
+            revoke_family(db, token.family_id, now)
+            db.commit()
+            print(f"[AUTH] refresh token reuse detected for user {user.email}; family revoked")
+        raise _unauthorized("Refresh token already used")
+
+    return user, issue_refresh_token(db, user.id, family_id=token.family_id)
+
+
+def revoke_family(db: Session, family_id: str, now: Optional[datetime] = None) -> int:
+    return db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=now or datetime.utcnow())
+    ).rowcount
+
+
+def revoke_refresh_token(db: Session, raw: str) -> bool:
+    """Logout: revoke the token's family. Unknown tokens are ignored."""
+    token = db.query(RefreshToken).filter(RefreshToken.token_hash == hash_token(raw)).first()
+    if token is None:
+        return False
+    revoke_family(db, token.family_id)
+    return True
+
+
+def revoke_user_tokens(db: Session, user_id: int) -> int:
+    return db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+    ).rowcount
+
+
+def _maybe_purge(db: Session, now: datetime) -> None:
+    """Drop long-expired rows now and then, in the caller's transaction."""
+    global _last_purge
+    if _last_purge and (now - _last_purge).total_seconds() < REFRESH_PURGE_INTERVAL_SECONDS:
+        return
+    _last_purge = now
+    # keep a day of expired/revoked rows around so replays are still recognised
+    cutoff = now - timedelta(days=1)
+    db.execute(
+        delete(RefreshToken).where(
+            or_(RefreshToken.expires_at < cutoff, RefreshToken.revoked_at < cutoff)
+        )
+    )
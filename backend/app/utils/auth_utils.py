@@ -1,12 +1,36 @@
 # backend/app/utils/auth_utils.py
 
-from datetime import datetime, timedelta
-from jose import jwt
+import os
+from datetime import datetime, timedelta, timezone
+from jose import jwt, JWTError
 from passlib.context import CryptContext
 
+from app.utils.signing_keys import JWT_ALGORITHM, key_ring
+
 SECRET_KEY = "supersecretkey"     # ⚠️ move to .env later
-ALGORITHM = "HS256"
+ALGORITHM = JWT_ALGORITHM         # access tokens: RS256/ES256 with a kid, see signing_keys
+LEGACY_ALGORITHM = "HS256"        # tokens issued before asymmetric signing
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
+JWT_ISSUER = os.getenv("JWT_ISSUER", "gp-portal")
+
+
+def _legacy_hs256_until():
+    """
+    JWT_LEGACY_HS256_UNTIL (UTC, ISO 8601): accept old SECRET_KEY tokens up to
+    this moment only. Set it to deploy time + ACCESS_TOKEN_EXPIRE_MINUTES for the
+    switch-over; unset (the default), HS256 tokens are refused, since anyone who
+    knows SECRET_KEY can mint them.
+    """
+    value = os.getenv("JWT_LEGACY_HS256_UNTIL")
+    if not value:
+        return None
+    until = datetime.fromisoformat(value)
+    if until.tzinfo is not None:
+        until = until.astimezone(timezone.utc).replace(tzinfo=None)
+    return until
+
+
+JWT_LEGACY_HS256_UNTIL = _legacy_hs256_until()
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -22,11 +46,40 @@ def get_password_hash(password: str) -> str:
 
 
 def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
-    """Create a signed JWT token."""
+    """Create a JWT signed with the active private key (kid in the header)."""
     to_encode = data.copy()
-    expire = datetime.utcnow() + (
+    now = datetime.utcnow()
+    expire = now + (
         expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     )
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
\ No newline at end of file
+    to_encode.update({"exp": expire, "iat": now, "iss": JWT_ISSUER})
+    kid, key = key_ring.signing_key()
+    encoded_jwt = jwt.encode(to_encode, key, algorithm=ALGORITHM, headers={"kid": kid})
+    return encoded_jwt
+
+
+def decode_access_token(token: str, audience: str = None) -> dict:
+    """
+    Verify a JWT and return its claims (raises JWTError).
+    The key is picked by the header's kid; the algorithm is pinned per key
+    type, so an HS256 token can never be checked against a public key.
+    Single-purpose tokens carry an aud claim: they only verify with that
+    audience, so they are never accepted as access tokens (and vice versa).
+    """
+    header = jwt.get_unverified_header(token)
+
+    if header.get("alg") == LEGACY_ALGORITHM and "kid" not in header:
+        if audience is not None:
+            raise JWTError("Invalid audience")
+        if JWT_LEGACY_HS256_UNTIL is None or datetime.utcnow() >= JWT_LEGACY_HS256_UNTIL:
+            raise JWTError("Legacy HS256 tokens are no longer accepted")
+        return jwt.decode(token, SECRET_KEY, algorithms=[LEGACY_ALGORITHM])
+
+    key = key_ring.verification_key(header.get("kid"))
+    if key is None:
+        raise JWTError("Unknown signing key")
+    claims = jwt.decode(token, key, algorithms=[ALGORITHM], issuer=JWT_ISSUER, audience=audience)
+    if audience is not None and "aud" not in claims:
+        # python-jose lets a token without aud through any audience check
+        raise JWTError("Invalid audience")
+    return claims
\ No newline at end of file
@@ -2,14 +2,18 @@
 
 import os
 import smtplib
+from html import escape
+from typing import Iterable, List, Sequence, Tuple
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from dotenv import load_dotenv
 
+from app.services.metrics import track_call
+
 load_dotenv()
 
 EMAIL_HOST = os.getenv("EMAIL_HOST")
-EMAIL_PORT = int(os.getenv("EMAIL_PORT"))
+EMAIL_PORT = int(os.getenv("EMAIL_PORT", 587))
 EMAIL_USERNAME = os.getenv("EMAIL_USERNAME")
 EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD")
 
@@ -36,16 +40,71 @@ def send_email_otp(to_email: str, otp_code: str):
 
     try:
         print(f"[OTP EMAIL] Attempting SMTP send to {to_email} via {EMAIL_HOST}:{EMAIL_PORT}")
-        server = smtplib.SMTP(EMAIL_HOST, EMAIL_PORT)
-        server.starttls()
-        server.login(EMAIL_USERNAME, EMAIL_PASSWORD)
-        server.sendmail(EMAIL_USERNAME, to_email, msg.as_string())
-        server.quit()
+        with track_call("smtp", "send_otp"):
+            server = smtplib.SMTP(EMAIL_HOST, EMAIL_PORT)
+            server.starttls()
+            server.login(EMAIL_USERNAME, EMAIL_PASSWORD)
+            server.sendmail(EMAIL_USERNAME, to_email, msg.as_string())
+            server.quit()
         print(f"[OTP EMAIL] Email sent successfully to {to_email}")
         return True
     except Exception as e:
         print(f"[OTP EMAIL] Email sending failed for {to_email}: {e}")
         return False
+
+
+def _digest_message(to_email: str, doc_names: Sequence[str], frontend_url: str) -> MIMEMultipart:
+    if len(doc_names) == 1:
+        subject = "New document added to your GP Portal"
+        intro = f"Your document <strong>{escape(doc_names[0])}</strong> has been added to your GP Portal account."
+    else:
+        subject = f"{len(doc_names)} new documents added to your GP Portal"
+        items = "".join(f"<li>{escape(name)}</li>" for name in doc_names)
+        intro = f"The following documents have been added to your GP Portal account:</p><ul>{items}</ul><p>"
+
+    message = f"""
+    <p>Hello,</p>
+    <p>{intro}</p>
+    <p>Please <a href='{frontend_url}/auth/start'>log in</a> to view and download them.</p>
+    <p>Thanks,<br/>GP Portal Team</p>
+    """
+
+    msg = MIMEMultipart()
+    msg["From"] = EMAIL_USERNAME
+    msg["To"] = to_email
+    msg["Subject"] = subject
+    msg.attach(MIMEText(message, "html"))
+    return msg
+
+
+def send_document_digest(digests: Iterable[Tuple[str, Sequence[str]]], frontend_url: str) -> List[str]:
+    """
+    Sends one email per recipient listing their new documents, all over a
+    single SMTP session. Returns the recipients that could not be sent to.
+    """
+    digests = list(digests)
+    done = set()
+    failed = []
+    try:
+        with track_call("smtp", "send_document_digest"):
+            server = smtplib.SMTP(EMAIL_HOST, EMAIL_PORT)
+            server.starttls()
+            server.login(EMAIL_USERNAME, EMAIL_PASSWORD)
+            for to_email, doc_names in digests:
+                try:
+                    server.sendmail(EMAIL_USERNAME, to_email, _digest_message(to_email, doc_names, frontend_url).as_string())
+                except smtplib.SMTPRecipientsRefused as e:
+                    print(f"[NOTIFY] digest to {to_email} refused: {e}")
+                    failed.append(to_email)
+                done.add(to_email)
+            server.quit()
+    except Exception as e:
+        # connection-level failure: everything not yet handed to the server is retried
+        print("Document digest email failed:", e)
+        failed.extend(to_email for to_email, _ in digests if to_email not in done)
+    return failed
+
+
 def send_document_notification(to_email: str, doc_name: str, frontend_url: str):
     """
     Sends a notification email to the user when a document is added to their portal.
@@ -66,11 +125,12 @@ def send_document_notification(to_email: str, doc_name: str, frontend_url: str):
     msg.attach(MIMEText(message, "html"))
 
     try:
-        server = smtplib.SMTP(EMAIL_HOST, EMAIL_PORT)
-        server.starttls()
-        server.login(EMAIL_USERNAME, EMAIL_PASSWORD)
-        server.sendmail(EMAIL_USERNAME, to_email, msg.as_string())
-        server.quit()
+        with track_call("smtp", "send_document_notification"):
+            server = smtplib.SMTP(EMAIL_HOST, EMAIL_PORT)
+            server.starttls()
+            server.login(EMAIL_USERNAME, EMAIL_PASSWORD)
+            server.sendmail(EMAIL_USERNAME, to_email, msg.as_string())
+            server.quit()
         return True
     except Exception as e:
         print("Document notification email failed:", e)
@@ -0,0 +1,202 @@
+# backend/app/utils/signing_keys.py
+
+"""
+Asymmetric JWT signing keys with key IDs (kid) and a published JWKS.
+
+Private keys live as PEM files in JWT_KEYS_DIR, one file per key, named
+<kid>.pem. kids start with a UTC timestamp, so sorting them sorts keys by
+creation time. Every key in the directory is published in
+/.well-known/jwks.json. Tokens are signed with the newest key that has been
+published for at least JWT_KEY_PUBLISH_SECONDS, so verifiers that cache the
+JWKS pick up a new key before any token uses it.
+
+Keys are parsed once into jose key objects. The directory is re-scanned at
+most every JWT_KEYS_RELOAD_SECONDS, and again when a token carries an
+unknown kid, so keys rotated by another process are picked up without a
+restart.
+
+    python -m app.utils.signing_keys list
+    python -m app.utils.signing_keys rotate    # add a new key (published now, signs later)
+    python -m app.utils.signing_keys prune     # delete keys no live token can still use
+"""
+
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from jose import jwk
+
+JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "RS256")  # RS256 | ES256
+JWT_KEYS_DIR = Path(os.getenv("JWT_KEYS_DIR", Path(__file__).resolve().parents[2] / "keys"))
+JWT_KEY_PUBLISH_SECONDS = int(os.getenv("JWT_KEY_PUBLISH_SECONDS", "600"))
+JWT_KEYS_RELOAD_SECONDS = float(os.getenv("JWT_KEYS_RELOAD_SECONDS", "30"))
+JWKS_MAX_AGE_SECONDS = int(os.getenv("JWKS_MAX_AGE_SECONDS", "300"))
+
+_KID_TIME_FORMAT = "%Y%m%d%H%M%S"
+
+
+def _kid_created(kid: str) -> float:
+    # the timestamp is UTC: a naive .timestamp() would read it as local time
+    return datetime.strptime(kid.split("-")[0], _KID_TIME_FORMAT).replace(tzinfo=timezone.utc).timestamp()
+
+
+def generate_key(directory: Path = JWT_KEYS_DIR, algorithm: str = JWT_ALGORITHM) -> str:
+    """Write a new private key (mode 0600, never overwrites) and return its kid."""
+    if algorithm == "RS256":
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    elif algorithm == "ES256":
+        private_key = ec.generate_private_key(ec.SECP256R1())
+    else:
+        raise ValueError(f"Unsupported JWT_ALGORITHM: {algorithm}")
+
+    pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    kid = f"{datetime.utcnow():{_KID_TIME_FORMAT}}-{secrets.token_hex(4)}"
+
+    directory.mkdir(parents=True, exist_ok=True)
+    fd = os.open(directory / f"{kid}.pem", os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(pem)
+    print(f"[JWT KEYS] generated {algorithm} key {kid}")
+    return kid
+
+
+class KeyRing:
+    def __init__(self, directory: Path = JWT_KEYS_DIR, algorithm: str = JWT_ALGORITHM):
+        self.directory = Path(directory)
+        self.algorithm = algorithm
+        self._lock = threading.Lock()
+        self._signing: Dict[str, object] = {}        # kid -> private jose key
+        self._verifying: Dict[str, object] = {}      # kid -> public jose key
+        self._jwks: Dict = {"keys": []}
+        self._active_kid: Optional[str] = None
+        self._loaded_at = 0.0
+
+    # -----------------------------------------------------
+    # Loading
+    # -----------------------------------------------------
+    def load(self) -> None:
+        with self._lock:
+            self._load()
+
+    def _load(self) -> None:
+        files = sorted(self.directory.glob("*.pem")) if self.directory.exists() else []
+        if not files:
+            generate_key(self.directory, self.algorithm)
+            files = sorted(self.directory.glob("*.pem"))
+
+        signing, verifying, public_jwks = {}, {}, []
+        for path in files:
+            kid = path.stem
+            if kid in self._signing:
+                # already parsed; PEM files never change under the same kid
+                signing[kid], verifying[kid] = self._signing[kid], self._verifying[kid]
+            else:
+                private = jwk.construct(path.read_bytes().decode("ascii"), self.algorithm)
+                signing[kid], verifying[kid] = private, private.public_key()
+            entry = verifying[kid].to_dict()
+            entry.update({"kid": kid, "use": "sig", "alg": self.algorithm})
+            public_jwks.append(entry)
+
+        # newest key that verifiers have had time to fetch; the newest overall on a fresh install
+        cutoff = time.time() - JWT_KEY_PUBLISH_SECONDS
+        kids = sorted(signing)
+        ready = [kid for kid in kids if _kid_created(kid) <= cutoff]
+        active = ready[-1] if ready else kids[-1]
+
+        if active != self._active_kid:
+            print(f"[JWT KEYS] signing with {active} ({len(kids)} published)")
+        self._signing, self._verifying, self._active_kid = signing, verifying, active
+        self._jwks = {"keys": public_jwks}
+        self._loaded_at = time.monotonic()
+
+    def _maybe_reload(self, force: bool = False) -> None:
+        if not force and time.monotonic() - self._loaded_at < JWT_KEYS_RELOAD_SECONDS and self._active_kid:
+            return
+        with self._lock:
+            # rate-limit forced reloads too, so junk kids can't make us re-scan per request
+            if time.monotonic() - self._loaded_at >= (1.0 if force else JWT_KEYS_RELOAD_SECONDS) or not self._active_kid:
+                self._load()
+
+    # -----------------------------------------------------
+    # Lookups
+    # -----------------------------------------------------
+    def signing_key(self):
+        """(kid, private key object) to sign new tokens with."""
+        self._maybe_reload()
+        kid = self._active_kid
+        return kid, self._signing[kid]
+
+    def verification_key(self, kid: Optional[str]):
+        """Public key object for a kid, or None if unknown."""
+        self._maybe_reload()
+        if kid is None:
+            return None
+        key = self._verifying.get(kid)
+        if key is None:
+            self._maybe_reload(force=True)
+            key = self._verifying.get(kid)
+        return key
+
+    def jwks(self) -> Dict:
+        self._maybe_reload()
+        return self._jwks
+
+    def kids(self) -> List[str]:
+        self._maybe_reload()
+        return sorted(self._signing)
+
+
+key_ring = KeyRing()
+
+
+# =========================================================
+# CLI
+# =========================================================
+def _prune(ring: KeyRing, token_lifetime_seconds: int) -> List[str]:
+    """Delete keys superseded long enough ago that every token they signed has expired."""
+    ring.load()
+    kids = ring.kids()
+    active = ring.signing_key()[0]
+    removed = []
+    for kid, successor in zip(kids, kids[1:]):
+        if kid >= active:
+            break
+        # the successor started signing at its creation + publish delay
+        retired_at = _kid_created(successor) + JWT_KEY_PUBLISH_SECONDS
+        if retired_at + token_lifetime_seconds < time.time():
+            (ring.directory / f"{kid}.pem").unlink()
+            removed.append(kid)
+    return removed
+
+
+def main(argv: List[str]) -> int:
+    command = argv[0] if argv else "list"
+    if command == "rotate":
+        print(generate_key())
+    elif command == "list":
+        key_ring.load()
+        print(json.dumps({"active": key_ring.signing_key()[0], "keys": key_ring.kids()}, indent=2))
+    elif command == "prune":
+        from app.utils.auth_utils import ACCESS_TOKEN_EXPIRE_MINUTES
+
+        print(json.dumps({"removed": _prune(key_ring, ACCESS_TOKEN_EXPIRE_MINUTES * 60)}, indent=2))
+    else:
+        print("usage: python -m app.utils.signing_keys [list|rotate|prune]")
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,186 @@
+# backend/benchmarks/fakes.py
+
+"""
+Local stand-ins for the external services the API talks to:
+
+- FakeBlobServiceClient: in-process replacement for azure BlobServiceClient
+  (only the calls the routers / migrator use)
+- SMTPSink: replacement for smtplib.SMTP that keeps sent messages in memory,
+  so the benchmark can read OTP codes back out
+"""
+
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from email import message_from_string
+
+
+# =========================================================
+# BLOB STORAGE
+# =========================================================
+class _Store:
+    def __init__(self):
+        self.blobs = {}
+        self.lock = threading.Lock()
+
+
+_STORE = _Store()
+
+
+class FakeDownloader:
+    def __init__(self, data: bytes, chunk_size: int = 4 * 1024 * 1024):
+        self._data = data
+        self._chunk_size = chunk_size
+
+    def chunks(self):
+        for i in range(0, len(self._data), self._chunk_size):
+            yield self._data[i:i + self._chunk_size]
+
+    def readall(self) -> bytes:
+        return self._data
+
+
+class FakeBlobClient:
+    def __init__(self, container: str, name: str):
+        self.container = container
+        self.blob_name = name
+
+    @property
+    def _key(self):
+        return (self.container, self.blob_name)
+
+    def exists(self) -> bool:
+        return self._key in _STORE.blobs
+
+    def upload_blob(self, data, overwrite: bool = False, **kwargs):
+        if hasattr(data, "read"):
+            data = data.read()
+        with _STORE.lock:
+            if not overwrite and self._key in _STORE.blobs:
+                raise ValueError(f"Blob already exists: {self.blob_name}")
+            _STORE.blobs[self._key] = bytes(data)
+
+    def download_blob(self, **kwargs) -> FakeDownloader:
+        try:
+            return FakeDownloader(_STORE.blobs[self._key])
+        except KeyError:
+            raise FileNotFoundError(self.blob_name)
+
+
+class FakeContainerClient:
+    def __init__(self, name: str):
+        self.container_name = name
+        self.url = f"https://fake.blob.example.com/{name}"
+
+    def create_container(self):
+        pass
+
+    def get_blob_client(self, name: str) -> FakeBlobClient:
+        return FakeBlobClient(self.container_name, name)
+
+    def upload_blob(self, name: str, data, overwrite: bool = False, **kwargs):
+        self.get_blob_client(name).upload_blob(data, overwrite=overwrite, **kwargs)
+
+
+class FakeBlobServiceClient:
+    @classmethod
+    def from_connection_string(cls, conn_str: str, **kwargs):
+        return cls()
+
+    def get_container_client(self, name: str) -> FakeContainerClient:
+        return FakeContainerClient(name)
+
+
+def put_blob(container: str, name: str, data: bytes) -> None:
+    FakeBlobClient(container, name).upload_blob(data, overwrite=True)
+
+
+# =========================================================
+# SMTP
+# =========================================================
+OTP_RE = re.compile(r"<h2>\s*(\d{6})\s*</h2>")
+
+
+class SMTPSink:
+    """Drop-in for smtplib.SMTP(host, port) used as in email_utils."""
+
+    outbox = defaultdict(deque)
+    lock = threading.Lock()
+
+    def __init__(self, host=None, port=None, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.quit()
+
+    def ehlo(self, *args, **kwargs):
+        pass
+
+    def starttls(self, *args, **kwargs):
+        pass
+
+    def login(self, *args, **kwargs):
+        pass
+
+    def sendmail(self, from_addr, to_addrs, msg):
+        if isinstance(to_addrs, str):
+            to_addrs = [to_addrs]
+        with self.lock:
+            for to in to_addrs:
+                self.outbox[to.lower()].append(msg)
+        return {}
+
+    def send_message(self, msg, from_addr=None, to_addrs=None, **kwargs):
+        to_addrs = to_addrs or [addr.strip() for addr in msg["To"].split(",")]
+        return self.sendmail(from_addr or msg["From"], to_addrs, msg.as_string())
+
+    def quit(self):
+        pass
+
+    @classmethod
+    def message_count(cls, email: str) -> int:
+        with cls.lock:
+            return len(cls.outbox.get(email.lower(), ()))
+
+    @classmethod
+    def wait_for_otp(cls, email: str, after_count: int, timeout: float = 5.0):
+        """OTP from the first email past after_count (emails are sent by the outbox dispatcher)."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if cls.message_count(email) > after_count:
+                return cls.last_otp(email)
+            time.sleep(0.005)
+        return None
+
+    @classmethod
+    def last_otp(cls, email: str):
+        with cls.lock:
+            messages = list(cls.outbox.get(email.lower(), ()))
+        for raw in reversed(messages):
+            msg = message_from_string(raw)
+            for part in msg.walk():
+                if part.get_content_maintype() != "text":
+                    continue
+                body = part.get_payload(decode=True).decode("utf-8", "replace")
+                match = OTP_RE.search(body)
+                if match:
+                    return match.group(1)
+        return None
+
+
+# =========================================================
+# INSTALL
+# =========================================================
+def install():
+    """Point the app (and smtplib) at the local stand-ins. Call after importing app.main."""
+    import smtplib
+
+    from app.routers import admin, documents
+
+    smtplib.SMTP = SMTPSink
+    admin.BlobServiceClient = FakeBlobServiceClient
+    documents.BlobServiceClient = FakeBlobServiceClient
@@ -0,0 +1,234 @@
+# backend/benchmarks/list_serialization.py
+
+"""
+CPU cost of the admin list endpoints per 10k rows: the previous ORM path vs
+the column-projection + orjson path (app/utils/fast_json.py).
+
+"before" is the code the routes used to run: hydrate ORM objects, copy them
+into dicts (or Pydantic models), validate against response_model and encode
+with stdlib json, the same steps FastAPI takes for a plain return value.
+"after" calls the current route functions. Both run against the seeded
+benchmark database in-process, so the numbers are query + build + encode,
+without HTTP. Both outputs are parsed and compared, so the fast path can't
+get faster by returning something different.
+
+Usage (from backend/):
+
+    python -m benchmarks.list_serialization
+    python -m benchmarks.list_serialization --scale 0.5 --repeat 3
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+
+def _encode(adapter, content) -> bytes:
+    # FastAPI: validate + serialize through the response_model, then JSONResponse.render
+    value = adapter.validate_python(content, from_attributes=True)
+    data = adapter.dump_python(value, mode="json")
+    return json.dumps(data, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+# =========================================================
+# BEFORE: the routes as they were
+# =========================================================
+def legacy_users(db):
+    from fastapi.encoders import jsonable_encoder
+
+    from app.models.user_model import User
+
+    users = db.query(User).all()
+    content = [
+        {"id": u.id, "email": u.email, "first_name": u.first_name, "last_name": u.last_name, "username": u.username}
+        for u in users
+    ]
+    # no response_model: jsonable_encoder + json.dumps
+    return json.dumps(jsonable_encoder(content), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def legacy_documents(db):
+    from pydantic import TypeAdapter
+
+    from app.models.document_model import Document
+
+    docs = db.query(Document).order_by(Document.uploaded_at.desc()).all()
+    content = [
+        {
+            "id": d.id,
+            "name": d.name,
+            "label": d.label,
+            "deal_name": d.deal_name,
+            "profile_name": d.profile_name,
+            "file_path": d.file_path,
+            "uploaded_at": d.uploaded_at,
+            "uploaded_by_id": d.uploaded_by_id,
+            "uploaded_by_email": d.uploaded_by.email if getattr(d, "uploaded_by", None) else None,
+        }
+        for d in docs
+    ]
+    return _encode(TypeAdapter(List[dict]), content)
+
+
+def legacy_investments(db):
+    from pydantic import TypeAdapter
+
+    from app.models.investment_model import Investment
+
+    rows = db.query(Investment).order_by(Investment.id.desc()).all()
+    content = [
+        {
+            "id": r.id,
+            "deal_name": r.deal_name,
+            "investment_total": r.investment_total,
+            "distribution_total": r.distribution_total,
+            "status": r.status,
+            "uploaded_by_id": r.uploaded_by_id,
+        }
+        for r in rows
+    ]
+    return _encode(TypeAdapter(List[dict]), content)
+
+
+def legacy_profiles(db):
+    from pydantic import TypeAdapter
+
+    from app.models.profile_model import Profile
+
+    rows = db.query(Profile).order_by(Profile.id.desc()).all()
+    content = [
+        {
+            "id": p.id,
+            "entity_name": p.entity_name,
+            "jurisdiction": p.jurisdiction,
+            "tax_classification": p.tax_classification,
+            "profile_type": p.profile_type,
+            "contact_email": p.contact_email,
+            "contact_phone": p.contact_phone,
+            "user_id": p.user_id,
+        }
+        for p in rows
+    ]
+    return _encode(TypeAdapter(List[dict]), content)
+
+
+def legacy_deal_interests(db, deal_id):
+    from pydantic import TypeAdapter
+
+    from app.models.deal_interest_model import DealInterest
+    from app.models.user_model import User
+    from app.routers.deals import DealInterestAdminOut
+
+    rows = (
+        db.query(DealInterest, User)
+        .join(User, User.id == DealInterest.user_id)
+        .filter(DealInterest.deal_id == deal_id)
+        .order_by(DealInterest.created_at.desc())
+        .all()
+    )
+    content = [
+        DealInterestAdminOut(
+            id=i.id, deal_id=i.deal_id, user_id=i.user_id, status=i.status,
+            created_at=i.created_at, user_email=u.email, user_name=u.username,
+        )
+        for i, u in rows
+    ]
+    return _encode(TypeAdapter(List[DealInterestAdminOut]), content)
+
+
+# =========================================================
+# CASES: (name, before(db) -> [body], after(db) -> [body])
+# =========================================================
+def cases(db):
+    from app.models.deal_model import Deal
+    from app.routers import admin, deals
+
+    deal_ids = [deal_id for (deal_id,) in db.query(Deal.id).order_by(Deal.id)]
+
+    def single(fn):
+        return lambda db: [fn(db)]
+
+    def every_deal(fn):
+        # per-deal lists are short: request all of them to get a measurable row count
+        return lambda db: [fn(db, deal_id) for deal_id in deal_ids]
+
+    def after_interests(db, deal_id):
+        return deals.list_deal_interests_admin(deal_id=deal_id, db=db, current_admin=None).body
+
+    return [
+        ("admin/users", single(legacy_users),
+         single(lambda db: admin.get_all_users(db=db, current_admin=None).body)),
+        ("admin/documents", single(legacy_documents),
+         single(lambda db: admin.get_all_documents(db=db, current_admin=None).body)),
+        ("admin/investments", single(legacy_investments),
+         single(lambda db: admin.get_all_investments(db=db, current_admin=None).body)),
+        ("admin/profiles", single(legacy_profiles),
+         single(lambda db: admin.get_all_profiles(db=db, current_admin=None).body)),
+        ("admin/deals/{id}/interests", every_deal(legacy_deal_interests), every_deal(after_interests)),
+    ]
+
+
+def measure(fn, session_factory, repeat: int):
+    """Best-of-repeat CPU seconds for one call (fresh session each time, like a request)."""
+    best, bodies = None, None
+    for _ in range(repeat):
+        db = session_factory()
+        try:
+            start = time.process_time()
+            bodies = fn(db)
+            elapsed = time.process_time() - start
+        finally:
+            db.close()
+        best = elapsed if best is None else min(best, elapsed)
+    return best, [row for body in bodies for row in json.loads(body)]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="CPU per 10k rows of the admin list endpoints, before/after")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplier for seeded volumes")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    from benchmarks.run import configure_environment
+
+    configure_environment(os.path.join(tempfile.mkdtemp(prefix="gp_lists_"), "lists.db"))
+
+    import app.main  # noqa: F401  (registers every model on Base)
+    from app.services.database import SessionLocal
+    from benchmarks.seed import seed
+
+    seed(scale=args.scale, seed_value=42)
+
+    db = SessionLocal()
+    try:
+        case_list = cases(db)
+    finally:
+        db.close()
+
+    print(f"\n{'endpoint':<30}{'rows':>8}{'before ms/10k':>16}{'after ms/10k':>15}{'speedup':>10}")
+    print("-" * 79)
+    mismatches = []
+    for name, before, after in case_list:
+        before_cpu, before_rows = measure(before, SessionLocal, args.repeat)
+        after_cpu, rows = measure(after, SessionLocal, args.repeat)
+        if before_rows != rows:
+            mismatches.append(name)
+        per_10k = 10000 / max(len(rows), 1) * 1000
+        print(
+            f"{name:<30}{len(rows):>8}{before_cpu * per_10k:>16.1f}{after_cpu * per_10k:>15.1f}"
+            f"{before_cpu / max(after_cpu, 1e-9):>9.1f}x"
+        )
+
+    if mismatches:
+        print(f"\nOutput differs from the previous implementation: {', '.join(mismatches)}")
+        return 1
+    print("\nSame JSON from both paths.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
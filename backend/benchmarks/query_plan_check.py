@@ -0,0 +1,176 @@
+# backend/benchmarks/query_plan_check.py
+
+"""
+Query-plan regression check for the hot query shapes.
+
+Seeds a local SQLite database with the benchmark dataset, runs ANALYZE, then
+calls the router / service functions behind the hot endpoints, captures the
+SQL they actually send and EXPLAINs each statement. Any hot query that reads
+one of its tables with a full SCAN (instead of an index SEARCH) fails the
+check, unless it is listed in KNOWN_SCANS with the reason.
+
+Usage (from backend/):
+
+    python -m benchmarks.query_plan_check            # exit 1 on regression
+    python -m benchmarks.query_plan_check --verbose  # print every plan
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+
+def hot_paths(db):
+    """
+    (name, call) pairs: the router / service functions themselves, called the
+    way their endpoints call them, for investor 2 / document 1 / deal 1.
+    """
+    from datetime import date
+
+    from app.models.user_model import User
+    from app.routers import admin, deals, documents, investments, profiles
+    from app.routers.auth import authenticate_token
+    from app.services.data_versions import get_data_version
+    from app.services.default_profile import profile_cache
+    from app.services.document_access import get_document_for_user
+    from app.services.ledger import balances_as_of
+    from app.services.outbox import outbox_dispatcher
+    from app.utils.auth_utils import create_access_token
+
+    user = db.get(User, 2)
+    admin_user = db.get(User, 1)
+    db.expunge_all()  # loaded once, like the auth dependency does, not again after each rollback
+    token = create_access_token({"sub": user.email, "uid": user.id})
+    profile_cache.clear()  # /me must reach the database
+
+    def search(**filters):
+        params = dict(
+            deal_type=None, deal_subtype=None, deal_stage=None, location=None, close_from=None, close_to=None,
+            size_min=None, size_max=None, min_investment_max=None, target_irr_min=None,
+            sort="newest", limit=50, offset=0,
+        )
+        params.update(filters)
+        return lambda: deals.search_deals(db=db, current_user=user, **params)
+
+    return [
+        ("auth.get_current_user", lambda: authenticate_token(token, db)),
+        ("data_versions.etag", lambda: get_data_version(db, user.id)),
+        ("investments.get_investments", lambda: investments.get_investments(db=db, current_user=user)),
+        ("investments.get_investment_summary", lambda: investments.get_investment_summary(db=db, current_user=user)),
+        ("admin.get_all_investments_summary", lambda: admin.get_all_investments_summary(db=db, current_admin=admin_user)),
+        ("ledger.balances_as_of.investor", lambda: balances_as_of(db, date(2024, 1, 1), user_id=user.id)),
+        ("ledger.balances_as_of.investment", lambda: balances_as_of(db, date(2024, 1, 1), investment_id=1)),
+        ("documents.get_documents", lambda: documents.get_documents(db=db, current_user=user)),
+        ("document_access.get_document_for_user", lambda: get_document_for_user(db, 1, admin_user)),
+        ("deals.list_deals", lambda: deals.list_deals(db=db, current_user=user)),
+        ("deals.search.facets", search(deal_type=["REAL_ESTATE"], location=["Texas", "Ohio"])),
+        ("deals.search.close_date", search(close_from=date(2024, 1, 1), close_to=date(2024, 6, 30))),
+        ("deals.search.min_investment", search(min_investment_max=50000, sort="min_investment")),
+        ("deals.list_deal_interests_admin", lambda: deals.list_deal_interests_admin(1, db=db, current_admin=admin_user)),
+        ("profiles.get_profiles", lambda: profiles.get_profiles(db=db, current_user=user)),
+        ("profiles.get_my_profile", lambda: profiles.get_my_profile(db=db, current_user=user)),
+        ("outbox.claim", lambda: outbox_dispatcher._claim(16)),
+    ]
+
+
+# statements that are expected to read a whole table, with the reason
+KNOWN_SCANS = {
+    # admin totals over everyone: one investor_balances row per investor, plus
+    # the positions of investors the ledger doesn't have yet (pre-ledger data)
+    ("admin.get_all_investments_summary", "investor_balances"): "sum over all investors",
+    ("admin.get_all_investments_summary", "investments"): "pre-ledger fallback (ledger.investor_totals)",
+}
+
+_NOT_EXPLAINED = ("PRAGMA", "SAVEPOINT", "RELEASE", "ROLLBACK", "COMMIT", "BEGIN", "ANALYZE")
+
+
+def capture_statements(engine, call):
+    """Run `call` and return the (sql, parameters) of every statement it sent to the database."""
+    from sqlalchemy import event
+
+    captured = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        sql = statement.lstrip()
+        if sql.upper().startswith(_NOT_EXPLAINED):
+            return
+        if sql.upper().startswith("INSERT") and " SELECT " not in sql.upper():
+            return  # plain VALUES inserts have no plan to check
+        captured.append((statement, parameters if not executemany else parameters[0]))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        call()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return captured
+
+
+def explain(engine, sql, parameters):
+    with engine.connect() as conn:
+        return [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", parameters).fetchall()]
+
+
+def full_scans(plan_lines):
+    """Plan lines that read a whole table / index rather than seeking into it."""
+    return [
+        line for line in plan_lines
+        if line.startswith("SCAN ") and not line.startswith("SCAN CONSTANT ROW")
+    ]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Fail if a hot query regresses to a table scan")
+    parser.add_argument("--scale", type=float, default=0.5)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    from benchmarks.run import configure_environment
+
+    configure_environment(os.path.join(tempfile.mkdtemp(prefix="gp_plan_"), "plan.db"))
+
+    from sqlalchemy import text
+
+    import app.main  # noqa: F401  (registers every model on Base)
+    from app.services.database import SessionLocal, engine
+    from benchmarks.seed import seed
+
+    seed(scale=args.scale)
+
+    db = SessionLocal()
+    try:
+        db.execute(text("ANALYZE"))
+        db.commit()
+        failures = []
+        for name, call in hot_paths(db):
+            statements = capture_statements(engine, call)
+            db.rollback()  # nothing a path writes (e.g. a first default profile) should leak into the next
+            if not statements:
+                print(f"[  ok] {name} (no query)")
+            for i, (sql, parameters) in enumerate(statements, 1):
+                label = name if len(statements) == 1 else f"{name} #{i}"
+                plan = explain(engine, sql, parameters)
+                known = [KNOWN_SCANS.get((name, line.split()[1])) for line in full_scans(plan)]
+                scans = [line for line, reason in zip(full_scans(plan), known) if reason is None]
+                status = "FAIL" if scans else "ok"
+                expected = "; ".join(reason for reason in known if reason)
+                print(f"[{status:>4}] {label}" + (f" (scan: {expected})" if expected else ""))
+                if args.verbose or scans:
+                    print(f"         {' '.join(sql.split())[:200]}")
+                    for line in plan:
+                        print(f"         {line}")
+                if scans:
+                    failures.append(label)
+    finally:
+        db.close()
+
+    if failures:
+        print(f"\n{len(failures)} hot quer{'y' if len(failures) == 1 else 'ies'} regressed to a scan: {', '.join(failures)}")
+        return 1
+    print("\nAll hot queries use index seeks (apart from the known scans noted above).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,354 @@
+# backend/benchmarks/run.py
+
+"""
+Load-test / benchmark suite for the GP Portal API.
+
+Boots the real FastAPI app under uvicorn against a local SQLite database, with
+an in-process fake blob store and SMTP sink, seeds realistic volumes and drives
+the main flows concurrently. Reports throughput and p50/p95/p99 latency per
+scenario and compares against a saved baseline.
+
+Usage (from backend/):
+
+    python -m benchmarks.run                      # run + compare to baseline
+    python -m benchmarks.run --save-baseline      # run + store as new baseline
+    python -m benchmarks.run --scale 0.2 --requests 100 --concurrency 4
+    python -m benchmarks.run --ci                 # CI: a missing / mismatched baseline fails too
+
+benchmarks/baseline.json is the reference run at the default settings.
+Exit code is 1 when any scenario regresses beyond --tolerance.
+"""
+
+import argparse
+import json
+import os
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+DEFAULT_RESULTS = os.path.join(BENCH_DIR, "results", "latest.json")
+
+
+# =========================================================
+# ENVIRONMENT (must be set before the app is imported)
+# =========================================================
+def configure_environment(db_path: str) -> None:
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ.setdefault("EMAIL_HOST", "localhost")
+    os.environ.setdefault("EMAIL_PORT", "25")
+    os.environ.setdefault("EMAIL_USERNAME", "bench@bench.example.com")
+    os.environ.setdefault("EMAIL_PASSWORD", "bench")
+    # every scenario request comes from 127.0.0.1: the login limiter would turn them into 429s
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
+    # throwaway JWT signing keys next to the throwaway database
+    os.environ.setdefault("JWT_KEYS_DIR", os.path.join(os.path.dirname(db_path), "jwt-keys"))
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(app, port: int):
+    import uvicorn
+
+    config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", access_log=False)
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.time() + 30
+    while not server.started:
+        if time.time() > deadline:
+            raise RuntimeError("uvicorn did not start")
+        time.sleep(0.05)
+    return server, thread
+
+
+# =========================================================
+# SCENARIOS
+# =========================================================
+class Context:
+    def __init__(self, base_url: str, data: dict):
+        from app.utils.auth_utils import create_access_token
+
+        self.base_url = base_url
+        self.data = data
+        self.investors = data["investor_emails"]
+        self.tokens = {
+            email: create_access_token({"sub": email, "role": "User"})
+            for email in self.investors
+        }
+        # investors that actually own documents, for the download flow
+        self.doc_owners = [
+            email for email in self.investors
+            if data["documents_by_user"].get(data["user_ids_by_email"][email])
+        ]
+
+    def auth(self, email: str) -> dict:
+        return {"Authorization": f"Bearer {self.tokens[email]}"}
+
+
+def _check(resp, expected=(200,)):
+    if resp.status_code not in expected:
+        raise RuntimeError(f"{resp.request.method} {resp.url} -> {resp.status_code}: {resp.text[:200]}")
+    return resp
+
+
+# one login per email at a time: a second login-init replaces the pending OTP,
+# which is correct server behaviour but not what this scenario measures
+_login_locks = {}
+_login_locks_guard = threading.Lock()
+
+
+def scenario_login(http, ctx: Context, rnd: random.Random):
+    from benchmarks.fakes import SMTPSink
+    from benchmarks.seed import BENCH_PASSWORD
+
+    email = rnd.choice(ctx.investors)
+    with _login_locks_guard:
+        lock = _login_locks.setdefault(email, threading.Lock())
+    with lock:
+        sent_before = SMTPSink.message_count(email)
+        _check(http.post(f"{ctx.base_url}/api/auth/login-init", json={"email": email, "password": BENCH_PASSWORD}))
+        otp = SMTPSink.wait_for_otp(email, sent_before)
+        if otp is None:
+            raise RuntimeError(f"no OTP captured for {email}")
+        _check(http.post(f"{ctx.base_url}/api/auth/login-verify-otp", json={"email": email, "otp": otp}))
+
+
+def scenario_documents_list(http, ctx: Context, rnd: random.Random):
+    email = rnd.choice(ctx.investors)
+    _check(http.get(f"{ctx.base_url}/api/documents/", headers=ctx.auth(email)))
+
+
+def scenario_pdf_download(http, ctx: Context, rnd: random.Random):
+    email = rnd.choice(ctx.doc_owners)
+    doc_id = rnd.choice(ctx.data["documents_by_user"][ctx.data["user_ids_by_email"][email]])
+    resp = _check(http.get(
+        f"{ctx.base_url}/api/admin/documents/{doc_id}/user-download",
+        headers=ctx.auth(email),
+    ))
+    if not resp.content.startswith(b"%PDF"):
+        raise RuntimeError("download did not return a PDF")
+
+
+def scenario_investments_summary(http, ctx: Context, rnd: random.Random):
+    email = rnd.choice(ctx.investors)
+    _check(http.get(f"{ctx.base_url}/api/investments/summary", headers=ctx.auth(email)))
+
+
+def scenario_deals_list(http, ctx: Context, rnd: random.Random):
+    email = rnd.choice(ctx.investors)
+    _check(http.get(f"{ctx.base_url}/api/deals/", headers=ctx.auth(email)))
+
+
+def scenario_deals_search(http, ctx: Context, rnd: random.Random):
+    from benchmarks.seed import DEAL_LOCATIONS
+
+    email = rnd.choice(ctx.investors)
+    # a handful of filter combinations, so both cached and uncached responses are measured
+    params = [("location", location) for location in rnd.sample(DEAL_LOCATIONS, rnd.randint(0, 2))]
+    if rnd.random() < 0.5:
+        params.append(("deal_type", "REAL_ESTATE"))
+    params.append(("min_investment_max", rnd.choice([25000, 100000])))
+    _check(http.get(f"{ctx.base_url}/api/deals/search", params=params, headers=ctx.auth(email)))
+
+
+def scenario_deal_interest(http, ctx: Context, rnd: random.Random):
+    email = rnd.choice(ctx.investors)
+    deal_id = rnd.choice(ctx.data["published_deal_ids"])
+    _check(http.post(f"{ctx.base_url}/api/deals/{deal_id}/interest", headers=ctx.auth(email)))
+
+
+# name -> (function, share of --requests); login is bcrypt-bound so it runs fewer
+SCENARIOS = {
+    "login": (scenario_login, 0.25),
+    "documents_list": (scenario_documents_list, 1.0),
+    "pdf_download": (scenario_pdf_download, 1.0),
+    "investments_summary": (scenario_investments_summary, 1.0),
+    "deals_list": (scenario_deals_list, 1.0),
+    "deals_search": (scenario_deals_search, 1.0),
+    "deal_interest": (scenario_deal_interest, 1.0),
+}
+
+
+# =========================================================
+# RUNNER
+# =========================================================
+def percentile(sorted_values, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = max(int(round(pct / 100.0 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(k, len(sorted_values) - 1)]
+
+
+def run_scenario(name, fn, ctx, total: int, concurrency: int, warmup: int, seed_value: int) -> dict:
+    import requests
+
+    local = threading.local()
+
+    def one(i):
+        http = getattr(local, "http", None)
+        if http is None:
+            http = local.http = requests.Session()
+        rnd = random.Random(seed_value * 100003 + i)
+        start = time.perf_counter()
+        try:
+            fn(http, ctx, rnd)
+            return time.perf_counter() - start, None
+        except Exception as e:
+            return time.perf_counter() - start, str(e)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(-warmup, 0)))
+        wall_start = time.perf_counter()
+        results = list(pool.map(one, range(total)))
+        wall = time.perf_counter() - wall_start
+
+    latencies = sorted(r[0] for r in results if r[1] is None)
+    errors = [r[1] for r in results if r[1] is not None]
+    return {
+        "requests": total,
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "throughput_rps": round(len(latencies) / wall, 2) if wall > 0 else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float):
+    """Return a list of human-readable regressions."""
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get("scenarios", {}).get(name)
+        if not base:
+            continue
+        if current["errors"] > base.get("errors", 0):
+            regressions.append(f"{name}: errors {base.get('errors', 0)} -> {current['errors']}")
+        if base["p95_ms"] > 0 and current["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {base['p95_ms']} ms -> {current['p95_ms']} ms")
+        if base["throughput_rps"] > 0 and current["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {base['throughput_rps']} -> {current['throughput_rps']} req/s"
+            )
+    return regressions
+
+
+def print_table(results: dict, baseline: dict):
+    header = f"{'scenario':<22}{'req':>6}{'err':>5}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'base p95':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        base = baseline.get("scenarios", {}).get(name, {})
+        print(
+            f"{name:<22}{r['requests']:>6}{r['errors']:>5}{r['throughput_rps']:>10}"
+            f"{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}{str(base.get('p95_ms', '-')):>10}"
+        )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="GP Portal API benchmark suite")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplier for seeded volumes")
+    parser.add_argument("--requests", type=int, default=300, help="measured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated subset")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--output", default=DEFAULT_RESULTS)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p95/throughput regression")
+    parser.add_argument("--db", default=None, help="SQLite file (default: temp file)")
+    parser.add_argument("--ci", action="store_true", default=bool(os.getenv("CI")),
+                        help="fail when there is no baseline for these settings (default on when CI is set)")
+    args = parser.parse_args(argv)
+
+    db_path = args.db or os.path.join(tempfile.mkdtemp(prefix="gp_bench_"), "bench.db")
+    configure_environment(db_path)
+
+    # import only after DATABASE_URL points at SQLite
+    from app.main import app
+    from benchmarks import fakes
+    from benchmarks.seed import seed
+
+    fakes.install()
+
+    print(f"Seeding {db_path} (scale={args.scale})...")
+    t0 = time.perf_counter()
+    data = seed(scale=args.scale, seed_value=args.seed)
+    print(f"Seeded {data['counts']} in {time.perf_counter() - t0:.1f}s")
+
+    port = free_port()
+    server, thread = start_server(app, port)
+    ctx = Context(f"http://127.0.0.1:{port}", data)
+
+    results = {}
+    try:
+        for name in [s.strip() for s in args.scenarios.split(",") if s.strip()]:
+            fn, share = SCENARIOS[name]
+            total = max(int(args.requests * share), 1)
+            warmup = max(int(args.warmup * share), 1)
+            print(f"Running {name} ({total} requests, concurrency {args.concurrency})...")
+            results[name] = run_scenario(name, fn, ctx, total, args.concurrency, warmup, args.seed)
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+
+    baseline = {}
+    if os.path.isfile(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    print()
+    print_table(results, baseline)
+
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "settings": {
+            "scale": args.scale,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+        },
+        "counts": data["counts"],
+        "scenarios": results,
+    }
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+
+    errored = [f"{name}: {r['errors']} errors (first: {r['first_error']})" for name, r in results.items() if r["errors"]]
+    regressions = compare(results, baseline, args.tolerance) if baseline else []
+    for line in errored + regressions:
+        print(f"REGRESSION {line}")
+
+    # numbers from another scale / load are not comparable
+    mismatch = baseline and baseline.get("settings") != report["settings"]
+    if not baseline:
+        print(f"\nNo baseline found at {args.baseline}; run with --save-baseline to create one.")
+    elif mismatch:
+        print(f"\nBaseline settings {baseline.get('settings')} differ from this run's {report['settings']}.")
+    if args.ci and (not baseline or mismatch):
+        print("FAIL nothing to compare against (--ci)")
+        return 1
+    return 1 if (errored or regressions) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,265 @@
+# backend/benchmarks/seed.py
+
+"""
+Seed a local database with realistic volumes of users, deals, documents,
+investments and profiles for the benchmark suite.
+"""
+
+import json
+import random
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import insert
+
+from app.models.cash_flow_model import CashFlow, InvestmentBalance, InvestorBalance
+from app.models.deal_interest_model import DealInterest
+from app.models.deal_model import Deal
+from app.models.document_access_model import DocumentAccess
+from app.models.document_model import Document
+from app.models.investment_model import Investment
+from app.models.profile_model import Profile
+from app.models.user_model import User
+from app.services.database import Base, engine
+from app.utils.auth_utils import get_password_hash
+
+from benchmarks.fakes import put_blob
+
+BENCH_PASSWORD = "benchmark-password"
+BLOB_CONTAINER = "documents"
+BLOB_URL = "https://fake.blob.example.com/documents"
+
+# volumes at scale=1.0
+VOLUMES = {
+    "users": 500,
+    "deals": 150,
+    "documents": 20000,
+    "investments": 8000,
+    "profiles": 700,
+    "interests": 2000,
+}
+
+DEAL_TYPES = [("REAL_ESTATE", "LAND"), ("REAL_ESTATE", "COMMERCIAL"), ("REAL_ESTATE", "MULTI_FAMILY"), ("PRE_IPO", None)]
+DEAL_STAGES = ["Sourcing", "Due Diligence", "Fundraising", "Closed"]
+DEAL_LOCATIONS = ["Texas", "Florida", "Arizona", "Georgia", "North Carolina", "Tennessee", "Ohio", "Colorado"]
+DOC_TYPES = ["LLC", "EIN", "VOID_CHECK", "TAX", "OTHER"]
+
+# a small valid PDF is enough; blobs are shared so seeding stays fast
+SAMPLE_PDF = (
+    b"%PDF-1.4\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n"
+    b"2 0 obj<</Type/Pages/Kids[]/Count 0>>endobj\ntrailer<</Root 1 0 R>>\n%%EOF\n"
+) + b" " * (180 * 1024)
+
+
+def _chunks(rows, size=2000):
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+def _bulk_insert(conn, model, rows):
+    for chunk in _chunks(rows):
+        conn.execute(insert(model), chunk)
+
+
+def seed(scale: float = 1.0, seed_value: int = 42) -> dict:
+    """Drop + recreate all tables and fill them. Returns ids the scenarios need."""
+    rnd = random.Random(seed_value)
+    n = {k: max(int(v * scale), 1) for k, v in VOLUMES.items()}
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    # one bcrypt hash for everyone: login still pays the verify cost per request
+    password_hash = get_password_hash(BENCH_PASSWORD)
+    now = datetime.utcnow()
+
+    users = [
+        {
+            "id": 1,
+            "first_name": "Bench",
+            "last_name": "Admin",
+            "username": "Bench Admin",
+            "email": "admin@bench.example.com",
+            "password_hash": password_hash,
+            "created_at": now,
+            "mfa_enabled": False,
+            "role": "Admin",
+        }
+    ]
+    for i in range(2, n["users"] + 1):
+        users.append(
+            {
+                "id": i,
+                "first_name": f"Investor{i}",
+                "last_name": "Bench",
+                "username": f"Investor{i} Bench",
+                "email": f"investor{i}@bench.example.com",
+                "password_hash": password_hash,
+                "created_at": now - timedelta(days=rnd.randint(0, 900)),
+                "mfa_enabled": False,
+                "role": "User",
+            }
+        )
+    investor_ids = [u["id"] for u in users[1:]]
+
+    # own generator: the rest of the seeded data stays the same as before deals had details
+    details_rnd = random.Random(seed_value + 1)
+    deals = []
+    for i in range(1, n["deals"] + 1):
+        deal_type, deal_subtype = rnd.choice(DEAL_TYPES)
+        deals.append(
+            {
+                "id": i,
+                "name": f"Bench Deal {i}",
+                "deal_type": deal_type,
+                "deal_subtype": deal_subtype,
+                "deal_stage": rnd.choice(DEAL_STAGES),
+                "sponsors": "Bench Sponsors LLC",
+                "close_date": now + timedelta(days=rnd.randint(-365, 365)),
+                "offering_size": float(rnd.randrange(1_000_000, 50_000_000, 250_000)),
+                "unit_price": float(rnd.choice([1000, 5000, 10000, 25000])),
+                "status": "PUBLISHED" if rnd.random() < 0.8 else "DRAFT",
+                "details_json": json.dumps({
+                    "location": details_rnd.choice(DEAL_LOCATIONS),
+                    "min_investment": details_rnd.choice([10000, 25000, 50000, 100000, 250000]),
+                    "target_irr": round(details_rnd.uniform(0.08, 0.25), 3),
+                }),
+                "created_at": now - timedelta(days=rnd.randint(0, 700)),
+            }
+        )
+
+    profiles = [
+        {
+            "id": i,
+            "entity_name": f"Bench Entity {i} LLC",
+            "jurisdiction": rnd.choice(["Texas", "Delaware", "California"]),
+            "tax_classification": rnd.choice(["S Corporation", "Partnership", None]),
+            "profile_type": rnd.choice(["LLC", "Corp", "Trust"]),
+            "contact_email": f"entity{i}@bench.example.com",
+            "contact_phone": None,
+            "user_id": investor_ids[(i - 1) % len(investor_ids)],
+            # each investor's first profile is their default (/api/profiles/me)
+            "default_user_id": investor_ids[i - 1] if i <= len(investor_ids) else None,
+        }
+        for i in range(1, n["profiles"] + 1)
+    ]
+
+    investments = []
+    for i in range(1, n["investments"] + 1):
+        invested = float(rnd.randrange(25_000, 2_000_000, 5_000))
+        investments.append(
+            {
+                "id": i,
+                "deal_name": f"Bench Deal {rnd.randint(1, n['deals'])}",
+                "investment_total": invested,
+                "distribution_total": round(invested * rnd.uniform(0, 1.6), 2),
+                "status": "Active" if rnd.random() < 0.7 else "Closed",
+                "close_date": date.today() - timedelta(days=rnd.randint(30, 2500)),
+                "uploaded_by_id": rnd.choice(investor_ids),
+            }
+        )
+
+    # ledger: one capital call at close + up to 3 distributions summing to distribution_total
+    cash_flows, investment_balances, investor_balances = [], [], {}
+    for inv in investments:
+        called = Decimal(str(inv["investment_total"])).quantize(Decimal("0.01"))
+        distributed = Decimal(str(inv["distribution_total"])).quantize(Decimal("0.01"))
+        flows = [("CAPITAL_CALL", called, inv["close_date"])]
+        parts = rnd.randint(1, 3) if distributed else 0
+        remaining = distributed
+        for p in range(parts):
+            amount = remaining if p == parts - 1 else (distributed / parts).quantize(Decimal("0.01"))
+            remaining -= amount
+            days = (date.today() - inv["close_date"]).days
+            flows.append(("DISTRIBUTION", amount, inv["close_date"] + timedelta(days=days * (p + 1) // (parts + 1))))
+        for flow_type, amount, flow_date in flows:
+            cash_flows.append({
+                "investment_id": inv["id"], "user_id": inv["uploaded_by_id"], "flow_type": flow_type,
+                "amount": amount, "flow_date": flow_date, "memo": None, "created_at": now,
+            })
+        last = max(f[2] for f in flows)
+        investment_balances.append({
+            "investment_id": inv["id"], "user_id": inv["uploaded_by_id"], "called_total": called,
+            "distributed_total": distributed, "entry_count": len(flows), "last_flow_date": last, "updated_at": now,
+        })
+        bal = investor_balances.setdefault(inv["uploaded_by_id"], {
+            "user_id": inv["uploaded_by_id"], "called_total": Decimal("0"), "distributed_total": Decimal("0"),
+            "entry_count": 0, "last_flow_date": last, "updated_at": now,
+        })
+        bal["called_total"] += called
+        bal["distributed_total"] += distributed
+        bal["entry_count"] += len(flows)
+        bal["last_flow_date"] = max(bal["last_flow_date"], last)
+
+    documents = []
+    for i in range(1, n["documents"] + 1):
+        admin_upload = rnd.random() < 0.6
+        recipient = rnd.choice(investor_ids)
+        name = f"bench_doc_{i}.pdf"
+        documents.append(
+            {
+                "id": i,
+                "name": name,
+                "label": f"Statement {i}",
+                "deal_name": f"Bench Deal {rnd.randint(1, n['deals'])}",
+                "profile_name": None,
+                "document_type": rnd.choice(DOC_TYPES),
+                "uploaded_by_role": "Admin" if admin_upload else "User",
+                "requirement_key": None,
+                "file_path": f"{BLOB_URL}/{name}",
+                "uploaded_at": now - timedelta(minutes=rnd.randint(0, 60 * 24 * 900)),
+                "uploaded_by_id": 1 if admin_upload else recipient,
+                "recipient_user_id": recipient if admin_upload else None,
+            }
+        )
+
+    document_access = []
+    for d in documents:
+        document_access.append(
+            {"user_id": d["uploaded_by_id"], "document_id": d["id"], "role": "OWNER", "granted_at": d["uploaded_at"]}
+        )
+        if d["recipient_user_id"] and d["recipient_user_id"] != d["uploaded_by_id"]:
+            document_access.append(
+                {"user_id": d["recipient_user_id"], "document_id": d["id"], "role": "RECIPIENT", "granted_at": d["uploaded_at"]}
+            )
+
+    interest_pairs = set()
+    while len(interest_pairs) < min(n["interests"], n["deals"] * len(investor_ids)):
+        interest_pairs.add((rnd.randint(1, n["deals"]), rnd.choice(investor_ids)))
+    interests = [
+        {"deal_id": d, "user_id": u, "status": "INTERESTED", "created_at": now}
+        for d, u in sorted(interest_pairs)
+    ]
+
+    with engine.begin() as conn:
+        _bulk_insert(conn, User, users)
+        _bulk_insert(conn, Deal, deals)
+        _bulk_insert(conn, Profile, profiles)
+        _bulk_insert(conn, Investment, investments)
+        _bulk_insert(conn, CashFlow, cash_flows)
+        _bulk_insert(conn, InvestmentBalance, investment_balances)
+        _bulk_insert(conn, InvestorBalance, list(investor_balances.values()))
+        _bulk_insert(conn, Document, documents)
+        _bulk_insert(conn, DocumentAccess, document_access)
+        _bulk_insert(conn, DealInterest, interests)
+
+    for d in documents:
+        put_blob(BLOB_CONTAINER, d["name"], SAMPLE_PDF)
+
+    owned = {}
+    for d in documents:
+        owner = d["recipient_user_id"] or d["uploaded_by_id"]
+        owned.setdefault(owner, []).append(d["id"])
+
+    return {
+        "counts": {k: len(v) for k, v in (
+            ("users", users), ("deals", deals), ("profiles", profiles),
+            ("investments", investments), ("cash_flows", cash_flows), ("documents", documents),
+            ("interests", interests),
+        )},
+        "admin_email": users[0]["email"],
+        "investor_emails": [u["email"] for u in users[1:]],
+        "published_deal_ids": [d["id"] for d in deals if d["status"] == "PUBLISHED"],
+        "documents_by_user": owned,
+        "user_ids_by_email": {u["email"]: u["id"] for u in users},
+    }
@@ -1,8 +1,13 @@
+import argparse
+import hashlib
 import os
 import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 import pyodbc
-from azure.storage.blob import BlobServiceClient
+from azure.core.exceptions import ResourceExistsError
+from azure.storage.blob import BlobServiceClient, ContentSettings
 
 # ==========================
 # CONFIG
@@ -19,6 +24,11 @@ AZURE_SQL_PASSWORD = "Gp@dmin12345!"
 AZURE_BLOB_CONNECTION_STRING = "DefaultEndpointsProtocol=https;AccountName=gpportal;AccountKey=fOm3SsRNf0NdU3WJmWtxyX6q2Q5+52vCg3AnAqkH92iJm+8lfksryJgQC54naB3sK1KYbdusKAQH+ASt1Y5zvQ==;EndpointSuffix=core.windows.net"
 AZURE_BLOB_CONTAINER = "documents"
 
+CHUNK_SIZE = 5000            # rows per fetchmany / executemany batch (and per checkpoint)
+PARALLEL_TABLES = 4          # tables copied concurrently
+CHECKPOINT_TABLE = "_migrate_checkpoints"
+UPLOAD_WORKERS = 8           # PDFs uploaded concurrently
+
 
 # ==========================
 # HELPER FUNCTIONS
@@ -127,57 +137,196 @@ def connect_azure_sql():
 
 
 # ==========================
-# MIGRATE TABLES (NO GO)
+# MIGRATE TABLES (STREAMING, PARALLEL, RESUMABLE)
+#  - each table is read with fetchmany in rowid order and inserted in
+#    CHUNK_SIZE batches with fast_executemany; memory stays at ~1 batch
+#  - the generated schema has no foreign keys, so tables are independent
+#    and PARALLEL_TABLES of them are copied at once (one connection pair each)
+#  - progress lives in dbo.[_migrate_checkpoints] and is updated in the same
+#    transaction as each batch, so a resumed run never skips or repeats rows
 # ==========================
 
-def migrate_table(sqlite_conn, sql_conn, table_name, schema_info):
-    print(f"\n=== Migrating table: {table_name} ===")
-    cursor_sql = sql_conn.cursor()
+def ensure_checkpoint_table(sql_conn):
+    sql_conn.cursor().execute(
+        f"IF OBJECT_ID('dbo.[{CHECKPOINT_TABLE}]', 'U') IS NULL "
+        f"CREATE TABLE dbo.[{CHECKPOINT_TABLE}] ("
+        "[table_name] NVARCHAR(255) NOT NULL PRIMARY KEY, "
+        "[last_rowid] BIGINT NOT NULL, "
+        "[rows_copied] BIGINT NOT NULL, "
+        "[status] NVARCHAR(20) NOT NULL, "
+        "[updated_at] DATETIME NOT NULL);"
+    )
+    sql_conn.commit()
+
+
+def load_checkpoints(sql_conn):
+    rows = sql_conn.cursor().execute(
+        f"SELECT table_name, last_rowid, rows_copied, status FROM dbo.[{CHECKPOINT_TABLE}];"
+    ).fetchall()
+    return {name: {"last_rowid": last, "rows_copied": copied, "status": status} for name, last, copied, status in rows}
 
+
+def prepare_table(sql_conn, table_name, schema_info, checkpoint):
+    """(Re)create the target table unless a previous run already started copying it."""
+    if checkpoint is not None:
+        return
+
+    cursor_sql = sql_conn.cursor()
     create_sql_clean = "\n".join(
         line for line in schema_info["create"].splitlines()
         if "GO" not in line.upper()
     )
-
     cursor_sql.execute(create_sql_clean)
+    cursor_sql.execute(
+        f"INSERT INTO dbo.[{CHECKPOINT_TABLE}] (table_name, last_rowid, rows_copied, status, updated_at) "
+        "VALUES (?, 0, 0, 'copying', ?);",
+        (table_name, datetime.utcnow()),
+    )
+    sql_conn.commit()
 
-    sqlite_cur = sqlite_conn.cursor()
-    rows = sqlite_cur.execute(f"SELECT * FROM {table_name};").fetchall()
-    col_names = schema_info["columns"]
 
-    if not rows:
-        print("No rows to migrate.")
-        sql_conn.commit()
-        return
+def migrate_table(table_name, schema_info, checkpoint):
+    """Copy one table from checkpoint["last_rowid"] on. Runs in a worker thread with its own connections."""
+    sqlite_conn = sqlite3.connect(SQLITE_DB_PATH)
+    sql_conn = connect_azure_sql()
+    try:
+        cursor_sql = sql_conn.cursor()
+        cursor_sql.fast_executemany = True
+
+        col_names = schema_info["columns"]
+        placeholders = ", ".join("?" for _ in col_names)
+        cols_joined = ", ".join(f"[{c}]" for c in col_names)
+        insert_sql = f"INSERT INTO dbo.[{table_name}] ({cols_joined}) VALUES ({placeholders})"
+        checkpoint_sql = (
+            f"UPDATE dbo.[{CHECKPOINT_TABLE}] SET last_rowid = ?, rows_copied = ?, status = ?, updated_at = ? "
+            "WHERE table_name = ?;"
+        )
+
+        identity_col = schema_info.get("identity_col")
+        if identity_col:
+            # session-scoped; each worker has its own connection
+            cursor_sql.execute(f"SET IDENTITY_INSERT dbo.[{table_name}] ON;")
+
+        last_rowid = checkpoint["last_rowid"]
+        copied = checkpoint["rows_copied"]
+        if last_rowid:
+            print(f"[{table_name}] resuming after rowid {last_rowid} ({copied} rows already copied)")
+
+        sqlite_cur = sqlite_conn.cursor()
+        sqlite_cur.execute(
+            f"SELECT rowid, {', '.join(f'[{c}]' for c in col_names)} FROM [{table_name}] "
+            "WHERE rowid > ? ORDER BY rowid;",
+            (last_rowid,),
+        )
 
-    placeholders = ", ".join("?" for _ in col_names)
-    cols_joined = ", ".join(f"[{c}]" for c in col_names)
-    insert_sql = f"INSERT INTO dbo.[{table_name}] ({cols_joined}) VALUES ({placeholders})"
+        started = time.perf_counter()
+        copied_now = 0
+        while True:
+            batch = sqlite_cur.fetchmany(CHUNK_SIZE)
+            if not batch:
+                break
+
+            last_rowid = batch[-1][0]
+            cursor_sql.executemany(
+                insert_sql,
+                [tuple(normalize_datetime(val) for val in row[1:]) for row in batch],
+            )
+            copied += len(batch)
+            copied_now += len(batch)
+            cursor_sql.execute(checkpoint_sql, (last_rowid, copied, "copying", datetime.utcnow(), table_name))
+            sql_conn.commit()
+
+            elapsed = time.perf_counter() - started
+            print(f"[{table_name}] {copied} rows ({copied_now / elapsed:,.0f} rows/s)")
+
+        if identity_col:
+            cursor_sql.execute(f"SET IDENTITY_INSERT dbo.[{table_name}] OFF;")
+        cursor_sql.execute(checkpoint_sql, (last_rowid, copied, "done", datetime.utcnow(), table_name))
+        sql_conn.commit()
 
-    identity_col = schema_info.get("identity_col")
-    if identity_col:
-        cursor_sql.execute(f"SET IDENTITY_INSERT dbo.[{table_name}] ON;")
+        elapsed = time.perf_counter() - started
+        return {"table": table_name, "rows": copied_now, "seconds": elapsed}
+    finally:
+        sqlite_conn.close()
+        sql_conn.close()
 
-    processed_rows = []
-    for row in rows:
-        row = [normalize_datetime(val) for val in row]
-        processed_rows.append(tuple(row))
 
-    cursor_sql.fast_executemany = True
-    cursor_sql.executemany(insert_sql, processed_rows)
+def migrate_tables(schema_map, sql_conn, workers=PARALLEL_TABLES, fresh=False):
+    ensure_checkpoint_table(sql_conn)
+    if fresh:
+        sql_conn.cursor().execute(f"DELETE FROM dbo.[{CHECKPOINT_TABLE}];")
+        sql_conn.commit()
+    checkpoints = load_checkpoints(sql_conn)
 
-    if identity_col:
-        cursor_sql.execute(f"SET IDENTITY_INSERT dbo.[{table_name}] OFF;")
+    # biggest tables first so the slowest one isn't started last
+    sqlite_conn = sqlite3.connect(SQLITE_DB_PATH)
+    sizes = {
+        name: sqlite_conn.execute(f"SELECT COUNT(*) FROM [{name}];").fetchone()[0]
+        for name in schema_map
+    }
+    sqlite_conn.close()
 
-    sql_conn.commit()
-    print("Done.")
+    pending = []
+    for name in sorted(schema_map, key=lambda n: sizes[n], reverse=True):
+        checkpoint = checkpoints.get(name)
+        if checkpoint and checkpoint["status"] == "done":
+            print(f"[{name}] already migrated ({checkpoint['rows_copied']} rows), skipping")
+            continue
+        prepare_table(sql_conn, name, schema_map[name], checkpoint)
+        pending.append((name, checkpoint or {"last_rowid": 0, "rows_copied": 0}))
+
+    print(f"\n=== Migrating {len(pending)} tables, {workers} at a time ===")
+    started = time.perf_counter()
+    results = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(migrate_table, name, schema_map[name], cp): name for name, cp in pending}
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            rate = result["rows"] / result["seconds"] if result["seconds"] else 0
+            print(f"[{result['table']}] done: {result['rows']} rows in {result['seconds']:.1f}s ({rate:,.0f} rows/s)")
+
+    elapsed = time.perf_counter() - started
+    total = sum(r["rows"] for r in results)
+    print(f"\nCopied {total} rows in {elapsed:.1f}s ({total / elapsed if elapsed else 0:,.0f} rows/s overall)")
+    return results
 
 
 # ==========================
-# FIXED PDF UPLOAD (NO DUPLICATE UPLOADS/)
+# PDF UPLOAD (CONCURRENT, HASH-SKIPPING)
+#  - UPLOAD_WORKERS files in flight at once
+#  - blobs whose Content-MD5 already matches the local file are not re-sent
+#  - documents.file_path is updated with one executemany, only where it changed
 # ==========================
 
-def upload_pdfs_and_update_documents(sqlite_conn, sql_conn):
+def file_md5(path):
+    digest = hashlib.md5()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.digest()
+
+
+def upload_one(container_client, remote_md5, doc_id, local_path, blob_name):
+    """Upload one file unless the remote copy is identical. Returns (doc_id, blob_url, status, bytes)."""
+    blob_url = f"{container_client.url}/{blob_name}"
+    md5 = file_md5(local_path)
+    if remote_md5.get(blob_name) == md5:
+        return doc_id, blob_url, "skipped", 0
+
+    size = os.path.getsize(local_path)
+    with open(local_path, "rb") as f:
+        # set Content-MD5 ourselves: the service only computes it for single-shot uploads
+        container_client.upload_blob(
+            blob_name,
+            f,
+            overwrite=True,
+            content_settings=ContentSettings(content_type="application/pdf", content_md5=bytearray(md5)),
+        )
+    return doc_id, blob_url, "uploaded", size
+
+
+def upload_pdfs_and_update_documents(sqlite_conn, sql_conn, workers=UPLOAD_WORKERS):
     print("\n=== Uploading PDFs to Blob Storage ===")
 
     sqlite_cur = sqlite_conn.cursor()
@@ -192,11 +341,22 @@ def upload_pdfs_and_update_documents(sqlite_conn, sql_conn):
 
     try:
         container_client.create_container()
-    except:
+    except ResourceExistsError:
         pass
 
+    # one paged listing instead of a HEAD per file
+    remote_md5 = {
+        blob.name: bytes(blob.content_settings.content_md5)
+        for blob in container_client.list_blobs()
+        if blob.content_settings.content_md5
+    }
+    print(f"{len(remote_md5)} blobs already in '{AZURE_BLOB_CONTAINER}'")
+
     sql_cur = sql_conn.cursor()
+    current_paths = dict(sql_cur.execute("SELECT id, file_path FROM dbo.[documents];").fetchall())
 
+    jobs = []
+    missing = 0
     for doc_id, file_path in rows:
         if not file_path:
             continue
@@ -209,34 +369,74 @@ def upload_pdfs_and_update_documents(sqlite_conn, sql_conn):
 
         local_path = os.path.join(LOCAL_DOCS_ROOT, clean_path)
 
-        print(f"Looking for file: {local_path}")
-
         if not os.path.isfile(local_path):
             print(f"Missing file: {local_path}")
+            missing += 1
             continue
 
-        blob_name = os.path.basename(clean_path)
-
-        print(f"Uploading {blob_name}...")
-        with open(local_path, "rb") as f:
-            container_client.upload_blob(blob_name, f, overwrite=True)
+        jobs.append((doc_id, local_path, os.path.basename(clean_path)))
 
-        blob_url = f"{container_client.url}/{blob_name}"
-
-        sql_cur.execute(
-            "UPDATE dbo.[documents] SET file_path = ? WHERE id = ?;",
-            (blob_url, doc_id),
-        )
+    print(f"Checking {len(jobs)} files with {workers} workers...")
+    started = time.perf_counter()
+    counts = {"uploaded": 0, "skipped": 0, "failed": 0}
+    bytes_sent = 0
+    updates = []
 
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(upload_one, container_client, remote_md5, doc_id, local_path, blob_name): local_path
+            for doc_id, local_path, blob_name in jobs
+        }
+        for future in as_completed(futures):
+            try:
+                doc_id, blob_url, status, size = future.result()
+            except Exception as e:
+                # keep going; a re-run retries only what is still missing or different
+                print(f"Upload failed: {futures[future]}: {e}")
+                counts["failed"] += 1
+                continue
+
+            counts[status] += 1
+            bytes_sent += size
+            if status == "uploaded":
+                print(f"Uploaded {os.path.basename(futures[future])} ({size / 1e6:.1f} MB)")
+            if current_paths.get(doc_id) != blob_url:
+                updates.append((blob_url, doc_id))
+
+    if updates:
+        sql_cur.fast_executemany = True
+        sql_cur.executemany("UPDATE dbo.[documents] SET file_path = ? WHERE id = ?;", updates)
     sql_conn.commit()
-    print("\nPDF upload completed.\n")
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"\nPDF upload completed in {elapsed:.1f}s: "
+        f"{counts['uploaded']} uploaded ({bytes_sent / 1e6:,.1f} MB, "
+        f"{bytes_sent / 1e6 / elapsed if elapsed else 0:,.1f} MB/s), "
+        f"{counts['skipped']} unchanged, {missing} missing locally, {counts['failed']} failed; "
+        f"{len(updates)} document paths updated.\n"
+    )
 
 
 # ==========================
 # MAIN
 # ==========================
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Copy the SQLite portal database to Azure SQL.")
+    parser.add_argument("--fresh", action="store_true", help="ignore checkpoints and recreate every table")
+    parser.add_argument("--tables", help="comma-separated subset of tables to migrate")
+    parser.add_argument("--workers", type=int, default=PARALLEL_TABLES, help="tables copied in parallel")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="rows per fetchmany / executemany")
+    parser.add_argument("--upload-workers", type=int, default=UPLOAD_WORKERS, help="PDF uploads in flight")
+    return parser.parse_args()
+
+
 def main():
+    global CHUNK_SIZE
+    args = parse_args()
+    CHUNK_SIZE = args.chunk_size
+
     if not os.path.isfile(SQLITE_DB_PATH):
         raise FileNotFoundError(f"SQLite DB not found: {SQLITE_DB_PATH}")
 
@@ -244,15 +444,17 @@ def main():
 
     print("Building schema from SQLite...")
     schema_map = build_sqlserver_schema(sqlite_conn)
+    if args.tables:
+        wanted = {t.strip() for t in args.tables.split(",") if t.strip()}
+        schema_map = {name: info for name, info in schema_map.items() if name in wanted}
 
     print("Connecting to Azure SQL...")
     sql_conn = connect_azure_sql()
 
-    for table_name, info in schema_map.items():
-        migrate_table(sqlite_conn, sql_conn, table_name, info)
+    migrate_tables(schema_map, sql_conn, workers=args.workers, fresh=args.fresh)
 
     print("\nUploading documents...")
-    upload_pdfs_and_update_documents(sqlite_conn, sql_conn)
+    upload_pdfs_and_update_documents(sqlite_conn, sql_conn, workers=args.upload_workers)
 
     sqlite_conn.close()
     sql_conn.close()
@@ -0,0 +1,45 @@
+-- =========================================================
+-- 002: document_access table (user_id, document_id, role)
+--
+--   /api/documents and the user-view / user-download permission checks
+--   become one clustered-index seek on user_id instead of an
+--   OR(uploaded_by_id, recipient_user_id) over documents.
+--
+-- Idempotent; backfills OWNER rows from documents.uploaded_by_id and
+-- RECIPIENT rows from documents.recipient_user_id.
+-- =========================================================
+
+IF OBJECT_ID('dbo.document_access', 'U') IS NULL
+    CREATE TABLE dbo.document_access (
+        user_id      INT          NOT NULL,
+        document_id  INT          NOT NULL,
+        role         NVARCHAR(20) NOT NULL,
+        granted_at   DATETIME     NULL,
+        CONSTRAINT pk_document_access PRIMARY KEY CLUSTERED (user_id, document_id),
+        CONSTRAINT fk_document_access_user FOREIGN KEY (user_id) REFERENCES dbo.users (id),
+        CONSTRAINT fk_document_access_document FOREIGN KEY (document_id) REFERENCES dbo.documents (id)
+    );
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_document_access_document_id' AND object_id = OBJECT_ID('dbo.document_access'))
+    CREATE NONCLUSTERED INDEX ix_document_access_document_id ON dbo.document_access (document_id);
+GO
+
+INSERT INTO dbo.document_access (user_id, document_id, role, granted_at)
+SELECT d.uploaded_by_id, d.id, 'OWNER', d.uploaded_at
+FROM dbo.documents d
+WHERE NOT EXISTS (
+    SELECT 1 FROM dbo.document_access a
+    WHERE a.user_id = d.uploaded_by_id AND a.document_id = d.id
+);
+GO
+
+INSERT INTO dbo.document_access (user_id, document_id, role, granted_at)
+SELECT d.recipient_user_id, d.id, 'RECIPIENT', d.uploaded_at
+FROM dbo.documents d
+WHERE d.recipient_user_id IS NOT NULL
+  AND NOT EXISTS (
+    SELECT 1 FROM dbo.document_access a
+    WHERE a.user_id = d.recipient_user_id AND a.document_id = d.id
+);
+GO
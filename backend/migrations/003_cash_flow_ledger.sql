@@ -0,0 +1,114 @@
+-- =========================================================
+-- 003: cash-flow ledger + running balances
+--
+--   cash_flows           append-only, dated CAPITAL_CALL / DISTRIBUTION rows
+--   investment_balances  running totals per investment
+--   investor_balances    running totals per investor
+--
+-- Idempotent; investments without ledger entries get opening entries
+-- (investment_total as a capital call, distribution_total as a
+-- distribution, both on close_date) and the balances are rebuilt from
+-- the ledger for anyone that doesn't have a balance row yet.
+-- =========================================================
+
+IF OBJECT_ID('dbo.cash_flows', 'U') IS NULL
+    CREATE TABLE dbo.cash_flows (
+        id             INT IDENTITY(1,1) NOT NULL,
+        investment_id  INT            NOT NULL,
+        user_id        INT            NOT NULL,
+        flow_type      NVARCHAR(20)   NOT NULL,
+        amount         DECIMAL(18,2)  NOT NULL,
+        flow_date      DATE           NOT NULL,
+        memo           NVARCHAR(255)  NULL,
+        created_at     DATETIME       NULL,
+        created_by_id  INT            NULL,
+        CONSTRAINT pk_cash_flows PRIMARY KEY CLUSTERED (id),
+        CONSTRAINT fk_cash_flows_investment FOREIGN KEY (investment_id) REFERENCES dbo.investments (id),
+        CONSTRAINT fk_cash_flows_user FOREIGN KEY (user_id) REFERENCES dbo.users (id),
+        CONSTRAINT fk_cash_flows_created_by FOREIGN KEY (created_by_id) REFERENCES dbo.users (id)
+    );
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_cash_flows_investment_date' AND object_id = OBJECT_ID('dbo.cash_flows'))
+    CREATE NONCLUSTERED INDEX ix_cash_flows_investment_date
+        ON dbo.cash_flows (investment_id, flow_date)
+        INCLUDE (flow_type, amount);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_cash_flows_user_date' AND object_id = OBJECT_ID('dbo.cash_flows'))
+    CREATE NONCLUSTERED INDEX ix_cash_flows_user_date
+        ON dbo.cash_flows (user_id, flow_date)
+        INCLUDE (flow_type, amount);
+GO
+
+IF OBJECT_ID('dbo.investment_balances', 'U') IS NULL
+    CREATE TABLE dbo.investment_balances (
+        investment_id      INT            NOT NULL,
+        user_id            INT            NOT NULL,
+        called_total       DECIMAL(18,2)  NOT NULL DEFAULT 0,
+        distributed_total  DECIMAL(18,2)  NOT NULL DEFAULT 0,
+        entry_count        INT            NOT NULL DEFAULT 0,
+        last_flow_date     DATE           NULL,
+        updated_at         DATETIME       NULL,
+        CONSTRAINT pk_investment_balances PRIMARY KEY CLUSTERED (investment_id),
+        CONSTRAINT fk_investment_balances_investment FOREIGN KEY (investment_id) REFERENCES dbo.investments (id),
+        CONSTRAINT fk_investment_balances_user FOREIGN KEY (user_id) REFERENCES dbo.users (id)
+    );
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_investment_balances_user_id' AND object_id = OBJECT_ID('dbo.investment_balances'))
+    CREATE NONCLUSTERED INDEX ix_investment_balances_user_id ON dbo.investment_balances (user_id);
+GO
+
+IF OBJECT_ID('dbo.investor_balances', 'U') IS NULL
+    CREATE TABLE dbo.investor_balances (
+        user_id            INT            NOT NULL,
+        called_total       DECIMAL(18,2)  NOT NULL DEFAULT 0,
+        distributed_total  DECIMAL(18,2)  NOT NULL DEFAULT 0,
+        entry_count        INT            NOT NULL DEFAULT 0,
+        last_flow_date     DATE           NULL,
+        updated_at         DATETIME       NULL,
+        CONSTRAINT pk_investor_balances PRIMARY KEY CLUSTERED (user_id),
+        CONSTRAINT fk_investor_balances_user FOREIGN KEY (user_id) REFERENCES dbo.users (id)
+    );
+GO
+
+-- opening entries for positions that predate the ledger
+INSERT INTO dbo.cash_flows (investment_id, user_id, flow_type, amount, flow_date, memo, created_at)
+SELECT i.id, i.uploaded_by_id, 'CAPITAL_CALL', CAST(i.investment_total AS DECIMAL(18,2)),
+       COALESCE(i.close_date, CAST(GETUTCDATE() AS DATE)), 'Opening balance (migrated)', GETUTCDATE()
+FROM dbo.investments i
+WHERE i.investment_total <> 0
+  AND NOT EXISTS (SELECT 1 FROM dbo.cash_flows c WHERE c.investment_id = i.id);
+GO
+
+INSERT INTO dbo.cash_flows (investment_id, user_id, flow_type, amount, flow_date, memo, created_at)
+SELECT i.id, i.uploaded_by_id, 'DISTRIBUTION', CAST(i.distribution_total AS DECIMAL(18,2)),
+       COALESCE(i.close_date, CAST(GETUTCDATE() AS DATE)), 'Opening balance (migrated)', GETUTCDATE()
+FROM dbo.investments i
+WHERE i.distribution_total <> 0
+  AND NOT EXISTS (
+    SELECT 1 FROM dbo.cash_flows c
+    WHERE c.investment_id = i.id AND c.flow_type = 'DISTRIBUTION'
+);
+GO
+
+INSERT INTO dbo.investment_balances (investment_id, user_id, called_total, distributed_total, entry_count, last_flow_date, updated_at)
+SELECT c.investment_id, MIN(c.user_id),
+       SUM(CASE WHEN c.flow_type = 'CAPITAL_CALL' THEN c.amount ELSE 0 END),
+       SUM(CASE WHEN c.flow_type = 'DISTRIBUTION' THEN c.amount ELSE 0 END),
+       COUNT(*), MAX(c.flow_date), GETUTCDATE()
+FROM dbo.cash_flows c
+WHERE NOT EXISTS (SELECT 1 FROM dbo.investment_balances b WHERE b.investment_id = c.investment_id)
+GROUP BY c.investment_id;
+GO
+
+INSERT INTO dbo.investor_balances (user_id, called_total, distributed_total, entry_count, last_flow_date, updated_at)
+SELECT c.user_id,
+       SUM(CASE WHEN c.flow_type = 'CAPITAL_CALL' THEN c.amount ELSE 0 END),
+       SUM(CASE WHEN c.flow_type = 'DISTRIBUTION' THEN c.amount ELSE 0 END),
+       COUNT(*), MAX(c.flow_date), GETUTCDATE()
+FROM dbo.cash_flows c
+WHERE NOT EXISTS (SELECT 1 FROM dbo.investor_balances b WHERE b.user_id = c.user_id)
+GROUP BY c.user_id;
+GO
@@ -0,0 +1,27 @@
+-- =========================================================
+-- 004: profiles.default_user_id (one default profile per user)
+--
+--   /api/profiles/me reads the row with default_user_id = user_id and
+--   creates it with a single MERGE when missing. The filtered unique
+--   index makes two concurrent first loads unable to create two.
+--
+-- Idempotent; backfills the lowest-id profile of each user as default.
+-- =========================================================
+
+IF COL_LENGTH('dbo.profiles', 'default_user_id') IS NULL
+    ALTER TABLE dbo.profiles ADD default_user_id INT NULL
+        CONSTRAINT fk_profiles_default_user FOREIGN KEY REFERENCES dbo.users (id);
+GO
+
+UPDATE p
+SET p.default_user_id = p.user_id
+FROM dbo.profiles p
+WHERE p.id = (SELECT MIN(p2.id) FROM dbo.profiles p2 WHERE p2.user_id = p.user_id)
+  AND NOT EXISTS (SELECT 1 FROM dbo.profiles d WHERE d.default_user_id = p.user_id);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ux_profiles_default_user_id' AND object_id = OBJECT_ID('dbo.profiles'))
+    CREATE UNIQUE NONCLUSTERED INDEX ux_profiles_default_user_id
+        ON dbo.profiles (default_user_id)
+        WHERE default_user_id IS NOT NULL;
+GO
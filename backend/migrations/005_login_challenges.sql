@@ -0,0 +1,29 @@
+-- =========================================================
+-- 005: login_challenges (email OTPs out of the users table)
+--
+--   login-init / login-verify-otp no longer write users.email_otp_code /
+--   email_otp_expiry; challenges live here as HMACs with an expiry.
+--   Expired rows are purged by the API (see services/challenge_store.py).
+--
+-- Idempotent; clears the now-unused OTP columns on users.
+-- =========================================================
+
+IF OBJECT_ID('dbo.login_challenges', 'U') IS NULL
+    CREATE TABLE dbo.login_challenges (
+        email       NVARCHAR(255) NOT NULL,
+        code_hash   NVARCHAR(64)  NOT NULL,
+        expires_at  DATETIME      NOT NULL,
+        attempts    INT           NOT NULL DEFAULT 0,
+        created_at  DATETIME      NULL,
+        CONSTRAINT pk_login_challenges PRIMARY KEY CLUSTERED (email)
+    );
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_login_challenges_expires_at' AND object_id = OBJECT_ID('dbo.login_challenges'))
+    CREATE NONCLUSTERED INDEX ix_login_challenges_expires_at ON dbo.login_challenges (expires_at);
+GO
+
+UPDATE dbo.users
+SET email_otp_code = NULL, email_otp_expiry = NULL
+WHERE email_otp_code IS NOT NULL OR email_otp_expiry IS NOT NULL;
+GO
@@ -0,0 +1,39 @@
+-- =========================================================
+-- 006: refresh_tokens (rotating, hashed, revocable)
+--
+--   POST /api/auth/refresh looks a token up by token_hash (unique index)
+--   and rotates it within its family; logout revokes the family.
+--
+-- Idempotent.
+-- =========================================================
+
+IF OBJECT_ID('dbo.refresh_tokens', 'U') IS NULL
+    CREATE TABLE dbo.refresh_tokens (
+        id          INT IDENTITY(1,1) NOT NULL,
+        user_id     INT           NOT NULL,
+        token_hash  NVARCHAR(64)  NOT NULL,
+        family_id   NVARCHAR(32)  NOT NULL,
+        created_at  DATETIME      NOT NULL,
+        expires_at  DATETIME      NOT NULL,
+        used_at     DATETIME      NULL,
+        revoked_at  DATETIME      NULL,
+        CONSTRAINT pk_refresh_tokens PRIMARY KEY CLUSTERED (id),
+        CONSTRAINT fk_refresh_tokens_user FOREIGN KEY (user_id) REFERENCES dbo.users (id)
+    );
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_refresh_tokens_token_hash' AND object_id = OBJECT_ID('dbo.refresh_tokens'))
+    CREATE UNIQUE NONCLUSTERED INDEX ix_refresh_tokens_token_hash ON dbo.refresh_tokens (token_hash);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_refresh_tokens_family_id' AND object_id = OBJECT_ID('dbo.refresh_tokens'))
+    CREATE NONCLUSTERED INDEX ix_refresh_tokens_family_id ON dbo.refresh_tokens (family_id);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_refresh_tokens_user_id' AND object_id = OBJECT_ID('dbo.refresh_tokens'))
+    CREATE NONCLUSTERED INDEX ix_refresh_tokens_user_id ON dbo.refresh_tokens (user_id);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_refresh_tokens_expires_at' AND object_id = OBJECT_ID('dbo.refresh_tokens'))
+    CREATE NONCLUSTERED INDEX ix_refresh_tokens_expires_at ON dbo.refresh_tokens (expires_at);
+GO
@@ -0,0 +1,34 @@
+-- =========================================================
+-- 007: outbox_events (transactional outbox for side effects)
+--
+--   Rows are written in the same transaction as the business change and
+--   processed by the in-process dispatcher (app/services/outbox.py).
+--   The claim query seeks ix_outbox_events_status_available.
+--
+-- Idempotent.
+-- =========================================================
+
+IF OBJECT_ID('dbo.outbox_events', 'U') IS NULL
+    CREATE TABLE dbo.outbox_events (
+        id              INT IDENTITY(1,1) NOT NULL,
+        event_type      NVARCHAR(100) NOT NULL,
+        aggregate_type  NVARCHAR(50)  NULL,
+        aggregate_id    INT           NULL,
+        payload         NVARCHAR(MAX) NULL,
+        sensitive       BIT           NOT NULL CONSTRAINT df_outbox_events_sensitive DEFAULT 0,
+        status          NVARCHAR(20)  NOT NULL CONSTRAINT df_outbox_events_status DEFAULT 'PENDING',
+        attempts        INT           NOT NULL CONSTRAINT df_outbox_events_attempts DEFAULT 0,
+        available_at    DATETIME      NOT NULL,
+        locked_by       NVARCHAR(64)  NULL,
+        locked_until    DATETIME      NULL,
+        last_error      NVARCHAR(500) NULL,
+        created_at      DATETIME      NOT NULL,
+        processed_at    DATETIME      NULL,
+        CONSTRAINT pk_outbox_events PRIMARY KEY CLUSTERED (id)
+    );
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_outbox_events_status_available' AND object_id = OBJECT_ID('dbo.outbox_events'))
+    CREATE NONCLUSTERED INDEX ix_outbox_events_status_available
+        ON dbo.outbox_events (status, available_at, id);
+GO
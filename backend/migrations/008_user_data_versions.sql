@@ -0,0 +1,21 @@
+-- =========================================================
+-- 008: user_data_versions (per-user ETag versions)
+--
+--   One row per user, bumped by every write that changes the user's
+--   documents / investments / balances / profiles
+--   (app/services/data_versions.py). Conditional GETs read it by
+--   primary key and answer 304 without touching the data tables.
+--   Users without a row are at version 0.
+--
+-- Idempotent.
+-- =========================================================
+
+IF OBJECT_ID('dbo.user_data_versions', 'U') IS NULL
+    CREATE TABLE dbo.user_data_versions (
+        user_id     INT      NOT NULL,
+        version     BIGINT   NOT NULL CONSTRAINT df_user_data_versions_version DEFAULT 0,
+        updated_at  DATETIME NOT NULL,
+        CONSTRAINT pk_user_data_versions PRIMARY KEY CLUSTERED (user_id),
+        CONSTRAINT fk_user_data_versions_user FOREIGN KEY (user_id) REFERENCES dbo.users (id)
+    );
+GO
@@ -0,0 +1,136 @@
+-- =========================================================
+-- 009: structured deal attributes for /api/deals/search
+--
+--   location, min_investment and target_irr are PERSISTED computed
+--   columns read out of deals.details_json, so SQL Server keeps them in
+--   sync on every write and they can be indexed. Invalid JSON, a missing
+--   key or a non-numeric amount gives NULL (never a failed write).
+--
+--   facet counts (GROUP BY type/subtype/stage/location) -> ix_deals_status_facets
+--   close date range / sort                             -> ix_deals_status_close_date
+--   minimum investment filter                           -> ix_deals_status_min_investment
+--
+-- Idempotent; safe to re-run. New databases get the same columns and
+-- indexes from Base.metadata.create_all (see app/models/deal_model.py).
+-- migrate_portal.py copies deals from SQLite without generated columns:
+-- run this again after a migration.
+--
+--   sqlcmd -S gpportalserver.database.windows.net -d gp_portal -U gpadmin -i 009_deal_facets.sql
+-- =========================================================
+
+-- ---------------------------------------------------------
+-- deal_type / deal_subtype / deal_stage: columns migrated as
+-- NVARCHAR(MAX) cannot be index keys. They are INCLUDE columns of
+-- ix_deals_status_created_at (001), which blocks ALTER COLUMN: drop it
+-- first, recreate it (same definition) once the types are fixed.
+-- Values longer than the new sizes would make the ALTERs fail after the
+-- index is gone: list them and change nothing until they are fixed.
+-- ---------------------------------------------------------
+IF EXISTS (
+    SELECT 1 FROM sys.columns
+    WHERE object_id = OBJECT_ID('dbo.deals')
+      AND name IN ('deal_type', 'deal_subtype', 'deal_stage') AND max_length = -1
+)
+BEGIN
+    IF EXISTS (SELECT 1 FROM dbo.deals WHERE LEN(deal_type) > 50 OR LEN(deal_subtype) > 50 OR LEN(deal_stage) > 100)
+    BEGIN
+        PRINT 'deals has deal_type/deal_subtype over 50 or deal_stage over 100 characters: fix these rows and re-run';
+        SELECT id, deal_type, deal_subtype, deal_stage FROM dbo.deals
+        WHERE LEN(deal_type) > 50 OR LEN(deal_subtype) > 50 OR LEN(deal_stage) > 100;
+    END
+    ELSE IF EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_deals_status_created_at' AND object_id = OBJECT_ID('dbo.deals'))
+        DROP INDEX ix_deals_status_created_at ON dbo.deals;
+END
+GO
+
+-- only REAL_ESTATE deals have a subtype (see create_deal), so those NULLs can be filled in;
+-- the rest are left for a person to classify (deal_type then stays nullable, see below)
+UPDATE dbo.deals SET deal_type = 'REAL_ESTATE' WHERE deal_type IS NULL AND deal_subtype IS NOT NULL;
+GO
+
+IF EXISTS (
+    SELECT 1 FROM sys.columns
+    WHERE object_id = OBJECT_ID('dbo.deals') AND name = 'deal_type' AND max_length = -1
+)
+AND NOT EXISTS (SELECT 1 FROM dbo.deals WHERE LEN(deal_type) > 50 OR LEN(deal_subtype) > 50 OR LEN(deal_stage) > 100)
+    ALTER TABLE dbo.deals ALTER COLUMN deal_type NVARCHAR(50) NULL;
+GO
+
+IF EXISTS (
+    SELECT 1 FROM sys.columns
+    WHERE object_id = OBJECT_ID('dbo.deals') AND name = 'deal_type' AND is_nullable = 1 AND max_length <> -1
+)
+BEGIN
+    IF EXISTS (SELECT 1 FROM dbo.deals WHERE deal_type IS NULL)
+        PRINT 'deals.deal_type has NULL rows: set them to REAL_ESTATE or PRE_IPO and re-run to make it NOT NULL';
+    ELSE
+        ALTER TABLE dbo.deals ALTER COLUMN deal_type NVARCHAR(50) NOT NULL;
+END
+GO
+
+IF EXISTS (
+    SELECT 1 FROM sys.columns
+    WHERE object_id = OBJECT_ID('dbo.deals') AND name = 'deal_subtype' AND max_length = -1
+)
+AND NOT EXISTS (SELECT 1 FROM dbo.deals WHERE LEN(deal_type) > 50 OR LEN(deal_subtype) > 50 OR LEN(deal_stage) > 100)
+    ALTER TABLE dbo.deals ALTER COLUMN deal_subtype NVARCHAR(50) NULL;
+GO
+
+IF EXISTS (
+    SELECT 1 FROM sys.columns
+    WHERE object_id = OBJECT_ID('dbo.deals') AND name = 'deal_stage' AND max_length = -1
+)
+AND NOT EXISTS (SELECT 1 FROM dbo.deals WHERE LEN(deal_type) > 50 OR LEN(deal_subtype) > 50 OR LEN(deal_stage) > 100)
+    ALTER TABLE dbo.deals ALTER COLUMN deal_stage NVARCHAR(100) NULL;
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_deals_status_created_at' AND object_id = OBJECT_ID('dbo.deals'))
+    CREATE NONCLUSTERED INDEX ix_deals_status_created_at
+        ON dbo.deals (status, created_at)
+        INCLUDE (name, deal_type, deal_subtype, deal_stage, sponsors, close_date, offering_size, unit_price)
+        WITH (ONLINE = ON);
+GO
+
+-- ---------------------------------------------------------
+-- computed attributes + search indexes
+-- ---------------------------------------------------------
+IF COL_LENGTH('dbo.deals', 'location') IS NULL
+    ALTER TABLE dbo.deals ADD location AS
+        CAST(CASE WHEN ISJSON(details_json) = 1 THEN JSON_VALUE(details_json, '$.location') END AS NVARCHAR(100))
+        PERSISTED;
+GO
+
+IF COL_LENGTH('dbo.deals', 'min_investment') IS NULL
+    ALTER TABLE dbo.deals ADD min_investment AS
+        TRY_CAST(CASE WHEN ISJSON(details_json) = 1 THEN JSON_VALUE(details_json, '$.min_investment') END AS FLOAT)
+        PERSISTED;
+GO
+
+IF COL_LENGTH('dbo.deals', 'target_irr') IS NULL
+    ALTER TABLE dbo.deals ADD target_irr AS
+        TRY_CAST(CASE WHEN ISJSON(details_json) = 1 THEN JSON_VALUE(details_json, '$.target_irr') END AS FLOAT)
+        PERSISTED;
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_deals_status_facets' AND object_id = OBJECT_ID('dbo.deals'))
+AND NOT EXISTS (
+    SELECT 1 FROM sys.columns
+    WHERE object_id = OBJECT_ID('dbo.deals')
+      AND name IN ('deal_type', 'deal_subtype', 'deal_stage') AND max_length = -1
+)
+    CREATE NONCLUSTERED INDEX ix_deals_status_facets
+        ON dbo.deals (status, deal_type, deal_subtype, deal_stage, location)
+        WITH (ONLINE = ON);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_deals_status_close_date' AND object_id = OBJECT_ID('dbo.deals'))
+    CREATE NONCLUSTERED INDEX ix_deals_status_close_date
+        ON dbo.deals (status, close_date)
+        WITH (ONLINE = ON);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_deals_status_min_investment' AND object_id = OBJECT_ID('dbo.deals'))
+    CREATE NONCLUSTERED INDEX ix_deals_status_min_investment
+        ON dbo.deals (status, min_investment)
+        WITH (ONLINE = ON);
+GO
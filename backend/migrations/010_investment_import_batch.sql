@@ -0,0 +1,25 @@
+-- =========================================================
+-- 010: investments.import_batch (bulk CSV import tag)
+--
+--   POST /api/admin/investments/import tags every row it inserts with a
+--   per-import key and reads the new ids back by that key, so the rows
+--   can be inserted with a plain executemany (fast_executemany) instead
+--   of INSERT ... OUTPUT. NULL for rows created any other way; the
+--   filtered index only covers imported rows.
+--
+-- Idempotent; safe to re-run. New databases get the same column and
+-- index from Base.metadata.create_all (see app/models/investment_model.py).
+--
+--   sqlcmd -S gpportalserver.database.windows.net -d gp_portal -U gpadmin -i 010_investment_import_batch.sql
+-- =========================================================
+
+IF COL_LENGTH('dbo.investments', 'import_batch') IS NULL
+    ALTER TABLE dbo.investments ADD import_batch NVARCHAR(32) NULL;
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'ix_investments_import_batch' AND object_id = OBJECT_ID('dbo.investments'))
+    CREATE NONCLUSTERED INDEX ix_investments_import_batch
+        ON dbo.investments (import_batch)
+        WHERE import_batch IS NOT NULL
+        WITH (ONLINE = ON);
+GO
@@ -0,0 +1,431 @@
+"""
+Incremental snapshot of the portal into a local SQLite file + blob directory.
+
+    python snapshot_portal.py                 # incremental (first run copies everything)
+    python snapshot_portal.py --full          # recopy every table from scratch
+    python snapshot_portal.py --skip-blobs
+
+Tables (source = the app's read engine, i.e. the replica when configured):
+  - append-only tables (APPEND_ONLY): rows with id > last copied id - APPEND_REREAD_IDS
+    (ids are handed out before commit, so a row can land below the last id
+    seen; the trailing window is re-read and upserted to pick those up)
+  - tables with an updated_at column: rows after the last (updated_at, id)
+    copied, so rows sharing the last timestamp are not copied again
+  - everything else: split into id ranges of CHUNK_ROWS; a per-range
+    (count, checksum) is computed on the source (server-side on SQL Server)
+    and only ranges whose checksum changed since the last run are recopied,
+    which also picks up updates and deletes
+Each table is written in one SQLite transaction together with its state, so
+an interrupted run leaves every table at its previous or its new state.
+
+Blobs referenced by documents.file_path are stored once per content under
+blobs/<sha256[:2]>/<sha256>; _snapshot_blobs maps each file_path to its hash.
+Only file_paths not seen by an earlier run are downloaded.
+"""
+
+import argparse
+import hashlib
+import importlib
+import os
+import pkgutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from urllib.parse import unquote, urlparse
+
+from azure.storage.blob import BlobServiceClient
+from sqlalchemy import (
+    Column, DateTime, Integer, MetaData, String, Table, and_, cast, create_engine, delete, func, insert, inspect,
+    literal, or_, select, text,
+)
+
+import app.models
+from app.routers.documents import AZURE_BLOB_CONNECTION_STRING, AZURE_CONTAINER_NAME
+from app.services.database import Base, read_engine
+
+# ==========================
+# CONFIG
+# ==========================
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", os.path.join(BACKEND_DIR, "snapshots"))
+
+CHUNK_ROWS = 5000            # id range per checksum chunk / rows per insert batch
+BLOB_WORKERS = 8             # concurrent blob downloads
+
+APPEND_ONLY = {"cash_flows"}                          # rows are never updated or deleted
+APPEND_REREAD_IDS = 1000     # trailing id window re-read on each run (late-committing inserts)
+SNAPSHOT_EXCLUDE = {"login_challenges", "refresh_tokens"}  # short-lived secrets, not worth keeping
+CHUNK_COLUMNS = {"document_access": "document_id"}    # integer column to range on when the PK isn't one
+
+
+# ==========================
+# SNAPSHOT BOOKKEEPING TABLES
+# ==========================
+
+state_md = MetaData()
+
+snapshot_state = Table(
+    "_snapshot_state", state_md,
+    Column("table_name", String, primary_key=True),
+    Column("mode", String, nullable=False),          # append | timestamp | chunks
+    Column("high_water", String, nullable=True),     # last id (append) / "<updated_at ISO>|<id>" (timestamp)
+    Column("synced_at", DateTime, nullable=False),
+)
+
+snapshot_chunks = Table(
+    "_snapshot_chunks", state_md,
+    Column("table_name", String, primary_key=True),
+    Column("chunk", Integer, primary_key=True),
+    Column("row_count", Integer, nullable=False),
+    Column("checksum", String, nullable=False),
+)
+
+snapshot_blobs = Table(
+    "_snapshot_blobs", state_md,
+    Column("source", String, primary_key=True),      # documents.file_path
+    Column("sha256", String, nullable=False),
+    Column("size", Integer, nullable=False),
+    Column("copied_at", DateTime, nullable=False),
+)
+
+
+def load_models():
+    """Import every model module so Base.metadata knows all tables."""
+    for module in pkgutil.iter_modules(app.models.__path__):
+        importlib.import_module(f"app.models.{module.name}")
+
+
+def open_snapshot(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    target = create_engine(f"sqlite:///{path}")
+    with target.begin() as conn:
+        conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+    state_md.create_all(target)
+    return target
+
+
+def reset_if_schema_changed(target, table):
+    """Drop the local copy (and its state) if the model gained or lost columns."""
+    existing = inspect(target)
+    if not existing.has_table(table.name):
+        return
+    local = {c["name"] for c in existing.get_columns(table.name)}
+    if local == {c.name for c in table.columns}:
+        return
+    print(f"[{table.name}] schema changed, recopying")
+    with target.begin() as conn:
+        table.drop(conn)
+        conn.execute(delete(snapshot_state).where(snapshot_state.c.table_name == table.name))
+        conn.execute(delete(snapshot_chunks).where(snapshot_chunks.c.table_name == table.name))
+
+
+# ==========================
+# TABLE STRATEGIES
+# ==========================
+
+def table_mode(table):
+    if table.name in APPEND_ONLY:
+        return "append"
+    if "updated_at" in table.columns:
+        return "timestamp"
+    return "chunks"
+
+
+def chunk_column(table):
+    if table.name in CHUNK_COLUMNS:
+        return table.columns[CHUNK_COLUMNS[table.name]]
+    pk = list(table.primary_key.columns)
+    if len(pk) == 1 and pk[0].type.python_type is int:
+        return pk[0]
+    return None
+
+
+def source_select(table):
+    """SELECT of the stored columns; computed ones (e.g. deals.location) are derived again locally."""
+    return select(*[c for c in table.columns if c.computed is None])
+
+
+def copy_rows(source, conn, stmt, table):
+    """Stream a select from the source into the snapshot in CHUNK_ROWS batches (upsert)."""
+    copied = 0
+    upsert = insert(table).prefix_with("OR REPLACE")
+    with source.connect() as src:
+        result = src.execute(stmt.execution_options(yield_per=CHUNK_ROWS))
+        for batch in result.mappings().partitions(CHUNK_ROWS):
+            conn.execute(upsert, [dict(row) for row in batch])
+            copied += len(batch)
+    return copied
+
+
+def sync_append(source, conn, table, state):
+    key = chunk_column(table)
+    high_water = int(state["high_water"]) if state and state["high_water"] else 0
+    # an id below high_water may have committed after the last run: re-read (upsert) a trailing window
+    since = high_water - APPEND_REREAD_IDS if high_water else 0
+    copied = copy_rows(source, conn, source_select(table).where(key > since).order_by(key), table)
+    new_high = conn.execute(select(func.max(key))).scalar()
+    return copied, str(new_high or high_water)
+
+
+def _source_value(source, column, value):
+    # SQL Server compares DATETIME to a datetime2 parameter exactly (.00333 vs .003):
+    # cast the mark back to the column type so equal values compare equal
+    if source.dialect.name == "mssql":
+        return cast(literal(value), column.type)
+    return value
+
+
+def sync_timestamp(source, conn, table, state):
+    column, key = table.c.updated_at, chunk_column(table)
+    stmt = source_select(table)
+    if state and state["high_water"]:
+        mark, _, last_key = state["high_water"].partition("|")
+        mark = _source_value(source, column, datetime.fromisoformat(mark))
+        if key is not None and last_key:
+            # keyset on (updated_at, key): rows sharing the last timestamp aren't copied again
+            stmt = stmt.where(or_(column > mark, and_(column == mark, key > int(last_key))))
+        else:
+            stmt = stmt.where(column >= mark)
+    order = [column] if key is None else [column, key]
+    copied = copy_rows(source, conn, stmt.order_by(*order), table)
+
+    last = conn.execute(select(column, *order[1:]).order_by(*[c.desc() for c in order]).limit(1)).first()
+    if last is None:
+        return copied, (state or {}).get("high_water")
+    return copied, last[0].isoformat() + (f"|{last[1]}" if key is not None else "")
+
+
+def source_checksums(source, table, key):
+    """{chunk: (row_count, checksum)} over id ranges of CHUNK_ROWS, computed where the data lives."""
+    with source.connect() as src:
+        if source.dialect.name == "mssql":
+            # the divisor is inlined: as two parameters (@P1, @P2) SQL Server can't match the
+            # SELECT expression to the GROUP BY one and rejects it (Msg 8120)
+            rows = src.execute(text(
+                f"SELECT [{key.name}] / {int(CHUNK_ROWS)} AS chunk, COUNT(*), CHECKSUM_AGG(BINARY_CHECKSUM(*)) "
+                f"FROM dbo.[{table.name}] GROUP BY [{key.name}] / {int(CHUNK_ROWS)}"
+            ))
+            return {int(chunk): (count, str(checksum)) for chunk, count, checksum in rows}
+
+        # other engines (local SQLite): hash the rows client-side, still without writing anything
+        sums = {}
+        order = [key] + [c for c in table.primary_key.columns if c is not key]
+        result = src.execute(source_select(table).order_by(*order).execution_options(yield_per=CHUNK_ROWS))
+        for row in result:
+            chunk = row._mapping[key.name] // CHUNK_ROWS
+            count, digest = sums.get(chunk, (0, None))
+            if digest is None:
+                digest = hashlib.blake2b(digest_size=16)
+            digest.update(repr(tuple(row)).encode("utf-8"))
+            sums[chunk] = (count + 1, digest)
+        return {chunk: (count, digest.hexdigest()) for chunk, (count, digest) in sums.items()}
+
+
+def sync_chunks(source, conn, table, state):
+    key = chunk_column(table)
+    if key is None:
+        # no integer range key: small lookup tables, copied whole
+        conn.execute(delete(table))
+        return copy_rows(source, conn, source_select(table), table), None
+
+    current = source_checksums(source, table, key)
+    previous = {
+        chunk: (count, checksum)
+        for chunk, count, checksum in conn.execute(
+            select(snapshot_chunks.c.chunk, snapshot_chunks.c.row_count, snapshot_chunks.c.checksum)
+            .where(snapshot_chunks.c.table_name == table.name)
+        )
+    }
+    changed = sorted(c for c in set(current) | set(previous) if current.get(c) != previous.get(c))
+
+    # all deletes first, so a value that moved between ranges can't trip a unique index
+    for chunk in changed:
+        low, high = chunk * CHUNK_ROWS, (chunk + 1) * CHUNK_ROWS
+        conn.execute(delete(table).where(key >= low, key < high))
+
+    copied = 0
+    for chunk in changed:
+        low, high = chunk * CHUNK_ROWS, (chunk + 1) * CHUNK_ROWS
+        if chunk in current:
+            copied += copy_rows(source, conn, source_select(table).where(key >= low, key < high), table)
+
+    conn.execute(delete(snapshot_chunks).where(snapshot_chunks.c.table_name == table.name))
+    if current:
+        conn.execute(insert(snapshot_chunks), [
+            {"table_name": table.name, "chunk": chunk, "row_count": count, "checksum": checksum}
+            for chunk, (count, checksum) in current.items()
+        ])
+    print(f"[{table.name}] {len(changed)} of {len(current)} id ranges changed")
+    return copied, None
+
+
+STRATEGIES = {"append": sync_append, "timestamp": sync_timestamp, "chunks": sync_chunks}
+
+
+def snapshot_tables(source, target, full=False):
+    tables = [t for t in Base.metadata.sorted_tables if t.name not in SNAPSHOT_EXCLUDE]
+    source_tables = set(inspect(source).get_table_names())
+
+    for table in tables:
+        if full:
+            with target.begin() as conn:
+                table.drop(conn, checkfirst=True)
+                conn.execute(delete(snapshot_state).where(snapshot_state.c.table_name == table.name))
+                conn.execute(delete(snapshot_chunks).where(snapshot_chunks.c.table_name == table.name))
+        else:
+            reset_if_schema_changed(target, table)
+    Base.metadata.create_all(target, tables=tables)
+
+    total, started = 0, time.perf_counter()
+    for table in tables:
+        if table.name not in source_tables:
+            print(f"[{table.name}] not in source database, skipping")
+            continue
+
+        mode = table_mode(table)
+        table_started = time.perf_counter()
+        with target.begin() as conn:
+            row = conn.execute(select(snapshot_state).where(snapshot_state.c.table_name == table.name)).mappings().first()
+            state = dict(row) if row and row["mode"] == mode else None
+            if state is None and mode != "chunks":
+                conn.execute(delete(table))
+
+            copied, high_water = STRATEGIES[mode](source, conn, table, state)
+
+            conn.execute(insert(snapshot_state).prefix_with("OR REPLACE"), {
+                "table_name": table.name, "mode": mode, "high_water": high_water, "synced_at": datetime.utcnow(),
+            })
+
+        elapsed = time.perf_counter() - table_started
+        total += copied
+        print(f"[{table.name}] {mode}: {copied} rows copied in {elapsed:.1f}s")
+
+    print(f"\nTables done: {total} rows copied in {time.perf_counter() - started:.1f}s")
+
+
+# ==========================
+# BLOBS (CONTENT-ADDRESSED)
+# ==========================
+
+def blob_path(blobs_dir, sha256):
+    return os.path.join(blobs_dir, sha256[:2], sha256)
+
+
+def open_source_blob(container_client, source):
+    """Iterator of byte chunks for a documents.file_path (blob URL or local uploads/ path)."""
+    if source.startswith(("http://", "https://")):
+        path = unquote(urlparse(source).path)
+        name = path.split(f"/{AZURE_CONTAINER_NAME}/", 1)[-1]
+        return container_client.get_blob_client(name).download_blob().chunks()
+
+    local = os.path.join(BACKEND_DIR, source.replace("\\", "/"))
+
+    def read_local():
+        with open(local, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                yield block
+    return read_local()
+
+
+def copy_blob(container_client, blobs_dir, source):
+    """Download into a temp file while hashing, then move it to its content address."""
+    digest = hashlib.sha256()
+    size = 0
+    fd, tmp = tempfile.mkstemp(dir=blobs_dir, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for block in open_source_blob(container_client, source):
+                digest.update(block)
+                size += len(block)
+                f.write(block)
+        sha256 = digest.hexdigest()
+        final = blob_path(blobs_dir, sha256)
+        if os.path.exists(final):
+            os.remove(tmp)              # same content already stored
+        else:
+            os.makedirs(os.path.dirname(final), exist_ok=True)
+            os.replace(tmp, final)
+        return source, sha256, size
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def snapshot_blobs_for_documents(target, blobs_dir, workers=BLOB_WORKERS):
+    os.makedirs(blobs_dir, exist_ok=True)
+    documents = Base.metadata.tables["documents"]
+    with target.connect() as conn:
+        sources = {p for (p,) in conn.execute(select(documents.c.file_path).where(documents.c.file_path.isnot(None)))}
+        known = {s for (s,) in conn.execute(select(snapshot_blobs.c.source))}
+    pending = sorted(sources - known)
+    print(f"\n=== Blobs: {len(sources)} referenced, {len(pending)} new ===")
+    if not pending:
+        return
+
+    container_client = None
+    if any(s.startswith(("http://", "https://")) for s in pending):
+        container_client = BlobServiceClient.from_connection_string(AZURE_BLOB_CONNECTION_STRING) \
+            .get_container_client(AZURE_CONTAINER_NAME)
+
+    started = time.perf_counter()
+    copied, failed, total_bytes = [], 0, 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(copy_blob, container_client, blobs_dir, s): s for s in pending}
+        for future in as_completed(futures):
+            try:
+                source, sha256, size = future.result()
+            except Exception as e:
+                # retried on the next run: it stays out of _snapshot_blobs
+                print(f"Blob failed: {futures[future]}: {e}")
+                failed += 1
+                continue
+            copied.append({"source": source, "sha256": sha256, "size": size, "copied_at": datetime.utcnow()})
+            total_bytes += size
+
+    if copied:
+        with target.begin() as conn:
+            conn.execute(insert(snapshot_blobs).prefix_with("OR REPLACE"), copied)
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"Blobs done in {elapsed:.1f}s: {len(copied)} copied "
+        f"({total_bytes / 1e6:,.1f} MB, {total_bytes / 1e6 / elapsed if elapsed else 0:,.1f} MB/s), {failed} failed"
+    )
+
+
+# ==========================
+# MAIN
+# ==========================
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Incremental local snapshot of the portal database and blobs.")
+    parser.add_argument("--dir", default=SNAPSHOT_DIR, help="snapshot directory (portal.db + blobs/)")
+    parser.add_argument("--full", action="store_true", help="recopy every table instead of an incremental run")
+    parser.add_argument("--skip-blobs", action="store_true", help="tables only")
+    parser.add_argument("--blob-workers", type=int, default=BLOB_WORKERS, help="concurrent blob downloads")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    load_models()
+
+    db_path = os.path.join(args.dir, "portal.db")
+    print(f"Snapshotting {read_engine.url.render_as_string(hide_password=True)[:60]} -> {db_path}")
+    target = open_snapshot(db_path)
+
+    snapshot_tables(read_engine, target, full=args.full)
+    if not args.skip_blobs:
+        snapshot_blobs_for_documents(target, os.path.join(args.dir, "blobs"), workers=args.blob_workers)
+
+    target.dispose()
+    print("\n=== Snapshot completed ===")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+import axiosClient, { API_BASE } from "./axiosClient";
+
+// ---------------------------------------------------------
+// Live admin activity (Server-Sent Events) instead of re-polling lists.
+// handlers: { "document.uploaded": (event) => ..., ... }
+// EventSource can't send the Authorization header, so each connection
+// first trades the access token for a short-lived stream ticket (the
+// token itself never goes in the URL). Reconnects by itself; when the
+// session ends it gets a new ticket (renewing the access token through
+// axiosClient) and resumes from the last event received.
+// Returns an unsubscribe function.
+// ---------------------------------------------------------
+export function subscribeAdminEvents(handlers) {
+  let source = null;
+  let lastEventId = null;
+  let closed = false;
+
+  const open = async () => {
+    let ticket;
+    try {
+      const res = await axiosClient.post("/api/admin/events/ticket");
+      ticket = res.data.ticket;
+    } catch {
+      return; // signed out or not an admin
+    }
+    if (closed) return;
+
+    const params = new URLSearchParams({
+      ticket,
+      types: Object.keys(handlers).join(","),
+    });
+    if (lastEventId) params.set("last_event_id", lastEventId);
+
+    source = new EventSource(`${API_BASE}/api/admin/events/stream?${params}`);
+
+    Object.entries(handlers).forEach(([type, handler]) => {
+      source.addEventListener(type, (e) => {
+        lastEventId = e.lastEventId;
+        handler(JSON.parse(e.data));
+      });
+    });
+
+    const reopen = () => {
+      source.close();
+      if (!closed) open();
+    };
+
+    source.addEventListener("token-expired", reopen);
+    // CLOSED means the server refused (e.g. 401 for an expired ticket);
+    // transient drops retry on their own
+    source.onerror = () => source.readyState === EventSource.CLOSED && reopen();
+  };
+
+  open();
+  return () => {
+    closed = true;
+    source?.close();
+  };
+}
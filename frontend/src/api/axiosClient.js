@@ -13,9 +13,74 @@ axiosClient.interceptors.request.use((config) => {
   if (token) {
     config.headers.Authorization = `Bearer ${token}`;
   }
+  // read-your-writes: the server keeps our reads off the replica for a few
+  // seconds after a write, whichever instance handles them
+  const lastWrite = sessionStorage.getItem("lastWrite");
+  if (lastWrite) {
+    config.headers["X-Last-Write"] = lastWrite;
+  }
   return config;
 });
 
+const rememberLastWrite = (response) => {
+  const lastWrite = response?.headers?.["x-last-write"];
+  if (lastWrite) sessionStorage.setItem("lastWrite", lastWrite);
+};
+
+// ---------------------------------------------------------
+// 401 → renew the access token with the refresh token, then retry once.
+// Concurrent 401s share one refresh call (refresh tokens are single-use).
+// ---------------------------------------------------------
+let refreshing = null;
+
+const refreshAccessToken = async () => {
+  const refreshToken = sessionStorage.getItem("refreshToken");
+  if (!refreshToken) throw new Error("No refresh token");
+
+  // plain axios: must not go through this interceptor again
+  const res = await axios.post(`${API_BASE}/api/auth/refresh`, {
+    refresh_token: refreshToken,
+  });
+
+  sessionStorage.setItem("token", res.data.access_token);
+  sessionStorage.setItem("refreshToken", res.data.refresh_token);
+  window.dispatchEvent(new CustomEvent("auth:token", { detail: res.data.access_token }));
+  return res.data.access_token;
+};
 
+// single-flight renewal
+const renewAccessToken = () => {
+  refreshing = refreshing || refreshAccessToken().finally(() => (refreshing = null));
+  return refreshing;
+};
+
+axiosClient.interceptors.response.use(
+  (response) => {
+    rememberLastWrite(response);
+    return response;
+  },
+  async (error) => {
+    rememberLastWrite(error.response);
+    const original = error.config;
+    const status = error.response?.status;
+
+    if (status !== 401 || !original || original._retried || original.url?.startsWith("/api/auth/")) {
+      return Promise.reject(error);
+    }
+    original._retried = true;
+
+    try {
+      const token = await renewAccessToken();
+      original.headers.Authorization = `Bearer ${token}`;
+      return axiosClient(original);
+    } catch (refreshError) {
+      sessionStorage.removeItem("token");
+      sessionStorage.removeItem("refreshToken");
+      window.dispatchEvent(new CustomEvent("auth:token", { detail: null }));
+      return Promise.reject(error);
+    }
+  }
+);
 
+export { API_BASE };
 export default axiosClient;
\ No newline at end of file
@@ -0,0 +1,35 @@
+// /src/api/dashboard.js
+import axiosClient from "./axiosClient";
+
+// last payload per section, so unchanged sections can be skipped by the server
+let cachedSections = {};
+// last full response + its overall ETag: when nothing changed the server answers 304
+let cachedDashboard = null;
+let cachedEtag = null;
+
+// ✅ Investor dashboard in one round trip (investments, summary, documents, profile, deals)
+export const getDashboard = async () => {
+  const etags = Object.values(cachedSections)
+    .map((s) => s.etag)
+    .filter(Boolean);
+  if (cachedEtag && cachedDashboard) etags.unshift(cachedEtag);
+
+  const res = await axiosClient.get("/api/dashboard", {
+    headers: etags.length ? { "If-None-Match": etags.join(", ") } : {},
+    validateStatus: (status) => status === 200 || status === 304,
+  });
+
+  if (res.status === 304) {
+    return cachedDashboard || { sections: cachedSections };
+  }
+
+  const sections = {};
+  for (const [name, section] of Object.entries(res.data.sections)) {
+    sections[name] = section.not_modified ? cachedSections[name] : section;
+  }
+  cachedSections = sections;
+  cachedDashboard = { ...res.data, sections };
+  cachedEtag = res.headers.etag || null;
+
+  return cachedDashboard;
+};
@@ -14,3 +14,17 @@ export async function showInterest(dealId) {
   const res = await axiosClient.post(`/api/deals/${dealId}/interest`);
   return res.data;
 }
+
+// filters: { deal_type: ["REAL_ESTATE"], location: ["Texas", "Ohio"], min_investment_max: 50000, sort, limit, offset }
+// -> { items, total, facets: { deal_type: [{ value, count }], ... } }
+export async function searchDeals(filters = {}) {
+  // repeated keys (location=Texas&location=Ohio), not axios' default location[]=
+  const params = new URLSearchParams();
+  Object.entries(filters).forEach(([key, value]) => {
+    (Array.isArray(value) ? value : [value])
+      .filter((v) => v !== undefined && v !== null && v !== "")
+      .forEach((v) => params.append(key, v));
+  });
+  const res = await axiosClient.get("/api/deals/search", { params });
+  return res.data;
+}
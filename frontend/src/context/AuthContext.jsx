@@ -30,15 +30,33 @@ export const AuthProvider = ({ children }) => {
   }, []);
 
   // ---------------------------------------------------------
-  // SAVE JWT INTO SESSION STORAGE
+  // KEEP STATE IN STEP WITH SILENT REFRESHES (axiosClient)
   // ---------------------------------------------------------
-  const loginWithToken = (jwtToken) => {
+  useEffect(() => {
+    const onToken = (e) => setToken(e.detail);
+    window.addEventListener("auth:token", onToken);
+    return () => window.removeEventListener("auth:token", onToken);
+  }, []);
+
+  // ---------------------------------------------------------
+  // SAVE JWT (+ REFRESH TOKEN) INTO SESSION STORAGE
+  // ---------------------------------------------------------
+  const loginWithToken = (jwtToken, refreshToken) => {
     sessionStorage.setItem("token", jwtToken);
+    if (refreshToken) {
+      sessionStorage.setItem("refreshToken", refreshToken);
+    }
     setToken(jwtToken);
   };
 
   const logout = () => {
+    const refreshToken = sessionStorage.getItem("refreshToken");
+    if (refreshToken) {
+      // best effort: revoke server-side so the token can't be replayed
+      axiosClient.post("/api/auth/logout", { refresh_token: refreshToken }).catch(() => {});
+    }
     sessionStorage.removeItem("token");
+    sessionStorage.removeItem("refreshToken");
     setToken(null);
     setUser(null);
     setRole(null);
@@ -113,7 +131,7 @@ export const AuthProvider = ({ children }) => {
 
     const jwt = res.data?.access_token;
     if (jwt) {
-      loginWithToken(jwt);
+      loginWithToken(jwt, res.data?.refresh_token);
     }
 
     return jwt;
@@ -1,6 +1,7 @@
 // /src/pages/AdminDocumentsPage.jsx
 import React, { useEffect, useState } from "react";
 import axiosClient from "../api/axiosClient";
+import { subscribeAdminEvents } from "../api/adminEvents";
 import { X, Check, Upload } from "lucide-react";
 
 const AdminDocumentsPage = () => {
@@ -49,6 +50,23 @@ const AdminDocumentsPage = () => {
     loadUsers();
   }, []);
 
+  // Refresh when someone uploads or shares a document (bursts collapse into one reload)
+  useEffect(() => {
+    let timer = null;
+    const onDocumentEvent = () => {
+      clearTimeout(timer);
+      timer = setTimeout(loadDocuments, 500);
+    };
+    const unsubscribe = subscribeAdminEvents({
+      "document.uploaded": onDocumentEvent,
+      "document.shared": onDocumentEvent,
+    });
+    return () => {
+      clearTimeout(timer);
+      unsubscribe();
+    };
+  }, []);
+
   // Helper function to get user display name
   const getUserDisplayName = (user) => {
     if (user.first_name && user.last_name) {
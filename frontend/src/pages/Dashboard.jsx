@@ -1,12 +1,38 @@
+import { useEffect, useState } from "react";
 import { Info, ArrowRight } from "lucide-react";
+import { getDashboard } from "../api/dashboard";
+
+// Format currency
+const formatCurrency = (value) => {
+  if (!value) return "$0";
+  return `$${(value / 1000).toFixed(value % 1000 ? 2 : 0)}K`;
+};
 
 export default function Dashboard() {
+  const [dashboard, setDashboard] = useState(null);
+
+  // one round trip; revalidated with the cached ETags on every visit
+  useEffect(() => {
+    getDashboard()
+      .then(setDashboard)
+      .catch((err) => console.error("Failed to fetch dashboard", err));
+  }, []);
+
+  const data = (name) => dashboard?.sections?.[name]?.data;
+  const summary = data("investments_summary") || {};
+  const investments = data("investments") || [];
+  const invested = summary.total_invested || 0;
+  const distributed = summary.total_distributed || 0;
+  const inProgress = investments
+    .filter((inv) => inv.status === "Active")
+    .reduce((total, inv) => total + (inv.investment_total || 0), 0);
+
   const stats = [
-    { label: "Total invested", value: "$300K" },
-    { label: "Total capital balance", value: "$300K" },
-    { label: "Total distributed", value: "$27.05K" },
-    { label: "# of deals", value: "1" },
-    { label: "Total in-progress", value: "$0" },
+    { label: "Total invested", value: formatCurrency(invested) },
+    { label: "Total capital balance", value: formatCurrency(invested - distributed) },
+    { label: "Total distributed", value: formatCurrency(distributed) },
+    { label: "# of deals", value: String(investments.length) },
+    { label: "Total in-progress", value: formatCurrency(inProgress) },
   ];
 
   const sections = [
@@ -16,6 +42,13 @@ export default function Dashboard() {
     "Recent activity",
   ];
 
+  const initials = (dashboard?.user?.name || dashboard?.user?.email || "")
+    .split(/[\s@.]+/)
+    .filter(Boolean)
+    .slice(0, 2)
+    .map((part) => part[0].toUpperCase())
+    .join("");
+
   return (
     <div className="space-y-8">
       {/* Greeting */}
@@ -41,7 +74,7 @@ export default function Dashboard() {
             Updates <ArrowRight size={16} />
           </a>
           <div className="bg-gray-200 text-gray-800 px-3 py-1 rounded-full font-semibold">
-            AK
+            {initials || "—"}
           </div>
         </div>
       </div>
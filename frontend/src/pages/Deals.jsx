@@ -1,12 +1,21 @@
 import { Search } from "lucide-react";
 import { useEffect, useMemo, useState } from "react";
 import { useNavigate } from "react-router-dom";
-import { getDeals } from "../api/deals";
+import { searchDeals } from "../api/deals";
+
+// facet dropdowns above the deals table (counts come from /api/deals/search)
+const FACET_FILTERS = [
+  { key: "deal_type", label: "All types" },
+  { key: "deal_stage", label: "All stages" },
+  { key: "location", label: "All locations" },
+];
 
 export default function Deals() {
   const navigate = useNavigate();
 
   const [deals, setDeals] = useState([]);
+  const [facets, setFacets] = useState({});
+  const [filters, setFilters] = useState({});
   const [dealsSearch, setDealsSearch] = useState("");
   const [investmentsSearch, setInvestmentsSearch] = useState("");
   const [isLoadingDeals, setIsLoadingDeals] = useState(true);
@@ -23,10 +32,11 @@ export default function Deals() {
         setIsLoadingDeals(true);
         setDealsError("");
 
-        const apiDeals = await getDeals();
+        const result = await searchDeals({ ...filters, limit: 200 });
 
         if (!isMounted) return;
-        setDeals(Array.isArray(apiDeals) ? apiDeals : []);
+        setDeals(Array.isArray(result?.items) ? result.items : []);
+        setFacets(result?.facets || {});
       } catch (err) {
         if (!isMounted) return;
 
@@ -44,7 +54,11 @@ export default function Deals() {
     return () => {
       isMounted = false;
     };
-  }, []);
+  }, [filters]);
+
+  function setFilter(key, value) {
+    setFilters((current) => ({ ...current, [key]: value ? [value] : undefined }));
+  }
 
   function formatDate(value) {
     if (!value) return "-";
@@ -92,15 +106,35 @@ export default function Deals() {
         <div className="flex items-center justify-between">
           <h2 className="text-lg font-semibold text-gray-800">Joined deals</h2>
 
-          <div className="relative w-64">
-            <Search size={16} className="absolute left-3 top-2.5 text-gray-400" />
-            <input
-              type="text"
-              placeholder="Search deals..."
-              value={dealsSearch}
-              onChange={(e) => setDealsSearch(e.target.value)}
-              className="w-full border rounded-md pl-9 pr-3 py-2 text-sm focus:ring-2 focus:ring-blue-500"
-            />
+          <div className="flex items-center gap-2">
+            {FACET_FILTERS.map(({ key, label }) => (
+              <select
+                key={key}
+                value={filters[key]?.[0] || ""}
+                onChange={(e) => setFilter(key, e.target.value)}
+                className="border rounded-md px-2 py-2 text-sm focus:ring-2 focus:ring-blue-500"
+              >
+                <option value="">{label}</option>
+                {(facets[key] || [])
+                  .filter(({ value }) => value)
+                  .map(({ value, count }) => (
+                    <option key={value} value={value}>
+                      {value} ({count})
+                    </option>
+                  ))}
+              </select>
+            ))}
+
+            <div className="relative w-64">
+              <Search size={16} className="absolute left-3 top-2.5 text-gray-400" />
+              <input
+                type="text"
+                placeholder="Search deals..."
+                value={dealsSearch}
+                onChange={(e) => setDealsSearch(e.target.value)}
+                className="w-full border rounded-md pl-9 pr-3 py-2 text-sm focus:ring-2 focus:ring-blue-500"
+              />
+            </div>
           </div>
         </div>
 
@@ -54,7 +54,7 @@ export default function Otp() {
         otp: code,
       });
 
-      // Expected response: { access_token }
+      // Expected response: { access_token, refresh_token }
       const token = res.data?.access_token;
 
       if (!token) {
@@ -63,7 +63,7 @@ export default function Otp() {
       }
 
       // Save token using AuthContext
-      loginWithToken(token);
+      loginWithToken(token, res.data?.refresh_token);
 
       navigate("/dashboard");
     } catch (err) {